@@ -0,0 +1,5 @@
+"""
+Benchmark suite of the end-to-end flows and of the fixture setup costs.
+
+See benchmarks/runner.py for usage.
+"""
@@ -0,0 +1,7 @@
+"""Run the benchmark suite, see benchmarks/runner.py"""
+
+import sys
+
+from benchmarks.runner import main
+
+sys.exit(main())
@@ -0,0 +1,110 @@
+"""
+This module measures the setup cost of the suite's fixtures.
+
+The tests using the fixtures are run in-process with pytest, with a plugin
+timing the setup of the fixtures of interest. A fixture's time covers its own
+body only, the fixtures it depends on are set up before and timed separately.
+The whole setup phase of each test is also reported as "setup:<test>".
+
+The first setup of a fixture in a pytest session pays for the browser launch,
+the UI login or the first build of a setup chain. Each session runs the tests
+twice: the setups of the first pass are reported under "<name>:cold", the
+second pass gives the warm cost under the plain name.
+"""
+
+import time
+
+import pytest
+
+# Fixtures measured by default, with a test that uses each of them
+FIXTURE_TESTS = {
+    "logged_in_driver": "tests/test_cart_page.py::test_remove_product_from_cart",
+    "logged_in_session": "tests/test_products_page.py::test_products_btns",
+    "setup_checkout": (
+        "tests/test_checkout_pages.py::TestCheckoutInformationPage"
+        "::test_checkout_information_title"
+    ),
+    "setup_chain": (
+        "tests/test_checkout_pages.py::TestCheckoutOverviewPage"
+        "::test_checkout_overview_title"
+    ),
+}
+
+
+class FixtureTimer:
+    """pytest plugin recording the setup durations of named fixtures"""
+
+    def __init__(self, fixtures):
+        """
+        Initialize the fixture timer
+
+        Args:
+            fixtures: Names of the fixtures to time
+        """
+        self.fixtures = set(fixtures)
+        self.samples = {}
+        self._seen = set()
+
+    def pytest_sessionstart(self, session):
+        """Start a new session cold, nothing is cached yet"""
+        self._seen = set()
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_modifyitems(self, items: list):
+        """Run the tests twice, the first pass warms the session up"""
+        # pytest cannot run an item twice, collect a fresh copy of each test
+        copies = []
+        for item in items:
+            fresh = {copy.name: copy for copy in item.parent.collect()}
+            copies.append(fresh[item.name])
+        items[:] = items + copies
+
+    @pytest.hookimpl(wrapper=True)
+    def pytest_fixture_setup(self, fixturedef):
+        """Time the setup of a fixture of interest"""
+        if fixturedef.argname not in self.fixtures:
+            return (yield)
+        start = time.perf_counter()
+        try:
+            return (yield)
+        finally:
+            self._record(fixturedef.argname, time.perf_counter() - start)
+
+    @pytest.hookimpl(wrapper=True)
+    def pytest_runtest_setup(self, item):
+        """Time the whole setup phase of a test"""
+        start = time.perf_counter()
+        try:
+            return (yield)
+        finally:
+            self._record(f"setup:{item.name}", time.perf_counter() - start)
+
+    def _record(self, name: str, seconds: float):
+        """Add a duration to the samples of a benchmark, cold on first setup"""
+        if name not in self._seen:
+            self._seen.add(name)
+            name = f"{name}:cold"
+        self.samples.setdefault(name, []).append(seconds)
+
+
+def measure_fixtures(fixtures: list, repeat: int) -> dict:
+    """
+    Measure the setup cost of fixtures over repeated pytest runs
+
+    Args:
+        fixtures: Names of the fixtures, keys of FIXTURE_TESTS
+        repeat: Number of pytest sessions, each running the tests twice
+
+    Returns:
+        dict: Durations in seconds by fixture name, the first setups of each
+            session under "<name>:cold"
+    """
+    timer = FixtureTimer(fixtures)
+    node_ids = sorted({FIXTURE_TESTS[name] for name in fixtures})
+    for _ in range(repeat):
+        exit_code = pytest.main(
+            ["-q", "-p", "no:cacheprovider", *node_ids], plugins=[timer]
+        )
+        if exit_code not in (pytest.ExitCode.OK, pytest.ExitCode.TESTS_FAILED):
+            raise RuntimeError(f"pytest could not run the fixture tests: {exit_code}")
+    return timer.samples
@@ -0,0 +1,110 @@
+"""
+This module contains the end-to-end flows measured by the benchmark suite.
+
+Each flow prepares the browser (untimed) and returns the callable that is
+timed, so only the steps of the flow itself are measured. The flows are built
+from the same page objects and helpers as the tests.
+"""
+
+import random
+
+from page_objects.cart_page import CartPage
+from page_objects.login_page import LoginPage
+from page_objects.product_page import ProductPage
+from utilities.config import settings
+from utilities.navigation import Navigator
+
+
+def login(driver, auth_state):
+    """Log in through the UI, from opening the login page to the products page"""
+    login_page = LoginPage(driver)
+    product_page = ProductPage(driver)
+
+    def run():
+        login_page.open_page()
+        login_page.enter_username(settings.username)
+        login_page.enter_password(settings.password)
+        login_page.click_login_button()
+        product_page.wait_for_product_title()
+
+    return run
+
+
+def add_random_products(driver, auth_state):
+    """Add random products to the cart from the products page"""
+    auth_state.apply(driver)
+    product_page = ProductPage(driver)
+    product_page.wait_for_product_title()
+
+    def run():
+        product_page.get_products_random_list()
+        product_page.add_random_products_to_cart()
+
+    return run
+
+
+def add_all_products(driver, auth_state, bulk: bool = True):
+    """Add every product to the cart from the products page"""
+    auth_state.apply(driver)
+    product_page = ProductPage(driver)
+    product_page.wait_for_product_title()
+    product_page.get_all_products_list()
+
+    def run():
+        product_page.add_random_products_to_cart(bulk=bulk)
+
+    return run
+
+
+def add_all_products_sequential(driver, auth_state):
+    """Add every product to the cart, waiting for each Remove button in turn"""
+    return add_all_products(driver, auth_state, bulk=False)
+
+
+def remove_from_cart(driver, auth_state):
+    """Remove a random product from the cart page"""
+    auth_state.apply(driver)
+    product_page = ProductPage(driver)
+    cart_page = CartPage(driver)
+    product_page.wait_for_product_title()
+    product_page.get_products_random_list()
+    product_page.add_random_products_to_cart()
+    product_page.navigate_to_cart_page()
+    cart_page.wait_for_cart_title()
+
+    def run():
+        product = random.choice(cart_page.get_cart_product_name())
+        if not cart_page.remove_product_from_cart(product):
+            raise RuntimeError(f"Failed to remove product {product}")
+
+    return run
+
+
+def checkout(driver, auth_state):
+    """Complete the checkout from the information page, like the checkout tests"""
+    auth_state.apply(driver)
+    product_page = ProductPage(driver)
+    cart_page = CartPage(driver)
+    product_page.wait_for_product_title()
+    product_page.get_products_random_list()
+    product_page.add_random_products_to_cart()
+    product_page.navigate_to_cart_page()
+    cart_page.wait_for_cart_title()
+    cart_page.click_checkout_button()
+    navigator = Navigator(driver, auth_state)
+
+    def run():
+        navigator.advance_checkout(complete=True)
+
+    return run
+
+
+# Flows by benchmark name, in the order they run
+FLOWS = {
+    "login": login,
+    "add_random_products": add_random_products,
+    "add_all_products": add_all_products,
+    "add_all_products_sequential": add_all_products_sequential,
+    "remove_from_cart": remove_from_cart,
+    "checkout": checkout,
+}
@@ -0,0 +1,198 @@
+"""
+This module runs the benchmark suite and compares benchmark runs.
+
+"run" times each end-to-end flow and the setup of the fixtures over repeated
+runs against the configured site, or against --target, prints min/median/p95
+and saves the samples as JSON. "compare" flags the benchmarks that got
+significantly slower between a baseline run and a current run, and exits
+with 1 if any did.
+
+Usage:
+    python -m benchmarks run --repeat 20 --output benchmarks/baselines/main.json
+    python -m benchmarks run --target local --output current.json
+    python -m benchmarks compare benchmarks/baselines/main.json current.json
+"""
+
+import argparse
+import datetime
+import json
+import os
+import sys
+import time
+
+from benchmarks.fixtures import FIXTURE_TESTS, measure_fixtures
+from benchmarks.flows import FLOWS
+from benchmarks.stats import compare_runs, summarize
+from utilities.auth_state import AuthStateCache
+from utilities.config import (
+    LOCAL_SITE_HOST,
+    get_browser_profile,
+    get_driver,
+    settings,
+)
+from utilities.driver_pool import reset_driver_state
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_OUTPUT = os.path.join(PROJECT_ROOT, ".benchmarks", "latest.json")
+
+
+def set_target(target: str):
+    """
+    Point the settings at the site to benchmark
+
+    Args:
+        target: Login URL of the site, or "local" for the bundled stand-in
+    """
+    if target == "local":
+        os.environ["SWAG_SITE"] = "local"
+    else:
+        os.environ["SWAG_SITE"] = "remote"
+        os.environ["SWAG_LOGIN_URL"] = target
+    settings.reload()
+
+
+def time_flows(flows: list, repeat: int, warmup: int) -> dict:
+    """
+    Time end-to-end flows in a single browser
+
+    Args:
+        flows: Names of the flows, keys of FLOWS
+        repeat: Number of timed runs of each flow
+        warmup: Number of untimed runs of each flow before the timed ones
+
+    Returns:
+        dict: Durations in seconds by flow name
+    """
+    driver = get_driver()
+    auth_state = AuthStateCache()
+    samples = {}
+    try:
+        for name in flows:
+            for index in range(warmup + repeat):
+                run = FLOWS[name](driver, auth_state)
+                start = time.perf_counter()
+                run()
+                elapsed = time.perf_counter() - start
+                if index >= warmup:
+                    samples.setdefault(name, []).append(elapsed)
+                reset_driver_state(driver)
+    finally:
+        driver.quit()
+    return samples
+
+
+def run_benchmarks(args) -> int:
+    """Run the benchmarks, print their summary and save them"""
+    if args.target:
+        set_target(args.target)
+    if settings.site == "local":
+        from utilities.local_swag_labs import ensure_server
+
+        ensure_server(LOCAL_SITE_HOST, settings.local_site_port)
+
+    samples = {}
+    if args.flows:
+        samples.update(time_flows(args.flows, args.repeat, args.warmup))
+    if args.fixtures:
+        samples.update(measure_fixtures(args.fixtures, args.repeat))
+
+    benchmarks = {}
+    print(f"{'benchmark':<40} {'min':>8} {'median':>8} {'p95':>8}")
+    for name, durations in samples.items():
+        summary = summarize(durations)
+        benchmarks[name] = dict(summary, samples=durations)
+        print(
+            f"{name:<40} {summary['min']:>8.3f} {summary['median']:>8.3f}"
+            f" {summary['p95']:>8.3f}"
+        )
+
+    result = {
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "target": settings.login_url,
+        "browser_profile": get_browser_profile()["name"],
+        "repeat": args.repeat,
+        "benchmarks": benchmarks,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(result, file, indent=2)
+    print(f"Saved to {args.output}")
+    return 0
+
+
+def compare_benchmarks(args) -> int:
+    """Compare two saved runs, 1 if a benchmark got significantly slower"""
+    runs = []
+    for path in (args.baseline, args.current):
+        with open(path, encoding="utf-8") as file:
+            runs.append(json.load(file))
+    baseline, current = runs
+    if baseline["target"] != current["target"]:
+        print(f"Warning: comparing {baseline['target']} with {current['target']}")
+    if baseline["browser_profile"] != current["browser_profile"]:
+        print(
+            f"Warning: comparing browser profile {baseline['browser_profile']}"
+            f" with {current['browser_profile']}"
+        )
+
+    comparisons = compare_runs(
+        baseline["benchmarks"], current["benchmarks"], args.alpha, args.min_change
+    )
+    print(f"{'benchmark':<40} {'baseline':>9} {'current':>9} {'change':>8} {'p':>7}")
+    for comparison in comparisons:
+        print(
+            f"{comparison['name']:<40} {comparison['baseline_median']:>9.3f}"
+            f" {comparison['current_median']:>9.3f} {comparison['change']:>+8.1%}"
+            f" {comparison['p_value']:>7.4f}"
+            + ("  SLOWER" if comparison["slowdown"] else "")
+        )
+    return 1 if any(comparison["slowdown"] for comparison in comparisons) else 0
+
+
+def main(argv=None) -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the benchmarks")
+    run_parser.add_argument(
+        "--target", help='login URL of the site to benchmark, or "local"'
+    )
+    run_parser.add_argument(
+        "--repeat", type=int, default=10, help="timed runs of each benchmark"
+    )
+    run_parser.add_argument(
+        "--warmup", type=int, default=1, help="untimed runs of each flow first"
+    )
+    run_parser.add_argument(
+        "--flows", nargs="*", choices=list(FLOWS), default=list(FLOWS)
+    )
+    run_parser.add_argument(
+        "--fixtures",
+        nargs="*",
+        choices=list(FIXTURE_TESTS),
+        default=list(FIXTURE_TESTS),
+    )
+    run_parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    run_parser.set_defaults(handler=run_benchmarks)
+
+    compare_parser = commands.add_parser("compare", help="compare two saved runs")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument(
+        "--alpha", type=float, default=0.05, help="significance level"
+    )
+    compare_parser.add_argument(
+        "--min-change",
+        type=float,
+        default=0.05,
+        help="relative median slowdown ignored even when significant",
+    )
+    compare_parser.set_defaults(handler=compare_benchmarks)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
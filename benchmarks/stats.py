@@ -0,0 +1,126 @@
+"""
+This module contains the statistics of the benchmark suite: summaries of the
+repeated timings and a Mann-Whitney U test to compare two runs.
+
+The U test makes no assumption on the distribution of the timings, which are
+usually skewed by a few slow page loads.
+"""
+
+import math
+import statistics
+
+from utilities.timing_store import percentile
+
+
+def summarize(samples: list) -> dict:
+    """
+    Summarize the timings of a benchmark
+
+    Args:
+        samples: Durations in seconds
+
+    Returns:
+        dict: Number of runs, min, median, p95 and max in seconds
+    """
+    return {
+        "runs": len(samples),
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "p95": percentile(samples, 0.95),
+        "max": max(samples),
+    }
+
+
+def _normal_sf(z: float) -> float:
+    """Survival function of the standard normal distribution"""
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def mann_whitney_u(baseline: list, current: list) -> tuple:
+    """
+    One-sided Mann-Whitney U test of current being slower than baseline
+
+    Uses the normal approximation with tie and continuity corrections, which
+    is accurate from about 8 samples per side.
+
+    Args:
+        baseline: Durations of the baseline run
+        current: Durations of the current run
+
+    Returns:
+        tuple: The U statistic of current and the p-value
+
+    Raises:
+        ValueError: If either run has no samples
+    """
+    n1, n2 = len(current), len(baseline)
+    if not n1 or not n2:
+        raise ValueError(
+            f"Cannot compare {n2} baseline samples with {n1} current samples,"
+            " both runs need at least one"
+        )
+    ranked = sorted(
+        [(value, 0) for value in current] + [(value, 1) for value in baseline]
+    )
+    ranks = [0.0] * len(ranked)
+    tie_term = 0
+    start = 0
+    while start < len(ranked):
+        end = start
+        while end + 1 < len(ranked) and ranked[end + 1][0] == ranked[start][0]:
+            end += 1
+        # Tied values share the average of their ranks
+        for index in range(start, end + 1):
+            ranks[index] = (start + end) / 2 + 1
+        tied = end - start + 1
+        tie_term += tied**3 - tied
+        start = end + 1
+
+    rank_sum = sum(rank for rank, (_, side) in zip(ranks, ranked) if side == 0)
+    u = rank_sum - n1 * (n1 + 1) / 2
+    total = n1 + n2
+    variance = n1 * n2 / 12 * ((total + 1) - tie_term / (total * (total - 1)))
+    if variance <= 0:
+        return u, 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return u, _normal_sf(z)
+
+
+def compare_runs(
+    baseline: dict, current: dict, alpha: float = 0.05, min_change: float = 0.05
+) -> list:
+    """
+    Compare the benchmarks present in two runs
+
+    A benchmark is flagged as a slowdown when current is slower with a p-value
+    under alpha and its median grew by more than min_change.
+
+    Args:
+        baseline: Benchmarks of the baseline run, as saved by the runner
+        current: Benchmarks of the current run
+        alpha: Significance level of the U test
+        min_change: Relative median change below which a difference is ignored
+
+    Returns:
+        list: One dict per benchmark with the medians, change, p-value and
+            whether it is a slowdown
+    """
+    comparisons = []
+    for name in sorted(baseline.keys() & current.keys()):
+        before = baseline[name]["samples"]
+        after = current[name]["samples"]
+        _, p_value = mann_whitney_u(before, after)
+        median_before = statistics.median(before)
+        median_after = statistics.median(after)
+        change = median_after / median_before - 1 if median_before else 0.0
+        comparisons.append(
+            {
+                "name": name,
+                "baseline_median": median_before,
+                "current_median": median_after,
+                "change": change,
+                "p_value": p_value,
+                "slowdown": p_value < alpha and change > min_change,
+            }
+        )
+    return comparisons
@@ -0,0 +1,208 @@
+"""
+Shared pytest fixtures for the test suite
+"""
+
+import json
+import os
+import warnings
+from collections import Counter
+
+import allure
+import pytest
+
+from utilities.asset_cache import asset_cache_stats
+from utilities.auth_state import AuthStateCache
+from utilities.command_budget import (
+    CommandBudgetWarning,
+    check_budget,
+    count_commands,
+)
+from utilities.config import (
+    CHAIN_GROUPS_ENV,
+    LOCAL_SITE_HOST,
+    get_browser_profile,
+    get_worker_id,
+    settings,
+)
+from utilities.driver_pool import DriverPool
+from utilities.instrumentation import RECORDER, instrument_driver
+from utilities.navigation import Navigator
+from utilities.page_cache import disable_page_cache, enable_page_cache
+from utilities.setup_chain import (
+    SetupChains,
+    chain_key,
+    order_by_chain,
+    write_chain_groups,
+)
+from utilities.timing_store import TIMINGS
+
+# Page state cache counters summed over the session
+PAGE_CACHE_STATS = Counter()
+# Resources served from the shared asset cache, summed over the session
+ASSET_CACHE_STATS = Counter()
+# Checkpoints of the setup chains built by this worker
+SETUP_CHAINS = SetupChains()
+
+# Driver pool of the session, created before collection so it can pre-warm
+DRIVER_POOL_KEY = pytest.StashKey[DriverPool]()
+
+
+@pytest.fixture(scope="session")
+def driver_pool(request):
+    """Session wide pool of reusable drivers, one browser per worker"""
+    return request.config.stash[DRIVER_POOL_KEY]
+
+
+@pytest.fixture
+def driver(request, driver_pool):
+    """Fixture to check out a clean driver from the pool"""
+    driver = driver_pool.checkout()
+    if settings.page_cache:
+        enable_page_cache(driver)
+    if RECORDER.enabled:
+        instrument_driver(driver)
+        span = RECORDER.open(request.node.nodeid, "test")
+        yield driver
+        RECORDER.close(span)
+    else:
+        yield driver
+    if settings.asset_cache:
+        ASSET_CACHE_STATS.update(asset_cache_stats(driver))
+    cache = disable_page_cache(driver)
+    if cache is not None:
+        PAGE_CACHE_STATS.update(cache.stats())
+    driver_pool.checkin(driver)
+
+
+@pytest.fixture(autouse=True)
+def browser_profile():
+    """Label every test with the browser profile its timings were taken with"""
+    profile = get_browser_profile()
+    allure.dynamic.label("browser_profile", profile["name"])
+    allure.dynamic.label("page_load_strategy", profile["page_load_strategy"])
+    return profile
+
+
+@pytest.fixture(scope="session")
+def auth_state():
+    """Authenticated session captured by one UI login per worker"""
+    return AuthStateCache()
+
+
+@pytest.fixture
+def logged_in_driver(driver, auth_state):
+    """Fixture returning a driver already logged in on the inventory page"""
+    auth_state.apply(driver)
+    return driver
+
+
+@pytest.fixture
+def setup_chain(request, logged_in_driver, auth_state):
+    """
+    Fixture returning a navigator at the end of the setup chain of the test
+
+    The chain is declared with the setup_chain marker, prefixes built by
+    earlier tests of the worker are restored from their checkpoints.
+    """
+    navigator = Navigator(logged_in_driver, auth_state)
+    key = chain_key(request.node)
+    if key:
+        SETUP_CHAINS.reach(navigator, key)
+    return navigator
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_configure(config):
+    """Register the markers of the suite and set up the allure results store"""
+    if settings.results_store == "stream":
+        from utilities import results_store
+
+        results_store.install(config, get_worker_id())
+
+    config.addinivalue_line(
+        "markers",
+        "command_budget(total, **per_command): maximum number of WebDriver "
+        "commands the test body may send, in total and per command type",
+    )
+    config.addinivalue_line(
+        "markers",
+        "setup_chain(*states, items=None): navigation states the setup of the "
+        "test goes through, shared with the tests of the same prefix",
+    )
+
+
+def pytest_collection_modifyitems(items):
+    """Run the tests sharing a setup chain prefix one after the other"""
+    order_by_chain(items)
+    if os.environ.get(CHAIN_GROUPS_ENV):
+        write_chain_groups(items, os.environ[CHAIN_GROUPS_ENV])
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    """Count the WebDriver commands of the test body and check its budgets"""
+    driver = item.funcargs.get("driver")
+    if driver is None or settings.command_budget == "off":
+        return (yield)
+
+    counter = count_commands(driver)
+    counter.reset()
+    result = yield
+
+    allure.attach(
+        json.dumps(dict(counter.counts.most_common()), indent=2),
+        name="WebDriver commands",
+        attachment_type=allure.attachment_type.JSON,
+    )
+    messages = list(counter.violations)
+    marker = item.get_closest_marker("command_budget")
+    if marker is not None:
+        messages += check_budget(counter.counts, *marker.args, **marker.kwargs)
+    if messages:
+        report = "Command budget exceeded:\n" + "\n".join(messages)
+        if settings.command_budget == "fail":
+            pytest.fail(report, pytrace=False)
+        warnings.warn(CommandBudgetWarning(report))
+    return result
+
+
+def pytest_terminal_summary(terminalreporter):
+    """Report the hits of the page state cache, the asset cache and the setup chains"""
+    if PAGE_CACHE_STATS:
+        terminalreporter.write_line(
+            "page cache: {hits} hits, {misses} misses, "
+            "{invalidations} invalidations".format(**PAGE_CACHE_STATS)
+        )
+    if ASSET_CACHE_STATS["requests"]:
+        terminalreporter.write_line(
+            "asset cache: {hits}/{requests} resources served from disk "
+            "({rate:.0%})".format(
+                rate=ASSET_CACHE_STATS["hits"] / ASSET_CACHE_STATS["requests"],
+                **ASSET_CACHE_STATS,
+            )
+        )
+    if SETUP_CHAINS.built:
+        terminalreporter.write_line(
+            f"setup chains: {SETUP_CHAINS.built} states built, "
+            f"{SETUP_CHAINS.restored} restored from checkpoints"
+        )
+
+
+def pytest_sessionstart(session):
+    """Serve the local stand-in site if configured and start pre-warming drivers"""
+    if settings.site == "local":
+        from utilities.local_swag_labs import ensure_server
+
+        ensure_server(LOCAL_SITE_HOST, settings.local_site_port)
+
+    pool = DriverPool()
+    if settings.driver_prewarm and not session.config.option.collectonly:
+        pool.prewarm(settings.driver_prewarm)
+    session.config.stash[DRIVER_POOL_KEY] = pool
+
+
+def pytest_sessionfinish(session):
+    """Quit the pooled drivers and persist the timings recorded in the session"""
+    session.config.stash[DRIVER_POOL_KEY].close()
+    TIMINGS.save()
+    RECORDER.save(settings.instrumentation_dir, get_worker_id())
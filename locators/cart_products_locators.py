@@ -2,16 +2,15 @@
 
 from selenium.webdriver.common.by import By
 
+from locators.common_locators import CommonLocators
+
 
 class CartProductsLocators:
     """Locators for the cart products page"""
 
     CART_PRODUCTS_TITLE = (By.XPATH, "//span[@class='title' and text()='Your Cart']")
-    CART_PRODUCT_NAME = (
-        By.CSS_SELECTOR,
-        "div.inventory_item_name[data-test='inventory-item-name']",
-    )
-    CART_PRODUCT_QUANTITY = (By.CSS_SELECTOR, "div.cart_quantity")
-    CART_PRODUCT_PRICE = (By.CSS_SELECTOR, "div.inventory_item_price")
-    REMOVE_BUTTON = (By.XPATH, "//button[text()='Remove']")
-    CHECKOUT_BUTTON = (By.XPATH, "//button[@data-test='checkout']")
+    CART_PRODUCT_NAME = CommonLocators.INVENTORY_ITEM_NAME
+    CART_PRODUCT_QUANTITY = CommonLocators.CART_ITEM_QUANTITY
+    CART_PRODUCT_PRICE = CommonLocators.INVENTORY_ITEM_PRICE
+    REMOVE_BUTTON = CommonLocators.REMOVE_BUTTON
+    CHECKOUT_BUTTON = (By.CSS_SELECTOR, "button[data-test='checkout']")
@@ -2,6 +2,8 @@
 
 from selenium.webdriver.common.by import By
 
+from locators.common_locators import CommonLocators
+
 
 class CheckoutLocators:
     """Locators for the checkout pages"""
@@ -16,8 +18,8 @@ class CheckoutLocators:
     FIRST_NAME_INPUT = (By.ID, "first-name")
     LAST_NAME_INPUT = (By.ID, "last-name")
     ZIP_CODE_INPUT = (By.ID, "postal-code")
-    CONTINUE_BUTTON = (By.XPATH, "//input[@data-test='continue']")
-    ERROR_MESSAGE = (By.XPATH, "//h3[@data-test='error']")
+    CONTINUE_BUTTON = (By.CSS_SELECTOR, "input[data-test='continue']")
+    ERROR_MESSAGE = CommonLocators.ERROR_MESSAGE
 
     # Checkout page Overview Locators
 
@@ -26,26 +28,23 @@ class CheckoutLocators:
         "//span[@class='title' and text()='Checkout: Overview']",
     )
 
-    CART_ITEM = (By.XPATH, "//div[@class='cart_item']")
+    CART_ITEM = (By.CSS_SELECTOR, "div[class='cart_item']")
 
-    ITEM_QUANTITY = (By.XPATH, "//div[@class='cart_quantity']")
-    ITEM_NAME = (By.XPATH, "//div[@data-test='inventory-item-name']")
-    ITEM_DESCRIPTION = (By.XPATH, "//div[@data-test='inventory-item-desc']")
-    ITEM_PRICE = (By.XPATH, "//div[@data-test='inventory-item-price']")
+    ITEM_QUANTITY = CommonLocators.CART_ITEM_QUANTITY
+    ITEM_NAME = (By.CSS_SELECTOR, "div[data-test='inventory-item-name']")
+    ITEM_DESCRIPTION = (By.CSS_SELECTOR, "div[data-test='inventory-item-desc']")
+    ITEM_PRICE = (By.CSS_SELECTOR, "div[data-test='inventory-item-price']")
     # Price Total Section --------------------------------------
-    ITEM_TOTAL = (By.XPATH, "//div[@data-test='subtotal-label']")
-    TAX = (By.XPATH, "//div[@data-test='tax-label']")
-    TOTAL = (By.XPATH, "//div[@class='summary_total_label']")
+    ITEM_TOTAL = (By.CSS_SELECTOR, "div[data-test='subtotal-label']")
+    TAX = (By.CSS_SELECTOR, "div[data-test='tax-label']")
+    TOTAL = (By.CSS_SELECTOR, "div[class='summary_total_label']")
     # -----------------------------------------------------------
 
-    FINISH_BUTTON = (By.XPATH, "//button[@data-test='finish']")
+    FINISH_BUTTON = (By.CSS_SELECTOR, "button[data-test='finish']")
 
     # Checkout page Complete Locators
 
-    CHECKOUT_PAGE_COMPLETE_TITLE = (
-        By.XPATH,
-        "//span[@data-test='title']",
-    )
+    CHECKOUT_PAGE_COMPLETE_TITLE = (By.CSS_SELECTOR, "span[data-test='title']")
 
-    THANK_YOU_MESSAGE = (By.XPATH, "//h2[@class='complete-header']")
-    BACK_HOME_BUTTON = (By.XPATH, "//button[@data-test='back-to-products']")
\ No newline at end of file
+    THANK_YOU_MESSAGE = (By.CSS_SELECTOR, "h2[class='complete-header']")
+    BACK_HOME_BUTTON = (By.CSS_SELECTOR, "button[data-test='back-to-products']")
\ No newline at end of file
@@ -0,0 +1,20 @@
+"""
+This module contains locators shared by several pages
+"""
+
+from selenium.webdriver.common.by import By
+
+
+class CommonLocators:
+    """Locators shared by several pages"""
+
+    INVENTORY_ITEM_NAME = (
+        By.CSS_SELECTOR,
+        "div.inventory_item_name[data-test='inventory-item-name']",
+    )
+    INVENTORY_ITEM_PRICE = (By.CSS_SELECTOR, "div.inventory_item_price")
+    CART_ITEM_QUANTITY = (By.CSS_SELECTOR, "div.cart_quantity")
+    REMOVE_BUTTON = (By.XPATH, "//button[text()='Remove']")
+    ERROR_MESSAGE = (By.CSS_SELECTOR, "h3[data-test='error']")
+    # Logo of the login page or of the app header, present once a page rendered
+    PAGE_LOGO = (By.CSS_SELECTOR, "div.login_logo, div.app_logo")
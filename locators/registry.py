@@ -0,0 +1,326 @@
+"""
+This module contains a central registry of the locator classes.
+
+The registry finds duplicated locators, translates XPath locators to an
+equivalent CSS selector when possible, and benchmarks the lookup of every
+locator against a live page.
+
+Usage:
+    python -m locators.registry
+    python -m locators.registry --benchmark https://www.saucedemo.com/inventory.html
+"""
+
+import argparse
+import re
+import statistics
+import time
+
+from selenium.webdriver.common.by import By
+
+from locators.cart_products_locators import CartProductsLocators
+from locators.checkout_locators import CheckoutLocators
+from locators.common_locators import CommonLocators
+from locators.login_locators import LoginLocators
+from locators.product_locators import ProductLocators
+
+LOCATOR_CLASSES = (
+    CommonLocators,
+    LoginLocators,
+    ProductLocators,
+    CartProductsLocators,
+    CheckoutLocators,
+)
+
+BY_VALUES = {value for name, value in vars(By).items() if not name.startswith("_")}
+
+# One step of a translatable XPath: //tag or //tag[@attr='value' and ...]
+XPATH_STEP = re.compile(r"//(?P<tag>\*|[\w-]+)(?:\[(?P<predicates>[^\[\]]*)\])?")
+XPATH_PREDICATE = re.compile(
+    r"^@(?P<attr>[\w-]+)\s*=\s*(?P<quote>['\"])(?P<value>.*)(?P=quote)$"
+)
+
+
+def xpath_to_css(xpath: str):
+    """
+    Translate an XPath expression to an equivalent CSS selector
+
+    Only descendant steps with attribute equality predicates are translated,
+    e.g. "//div[@class='cart_item']" -> "div[class='cart_item']". Text,
+    position and function predicates have no CSS equivalent.
+
+    Args:
+        xpath: XPath expression
+
+    Returns:
+        str: CSS selector, None if the expression cannot be translated
+    """
+    steps = []
+    position = 0
+    for match in XPATH_STEP.finditer(xpath):
+        if match.start() != position:
+            return None
+        position = match.end()
+
+        selector = "" if match.group("tag") == "*" else match.group("tag")
+        predicates = match.group("predicates")
+        if predicates is not None:
+            for predicate in re.split(r"\s+and\s+", predicates.strip()):
+                attribute = XPATH_PREDICATE.match(predicate)
+                if attribute is None or "'" in attribute.group("value"):
+                    return None
+                selector += "[{attr}='{value}']".format(**attribute.groupdict())
+        steps.append(selector or "*")
+
+    if not steps or position != len(xpath):
+        return None
+    return " ".join(steps)
+
+
+# Tests of a compound CSS selector: class, id, attribute (its value quoted or
+# not, quotes may hold spaces and brackets), pseudo class or element
+CSS_PART = re.compile(
+    r"""\.(?P<cls>[\w-]+)"""
+    r"""|\#(?P<id>[\w-]+)"""
+    r"""|\[\s*(?P<attr>[\w-]+)\s*(?:(?P<op>[~|^$*]?=)\s*"""
+    r"""(?:"(?P<dq>(?:[^"\\]|\\.)*)"|'(?P<sq>(?:[^'\\]|\\.)*)'|(?P<bare>[\w-]+))"""
+    r"""\s*)?\]"""
+)
+CSS_TAG = re.compile(r"\*|[\w-]+")
+CSS_COMBINATORS = ">+~,"
+
+
+def _split_css(selector: str) -> list:
+    """
+    Split a CSS selector into its compound selectors and combinators
+
+    Spaces and combinators inside quotes, brackets or parentheses do not
+    split, e.g. "a[title='x y'] > b" -> ["a[title='x y']", ">", "b"].
+    """
+    tokens = [""]
+    quote = None
+    depth = 0
+    for char in selector:
+        if quote is None and depth == 0 and (char.isspace() or char in CSS_COMBINATORS):
+            tokens += [char, ""] if char in CSS_COMBINATORS else [""]
+            continue
+        if quote is None and char in "'\"":
+            quote = char
+        elif char == quote and not tokens[-1].endswith("\\"):
+            quote = None
+        elif quote is None:
+            depth += (char in "[(") - (char in "])")
+        tokens[-1] += char
+    return [token for token in tokens if token]
+
+
+def _canonical_compound(compound: str) -> str:
+    """
+    Write a compound selector one way only, kept as written if not understood
+
+    [id='x'] is #x and [class~='x'] is .x, but [class='x'] stays apart from .x:
+    it only matches elements whose class attribute is exactly "x".
+    """
+    tag = CSS_TAG.match(compound)
+    position = tag.end() if tag else 0
+    parts = []
+    while position < len(compound):
+        part = CSS_PART.match(compound, position)
+        if part is None:
+            # Pseudo classes and anything else are compared as written
+            return compound
+        position = part.end()
+        if part.group("cls"):
+            parts.append(f".{part.group('cls')}")
+            continue
+        if part.group("id"):
+            parts.append(f"#{part.group('id')}")
+            continue
+        attr, op = part.group("attr"), part.group("op")
+        if op is None:
+            parts.append(f"[{attr}]")
+            continue
+        value = next(
+            value for value in part.group("dq", "sq", "bare") if value is not None
+        )
+        if re.fullmatch(r"[\w-]+", value):
+            if attr == "id" and op == "=":
+                parts.append(f"#{value}")
+                continue
+            if attr == "class" and op == "~=":
+                parts.append(f".{value}")
+                continue
+        quoted = f"'{value}'" if "'" not in value else f'"{value}"'
+        parts.append(f"[{attr}{op}{quoted}]")
+    tag = tag.group() if tag else ""
+    if tag == "*" and parts:
+        tag = ""
+    return tag + "".join(sorted(parts))
+
+
+def canonical_css(selector: str) -> str:
+    """
+    Write a CSS selector in a canonical form, so equivalent ones compare equal
+
+    Quotes, spacing, the order of the tests of each compound selector and the
+    [id=...] / [class~=...] attribute forms are normalized. Compound selectors
+    using other syntax (pseudo classes...) are kept as written.
+    """
+    tokens = [
+        token if token in CSS_COMBINATORS else _canonical_compound(token)
+        for token in _split_css(selector)
+    ]
+    return " ".join(tokens).replace(" , ", ", ")
+
+
+def canonical_locator(locator: tuple) -> tuple:
+    """
+    Get the canonical CSS form of a locator, used to find duplicates
+
+    XPath locators are translated when possible, ID, class name and name
+    locators become CSS, and CSS selectors are normalized by canonical_css.
+    """
+    by, value = compile_locator(locator)
+    if by == By.ID:
+        by, value = By.CSS_SELECTOR, f"[id='{value}']"
+    elif by == By.CLASS_NAME:
+        # Matches one of the classes of the element, like .value
+        by, value = By.CSS_SELECTOR, f".{value}"
+    elif by == By.NAME:
+        by, value = By.CSS_SELECTOR, f"[name='{value}']"
+    if by == By.CSS_SELECTOR:
+        return (by, canonical_css(value))
+    return (by, value)
+
+
+def compile_locator(locator: tuple) -> tuple:
+    """Get the fastest equivalent of a locator, CSS when an XPath translates"""
+    by, value = locator
+    if by == By.XPATH:
+        css = xpath_to_css(value)
+        if css is not None:
+            return (By.CSS_SELECTOR, css)
+    return locator
+
+
+class LocatorRegistry:
+    """Registry of every locator declared in the locator classes"""
+
+    def __init__(self, classes=LOCATOR_CLASSES):
+        """
+        Initialize the registry
+
+        Args:
+            classes: Locator classes to register
+        """
+        self.locators = {}
+        for cls in classes:
+            for attr, value in vars(cls).items():
+                if (
+                    isinstance(value, tuple)
+                    and len(value) == 2
+                    and value[0] in BY_VALUES
+                ):
+                    self.locators[f"{cls.__name__}.{attr}"] = value
+
+    def duplicates(self) -> list:
+        """
+        Find locators declared more than once with an equivalent value
+
+        Locators are compared in their canonical CSS form, so an XPath and the
+        CSS selector it translates to, or two spellings of the same selector,
+        are duplicates. Aliases of the same tuple (e.g. CommonLocators entries
+        reused by a page class) are not duplicates.
+
+        Returns:
+            list: One list of locator names per group of duplicates
+        """
+        groups = {}
+        for name, locator in self.locators.items():
+            groups.setdefault(canonical_locator(locator), []).append((name, locator))
+
+        duplicates = []
+        for entries in groups.values():
+            distinct = {id(locator) for _, locator in entries}
+            if len(distinct) > 1:
+                duplicates.append([name for name, _ in entries])
+        return duplicates
+
+    def translations(self) -> dict:
+        """Get the locators that have a faster equivalent, by name"""
+        return {
+            name: compile_locator(locator)
+            for name, locator in self.locators.items()
+            if compile_locator(locator) != locator
+        }
+
+    def benchmark(self, driver, repeats: int = 20) -> list:
+        """
+        Time the lookup of every locator against the current page
+
+        Each locator is timed as declared and, when it translates, as CSS.
+
+        Args:
+            driver: WebDriver instance on the page to benchmark
+            repeats: Number of lookups per locator and strategy
+
+        Returns:
+            list: One dict per locator and strategy with the number of matches
+                and the median lookup time in milliseconds, fastest first
+        """
+        results = []
+        for name, locator in self.locators.items():
+            for candidate in {locator, compile_locator(locator)}:
+                timings = []
+                for _ in range(repeats):
+                    start = time.perf_counter()
+                    matches = len(driver.find_elements(*candidate))
+                    timings.append((time.perf_counter() - start) * 1000)
+                results.append(
+                    {
+                        "name": name,
+                        "by": candidate[0],
+                        "value": candidate[1],
+                        "matches": matches,
+                        "median_ms": statistics.median(timings),
+                    }
+                )
+        return sorted(results, key=lambda result: result["median_ms"])
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Inspect the locator classes")
+    parser.add_argument(
+        "--benchmark",
+        metavar="URL",
+        help="log in, open URL and time the lookup of every locator",
+    )
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    registry = LocatorRegistry()
+    print(f"{len(registry.locators)} locators registered")
+    for group in registry.duplicates():
+        print(f"Duplicated locator: {', '.join(group)}")
+    for name, (by, value) in registry.translations().items():
+        print(f"Translatable to {by}: {name} -> {value}")
+
+    if args.benchmark:
+        from utilities.auth_state import AuthStateCache
+        from utilities.config import get_driver
+
+        driver = get_driver()
+        try:
+            AuthStateCache().capture(driver)
+            driver.get(args.benchmark)
+            for result in registry.benchmark(driver, args.repeats):
+                print(
+                    "{median_ms:8.2f} ms  {matches:3d} matches  "
+                    "{name} ({by}: {value})".format(**result)
+                )
+        finally:
+            driver.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+This module contains the BasePage class shared by every page object
+"""
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from utilities.element_cache import ElementCache
+from utilities.instrumentation import instrument_class, instrumented
+from utilities.page_cache import invalidates_cache
+from utilities.wait_utilities import WaitUtilities
+
+
+class BasePage:
+    """Base page object"""
+
+    def __init__(self, driver: WebDriver):
+        """Initialize the page object with its element cache and waits"""
+        self.driver = driver
+        self.elements = ElementCache(driver)
+        self.waits = WaitUtilities(driver)
+
+    def __init_subclass__(cls, **kwargs):
+        """Time the public methods of every page object"""
+        super().__init_subclass__(**kwargs)
+        instrument_class(cls)
+
+    def find(self, locator: tuple):
+        """
+        Find an element, reusing the one found earlier until it goes stale
+
+        Args:
+            locator: Tuple of locator strategy and value (e.g., (By.ID, "my-id"))
+        """
+        return self.elements.find(locator)
+
+    @instrumented
+    @invalidates_cache
+    def open(self, url: str, ready_locator: tuple, name: str = None):
+        """
+        Navigate to a URL and wait until the page is ready to be used
+
+        With the "eager" or "none" page load strategy driver.get returns before
+        the page is complete, so readiness is an element the page needs.
+
+        Args:
+            url: URL to open
+            ready_locator: Locator of an element present once the page is ready
+            name: Name of the readiness wait
+        """
+        self.driver.get(url)
+        return self.waits.wait_for_element(ready_locator, name=name)
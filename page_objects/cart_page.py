@@ -4,27 +4,29 @@ import random
 
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
 
 from locators.cart_products_locators import CartProductsLocators
+from page_objects.base_page import BasePage
+from utilities.page_cache import cached_getter, invalidates_cache
 
 
-class CartPage:
+class CartPage(BasePage):
     """Page object for the cart page"""
 
     def __init__(self, driver: WebDriver):
-        self.driver = driver
+        super().__init__(driver)
         self.locators = CartProductsLocators
 
     def wait_for_cart_title(self):
         """Wait for the cart title to be visible"""
-        self.driver.find_element(*self.locators.CART_PRODUCTS_TITLE)
+        self.find(self.locators.CART_PRODUCTS_TITLE)
 
+    @cached_getter
     def get_cart_title(self):
         """Get the cart page title"""
-        return self.driver.find_element(*self.locators.CART_PRODUCTS_TITLE).text
+        return self.find(self.locators.CART_PRODUCTS_TITLE).text
 
+    @cached_getter
     def get_cart_product_name(self):
         """Get the cart product name or names"""
         cart_product_names = []
@@ -33,6 +35,7 @@ class CartPage:
         # print(f"Cart products name in cart page: {cart_product_names}")
         return cart_product_names
 
+    @invalidates_cache
     def remove_product_from_cart(self, product_name: str = None) -> bool:
         """
         Remove a product from the cart page and verify the removal
@@ -63,21 +66,19 @@ class CartPage:
             formatted_name = product_name.lower().replace(" ", "-")
             # print(f"Formatted name in cart page: {formatted_name}")
             # Wait for and click remove button
-            remove_button = WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable(
-                    (By.CSS_SELECTOR, f"button[data-test='remove-{formatted_name}']")
-                )
+            remove_button = self.waits.wait_for_clickable(
+                (By.CSS_SELECTOR, f"button[data-test='remove-{formatted_name}']"),
+                name="cart_remove_button",
             )
             remove_button.click()
 
             # Wait for product to be removed
-            WebDriverWait(self.driver, 5).until(
-                EC.invisibility_of_element_located(
-                    (
-                        By.XPATH,
-                        f"//div[@data-test='inventory-item-name' and text()='{product_name}']",
-                    )
-                )
+            self.waits.wait_for_invisible(
+                (
+                    By.XPATH,
+                    f"//div[@data-test='inventory-item-name' and text()='{product_name}']",
+                ),
+                name="cart_product_removed",
             )
 
             return True
@@ -86,6 +87,7 @@ class CartPage:
             print(f"Error removing product from cart: {str(e)}")
             return False
 
+    @invalidates_cache
     def click_checkout_button(self):
         """Click the checkout button"""
-        self.driver.find_element(*self.locators.CHECKOUT_BUTTON).click()
+        self.find(self.locators.CHECKOUT_BUTTON).click()
@@ -1,34 +1,34 @@
 """Checkout Complete Page"""
 
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
-
 from locators.checkout_locators import CheckoutLocators
+from page_objects.base_page import BasePage
+from utilities.page_cache import cached_getter, invalidates_cache
 
 
-class CheckoutCompletePage:
+class CheckoutCompletePage(BasePage):
     """Checkout Complete Page"""
 
     def __init__(self, driver):
-        self.driver = driver
+        super().__init__(driver)
         self.locators = CheckoutLocators()
 
     def wait_for_checkout_complete_title(self):
         """Wait for the checkout complete title"""
-        WebDriverWait(self.driver, 10).until(
-            EC.presence_of_element_located(self.locators.CHECKOUT_PAGE_COMPLETE_TITLE)
+        self.waits.wait_for_element(
+            self.locators.CHECKOUT_PAGE_COMPLETE_TITLE, name="checkout_complete_title"
         )
 
+    @cached_getter
     def get_checkout_complete_title(self):
         """Get the checkout complete title"""
-        return self.driver.find_element(
-            *self.locators.CHECKOUT_PAGE_COMPLETE_TITLE
-        ).text
+        return self.find(self.locators.CHECKOUT_PAGE_COMPLETE_TITLE).text
 
+    @cached_getter
     def get_thank_you_message(self):
         """Get the thank you message"""
-        return self.driver.find_element(*self.locators.THANK_YOU_MESSAGE).text
+        return self.find(self.locators.THANK_YOU_MESSAGE).text
 
+    @invalidates_cache
     def click_back_home_button(self):
         """Click the back home button"""
-        self.driver.find_element(*self.locators.BACK_HOME_BUTTON).click()
+        self.find(self.locators.BACK_HOME_BUTTON).click()
@@ -1,46 +1,44 @@
 """Checkout Information Page"""
 
-
 from selenium.webdriver.remote.webdriver import WebDriver
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.wait import WebDriverWait
 
 from locators.checkout_locators import CheckoutLocators
+from page_objects.base_page import BasePage
+from utilities.page_cache import cached_getter, invalidates_cache
 
 
-class CheckoutInformationPage:
+class CheckoutInformationPage(BasePage):
     """Checkout Information Page"""
 
     def __init__(self, driver: WebDriver):
-        self.driver = driver
+        super().__init__(driver)
         self.locators = CheckoutLocators
 
     def wait_for_checkout_information_title_confirmation(self):
         """Wait for the checkout information title visibility and confirmation"""
-        WebDriverWait(self.driver, 5).until(
-            EC.presence_of_element_located(
-                self.locators.CHECKOUT_PAGE_INFORMATION_TITLE
-            )
+        self.waits.wait_for_element(
+            self.locators.CHECKOUT_PAGE_INFORMATION_TITLE,
+            name="checkout_information_title",
         )
 
+    @cached_getter
     def get_checkout_information_title(self):
         """Get the checkout information title"""
-        return self.driver.find_element(
-            *self.locators.CHECKOUT_PAGE_INFORMATION_TITLE
-        ).text
+        return self.find(self.locators.CHECKOUT_PAGE_INFORMATION_TITLE).text
 
     def get_first_name_input(self):
         """Get the first name input"""
-        return self.driver.find_element(*self.locators.FIRST_NAME_INPUT)
+        return self.find(self.locators.FIRST_NAME_INPUT)
 
     def get_last_name_input(self):
         """Get the last name input"""
-        return self.driver.find_element(*self.locators.LAST_NAME_INPUT)
+        return self.find(self.locators.LAST_NAME_INPUT)
 
     def get_zip_code_input(self):
         """Get the zip code input"""
-        return self.driver.find_element(*self.locators.ZIP_CODE_INPUT)
+        return self.find(self.locators.ZIP_CODE_INPUT)
 
+    @invalidates_cache
     def fill_information_form(self, first_name, last_name, zip_code):
         """Fill the information form"""
 
@@ -51,17 +49,19 @@ class CheckoutInformationPage:
         if zip_code:
             self.get_zip_code_input().send_keys(zip_code)
 
+    @invalidates_cache
     def click_continue_button(self):
         """Click the continue button"""
-        self.driver.find_element(*self.locators.CONTINUE_BUTTON).click()
+        self.find(self.locators.CONTINUE_BUTTON).click()
 
     def wait_for_error_message(self):
         """Wait for the error message to be visible"""
-        error_message = WebDriverWait(self.driver, 5).until(
-            EC.presence_of_element_located(self.locators.ERROR_MESSAGE)
+        error_message = self.waits.wait_for_element(
+            self.locators.ERROR_MESSAGE, name="checkout_error_message"
         )
         return error_message
 
+    @cached_getter
     def get_error_message(self):
         """Get the error message"""
-        return self.driver.find_element(*self.locators.ERROR_MESSAGE).text
+        return self.find(self.locators.ERROR_MESSAGE).text
@@ -1,69 +1,96 @@
 """Checkout Overview Page"""
 
-from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.wait import WebDriverWait
 
 from locators.checkout_locators import CheckoutLocators
-
-
-class CheckoutOverviewPage:
+from page_objects.base_page import BasePage
+from utilities.page_cache import cached_getter, invalidates_cache
+
+# Reads every cart line of the overview in one round trip,
+# arguments are the strategy and value of the cart item locator
+CHECKOUT_ITEMS_SCRIPT = """
+const [by, value] = arguments;
+let items = [];
+if (by === "xpath") {
+    const snapshot = document.evaluate(
+        value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null
+    );
+    for (let i = 0; i < snapshot.snapshotLength; i++) {
+        items.push(snapshot.snapshotItem(i));
+    }
+} else {
+    items = Array.from(document.querySelectorAll(value));
+}
+const text = (item, className) => {
+    const element = item.getElementsByClassName(className)[0];
+    return element ? element.textContent.trim() : "";
+};
+return items.map((item) => ({
+    quantity: text(item, "cart_quantity"),
+    name: text(item, "inventory_item_name"),
+    description: text(item, "inventory_item_desc"),
+    price: text(item, "inventory_item_price"),
+}));
+"""
+
+
+class CheckoutOverviewPage(BasePage):
     """Checkout Overview Page"""
 
     def __init__(self, driver: WebDriver):
-        self.driver = driver
+        super().__init__(driver)
         self.locators = CheckoutLocators
 
     def wait_for_checkout_overview_title(self):
         """Wait for the checkout overview title"""
-        WebDriverWait(self.driver, 5).until(
-            EC.presence_of_element_located(self.locators.CHECKOUT_PAGE_OVERVIEW_TITLE)
+        self.waits.wait_for_element(
+            self.locators.CHECKOUT_PAGE_OVERVIEW_TITLE, name="checkout_overview_title"
         )
 
+    @cached_getter
     def get_checkout_overview_title(self):
         """Get the checkout overview title"""
-        return self.driver.find_element(
-            *self.locators.CHECKOUT_PAGE_OVERVIEW_TITLE
-        ).text
+        return self.find(self.locators.CHECKOUT_PAGE_OVERVIEW_TITLE).text
 
+    @cached_getter
     def get_sub_total_items(self):
         """Get page subTotal from items prices"""
-        sub_total = self.driver.find_element(*self.locators.ITEM_TOTAL).text
+        sub_total = self.find(self.locators.ITEM_TOTAL).text
         return float(sub_total.replace("Item total: $", ""))
 
+    @cached_getter
     def get_tax_total_items(self):
         """Get tax total from price items"""
-        tax = self.driver.find_element(*self.locators.TAX).text
+        tax = self.find(self.locators.TAX).text
         return float(tax.replace("Tax: $", ""))
 
+    @cached_getter
     def get_total_items(self):
         """Get total items"""
-        total = self.driver.find_element(*self.locators.TOTAL).text
+        total = self.find(self.locators.TOTAL).text
         return float(total.replace("Total: $", ""))
 
-    def get_checkout_items_info(self):
-        """Get the checkout items info"""
-        checkout_items_info = []
-        cart_items = self.driver.find_elements(*self.locators.CART_ITEM)
-
-        for item in cart_items:
-            item_quantity = item.find_element(By.CLASS_NAME, "cart_quantity").text
-            item_name = item.find_element(By.CLASS_NAME, "inventory_item_name").text
-            item_description = item.find_element(
-                By.CLASS_NAME, "inventory_item_desc"
-            ).text
-            item_price = item.find_element(By.CLASS_NAME, "inventory_item_price").text
-
-            checkout_items_info.append(
-                {
-                    "quantity": item_quantity,
-                    "name": item_name,
-                    "description": item_description,
-                    "price": item_price,
-                }
-            )
-        return checkout_items_info
+    @cached_getter
+    def get_checkout_items_info(self) -> list:
+        """
+        Get the checkout items info in a single script execution
+
+        Returns:
+            list: One dict per cart line with the quantity (int), name (str),
+                description (str) and price (float) of the item
+        """
+        records = self.driver.execute_script(
+            CHECKOUT_ITEMS_SCRIPT, *self.locators.CART_ITEM
+        )
+        return [
+            {
+                "quantity": int(record["quantity"]),
+                "name": record["name"],
+                "description": record["description"],
+                "price": float(record["price"].replace("$", "")),
+            }
+            for record in records
+        ]
 
     def get_checkout_items_names(self):
         """Get only the names of items in checkout overview"""
@@ -75,12 +102,9 @@ class CheckoutOverviewPage:
 
     def sum_checkout_items_prices(self):
         """Sum checkout items prices"""
-        total = sum(
-            float(item_price.replace("$", ""))
-            for item_price in self.get_checkout_items_prices()
-        )
-        return total
+        return round(sum(self.get_checkout_items_prices()), 2)
 
+    @invalidates_cache
     def click_finish_button(self):
         """Click the finish button"""
-        self.driver.find_element(*self.locators.FINISH_BUTTON).click()
+        self.find(self.locators.FINISH_BUTTON).click()
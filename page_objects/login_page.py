@@ -7,38 +7,49 @@ from selenium.common.exceptions import NoSuchElementException
 from selenium.webdriver.remote.webdriver import WebDriver
 
 from locators.login_locators import LoginLocators
+from page_objects.base_page import BasePage
+from utilities.command_budget import command_budget
+from utilities.page_cache import cached_getter, invalidates_cache
 
 
-class LoginPage:
+class LoginPage(BasePage):
     """Login page object"""
 
     def __init__(self, driver: WebDriver):
         """Initialize the login page object"""
-        self.driver = driver
+        super().__init__(driver)
         self.locators = LoginLocators
 
+    @invalidates_cache
     def open_page(self):
         """Open the login page"""
-        self.driver.get(self.locators.URL)
+        self.open(self.locators.URL, self.locators.LOGIN_BUTTON, name="login_form")
 
+    @invalidates_cache
+    @command_budget(3)
     def enter_username(self, username):
         """Enter the username"""
-        self.driver.find_element(*self.locators.USERNAME_INPUT).clear()
-        self.driver.find_element(*self.locators.USERNAME_INPUT).send_keys(username)
+        self.find(self.locators.USERNAME_INPUT).clear()
+        self.find(self.locators.USERNAME_INPUT).send_keys(username)
 
+    @invalidates_cache
+    @command_budget(3)
     def enter_password(self, password):
         """Enter the password"""
-        self.driver.find_element(*self.locators.PASSWORD_INPUT).clear()
-        self.driver.find_element(*self.locators.PASSWORD_INPUT).send_keys(password)
+        self.find(self.locators.PASSWORD_INPUT).clear()
+        self.find(self.locators.PASSWORD_INPUT).send_keys(password)
 
+    @invalidates_cache
+    @command_budget(2)
     def click_login_button(self):
         """Click the login button"""
-        self.driver.find_element(*self.locators.LOGIN_BUTTON).click()
+        self.find(self.locators.LOGIN_BUTTON).click()
 
+    @cached_getter
     def get_error_message(self):
         """Get the error message displayed on the login page"""
         try:
-            error_element = self.driver.find_element(*self.locators.ERROR_MESSAGE)
+            error_element = self.find(self.locators.ERROR_MESSAGE)
             return error_element.text
         except NoSuchElementException:
             return ""
@@ -5,42 +5,72 @@ which is used to interact with the product page
 
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.wait import WebDriverWait
 
 from locators.product_locators import ProductLocators
-from utilities.random_web_element_func import random_web_element
+from page_objects.base_page import BasePage
+from utilities.page_cache import cached_getter, invalidates_cache
+from utilities.random_web_element_func import ALL, random_element_sample, sample_seed
 
 
-class ProductPage:
+class ProductPage(BasePage):
     """Product page object"""
 
     def __init__(self, driver: WebDriver):
         """Initialize the product page object"""
-        self.driver = driver
+        super().__init__(driver)
         self.locators = ProductLocators
         self._random_products = []
         self._selected_product_names = []
+        self.sample_seed = None
 
     def wait_for_product_title(self):
         """Wait for product title"""
-        WebDriverWait(self.driver, 10).until(
-            EC.presence_of_element_located(self.locators.APP_LOGO)
-        )
+        self.waits.wait_for_element(self.locators.APP_LOGO, name="product_title")
 
+    @cached_getter
     def get_product_title(self) -> str:
         """Get product title"""
-        return self.driver.find_element(*ProductLocators.PRODUCT_TITLE).text
-
-    def get_products_random_list(self) -> list:
-        """Get random products from the products list"""
-        self._random_products = random_web_element(
-            self.driver, self.locators.PRODUCT_LIST
+        return self.find(ProductLocators.PRODUCT_TITLE).text
+
+    def get_products_random_list(self, seed: int = None) -> list:
+        """
+        Pick random products from the products list, in one script call
+
+        Args:
+            seed: Seed of the selection, the product_sample_seed setting or a
+                random one when None. It is printed, so a failing selection
+                can be picked again
+
+        Returns:
+            list: Dicts with the index, name, Add to cart button id and button
+                text of each picked product
+        """
+        return self._select_products(self._sample_products(seed=seed))
+
+    def get_all_products_list(self) -> list:
+        """Get every product of the products list, like get_products_random_list"""
+        return self._select_products(self._sample_products(count=ALL))
+
+    def _sample_products(self, count: int = None, seed: int = None) -> list:
+        """Sample the products inside the page, see random_element_sample"""
+        seed = self.sample_seed = sample_seed(seed)
+        add_button = self.locators.PRODUCT_ADD_TO_CART_BUTTON
+        return random_element_sample(
+            self.driver,
+            self.locators.PRODUCT_LIST,
+            {
+                "name": (*self.locators.PRODUCT_NAME, None),
+                "button_id": (*add_button, "data-test"),
+                "button_text": (*add_button, None),
+            },
+            count=count,
+            seed=seed,
         )
-        self._selected_product_names = []
-        for product in self._random_products:
-            product_name = product.find_element(*self.locators.PRODUCT_NAME).text
-            self._selected_product_names.append(product_name)
+
+    def _select_products(self, products: list) -> list:
+        """Remember products, and their names, for add_random_products_to_cart"""
+        self._random_products = products
+        self._selected_product_names = [product["name"] for product in products]
         return self._random_products
 
     def get_random_products_name(self) -> list:
@@ -51,75 +81,130 @@ class ProductPage:
         # print(f"Random_products_names in product_page: {self._selected_product_names}")
         return self._selected_product_names
 
-    def add_random_products_to_cart(self):
-        """Add random products to cart"""
-        for product in self._random_products:
-            # Get the product name and format it for the data-test attribute
-            product_name = product.find_element(*self.locators.PRODUCT_NAME).text
-            formatted_name = product_name.lower().replace(" ", "-")
+    @staticmethod
+    def get_cart_button_locators(product_name: str) -> tuple:
+        """
+        Get the locators of the Add to cart and Remove buttons of a product
+
+        Args:
+            product_name: Name of the product as shown on the page
+
+        Returns:
+            tuple: Add to cart button locator, Remove button locator
+        """
+        # The data-test attributes hold the name in lower case, dashes for spaces
+        formatted_name = product_name.lower().replace(" ", "-")
+        return (
+            (By.CSS_SELECTOR, f"button[data-test='add-to-cart-{formatted_name}']"),
+            (By.CSS_SELECTOR, f"button[data-test='remove-{formatted_name}']"),
+        )
 
-            # Find and click the specific Add to Cart button for this product
-            add_to_cart_button = product.find_element(
-                By.CSS_SELECTOR, f"button[data-test='add-to-cart-{formatted_name}']"
+    @invalidates_cache
+    def add_random_products_to_cart(self, bulk: bool = True):
+        """
+        Add the products picked by get_products_random_list to the cart
+
+        Args:
+            bulk: Click every Add to cart button, then wait once for all the
+                Remove buttons. Otherwise wait for each Remove button after
+                its click
+        """
+        locators = [
+            self.get_cart_button_locators(product_name)
+            for product_name in self._selected_product_names
+        ]
+        if not locators:
+            # An empty selector list would match nothing, or fail as invalid
+            return
+        if bulk:
+            # One lookup for all the buttons, they are only clicked so their
+            # order does not matter
+            add_buttons = self.driver.find_elements(
+                By.CSS_SELECTOR,
+                ", ".join(add_locator[1] for add_locator, _ in locators),
             )
-            add_to_cart_button.click()
-
-            # Wait for the Remove button to appear for this specific product
-            WebDriverWait(self.driver, 3).until(
-                EC.presence_of_element_located(
-                    (By.CSS_SELECTOR, f"button[data-test='remove-{formatted_name}']")
+            if len(add_buttons) != len(locators):
+                raise ValueError(
+                    f"Found {len(add_buttons)} Add to cart buttons for"
+                    f" {self._selected_product_names}"
                 )
+            for add_button in add_buttons:
+                add_button.click()
+            self.waits.wait_for_elements(
+                [remove_locator for _, remove_locator in locators],
+                name="add_to_cart_confirmations",
             )
-        # print(f"Added products to cart: {self._selected_product_names}")
+            return
+
+        for add_locator, remove_locator in locators:
+            # Find and click the specific Add to Cart button for this product
+            self.find(add_locator).click()
+
+            # Wait for the Remove button to appear for this specific product
+            self.waits.wait_for_element(remove_locator, name="add_to_cart_confirmation")
 
+    @invalidates_cache
     def navigate_to_cart_page(self):
         """Navigate to cart page"""
-        cart = self.driver.find_element(*self.locators.SHOPPING_CART_BADGE)
+        cart = self.find(self.locators.SHOPPING_CART_BADGE)
         cart.click()
 
-    def verify_add_to_cart_buttons(self) -> list:
+    @invalidates_cache
+    def verify_add_to_cart_buttons(self, bulk: bool = True) -> list:
         """Verify randomly that the Add to Cart button text
-        change from Add to Cart to Remove when its clicked"""
+        change from Add to Cart to Remove when its clicked
+
+        Args:
+            bulk: Click every Add to cart button, then wait once for all the
+                Remove buttons. Otherwise wait for each Remove button after
+                its click
+
+        Returns:
+            list: Dicts with the product name and the initial and final texts
+                of its button
+        """
 
-        # Select a random products
-        random_products = random_web_element(self.driver, self.locators.PRODUCT_LIST)
+        # Select a random products, the selection does not change the
+        # products picked for add_random_products_to_cart
+        random_products = self._sample_products()
         print(f"Random products found: {len(random_products)} products")
         verification_results = []
+        remove_locators = []
+        if not random_products:
+            return verification_results
 
         # For each random product, verify the button belongs to the product
         for product in random_products:
-            product_name = product.find_element(*self.locators.PRODUCT_NAME).text
-            formatted_name = product_name.lower().replace(" ", "-")
-            add_to_cart_button = product.find_element(
-                By.CSS_SELECTOR, f"button[data-test='add-to-cart-{formatted_name}']"
-            )
+            product_name = product["name"]
+            add_locator, remove_locator = self.get_cart_button_locators(product_name)
+            if add_locator[1] != f"button[data-test='{product['button_id']}']":
+                raise ValueError(
+                    f"Add to Cart button {product['button_id']} does not belong to"
+                    f" {product_name}"
+                )
 
             # Store initial button state
-            initial_text = add_to_cart_button.text
+            initial_text = product["button_text"]
 
             # Verify the button text change from Add to Cart to Remove when clicked
-            if initial_text == "Add to cart":
-                add_to_cart_button.click()
-                remove_button = WebDriverWait(self.driver, 3).until(
-                    EC.presence_of_element_located(
-                        (
-                            By.CSS_SELECTOR,
-                            f"button[data-test='remove-{formatted_name}']",
-                        )
-                    )
-                )
-                final_text = remove_button.text
-                verification_results.append(
-                    {
-                        "product_name": product_name,
-                        "initial_text": initial_text,
-                        "final_text": final_text,
-                    }
-                )
-                # print(f"Verification Test results: {verification_results}")
-            else:
-                raise ValueError(
-                    f"Button text is not Add to Cart: {add_to_cart_button.text}"
+            if initial_text != "Add to cart":
+                raise ValueError(f"Button text is not Add to Cart: {initial_text}")
+            self.find(add_locator).click()
+            verification_results.append(
+                {"product_name": product_name, "initial_text": initial_text}
+            )
+            remove_locators.append(remove_locator)
+            if not bulk:
+                remove_button = self.waits.wait_for_element(
+                    remove_locator, name="add_to_cart_confirmation"
                 )
+                verification_results[-1]["final_text"] = remove_button.text
+
+        if bulk:
+            remove_buttons = self.waits.wait_for_elements(
+                remove_locators, name="add_to_cart_confirmations"
+            )
+            for result, remove_button in zip(verification_results, remove_buttons):
+                result["final_text"] = remove_button.text
 
         return verification_results
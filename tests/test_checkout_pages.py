@@ -8,14 +8,14 @@ from page_objects.checkout_information_page import CheckoutInformationPage
 from page_objects.checkout_overview_page import CheckoutOverviewPage
 from page_objects.login_page import LoginPage
 from page_objects.product_page import ProductPage
-from utilities.config import (FIRST_NAME, LAST_NAME, PASSWORD, USERNAME,
-                              ZIP_CODE, get_driver)
+from utilities.config import FIRST_NAME, LAST_NAME, ZIP_CODE
 
 
 @pytest.fixture(scope="function")
-def setup_checkout():
+def setup_checkout(setup_chain):
     """Setup fixture for checkout tests"""
-    driver = get_driver()
+    navigator = setup_chain
+    driver = navigator.driver
     login_page = LoginPage(driver)
     product_page = ProductPage(driver)
     cart_page = CartPage(driver)
@@ -23,17 +23,9 @@ def setup_checkout():
     checkout_overview_page = CheckoutOverviewPage(driver)
     checkout_complete_page = CheckoutCompletePage(driver)
 
-    # Login and add products to cart
-    login_page.open_page()
-    login_page.enter_username(USERNAME)
-    login_page.enter_password(PASSWORD)
-    login_page.click_login_button()
-    product_page.wait_for_product_title()
-    product_page.get_products_random_list()
-    product_page.add_random_products_to_cart()
-    product_page.navigate_to_cart_page()
-    cart_page.wait_for_cart_title()
-    cart_page.click_checkout_button()
+    # The setup_chain marker of the test class seeded a random cart and opened
+    # the checkout, or restored that state from an earlier test
+    products = navigator.seeder.cart_products()
 
     yield {
         "driver": driver,
@@ -43,34 +35,25 @@ def setup_checkout():
         "checkout_info_page": checkout_info_page,
         "checkout_overview_page": checkout_overview_page,
         "checkout_complete_page": checkout_complete_page,
+        "navigator": navigator,
+        "products": products,
     }
 
-    driver.quit()
-
 
 class BaseCheckoutTest:
     """Base class for checkout-related tests with shared setup"""
 
-    def setup_checkout_process(
-        self, setup_checkout, go_to_complete=False, start_from_info=True
-    ):
-        """Shared setup for checkout process"""
-        checkout_info_page = setup_checkout["checkout_info_page"]
-        if start_from_info:
-            checkout_info_page.fill_information_form(FIRST_NAME, LAST_NAME, ZIP_CODE)
-            checkout_info_page.click_continue_button()
-
-        checkout_overview_page = setup_checkout["checkout_overview_page"]
-        checkout_overview_page.wait_for_checkout_overview_title()
-
+    def setup_checkout_process(self, setup_checkout, go_to_complete=False):
+        """Bring the checkout to the overview page, or to the complete page"""
+        setup_checkout["navigator"].advance_checkout(
+            setup_checkout["products"], complete=go_to_complete
+        )
         if go_to_complete:
-            checkout_overview_page.click_finish_button()
-            checkout_complete_page = setup_checkout["checkout_complete_page"]
-            checkout_complete_page.wait_for_checkout_complete_title()
-            return checkout_complete_page
-        return checkout_overview_page
+            return setup_checkout["checkout_complete_page"]
+        return setup_checkout["checkout_overview_page"]
 
 
+@pytest.mark.setup_chain("checkout-step-one")
 class TestCheckoutInformationPage(BaseCheckoutTest):
     """Test suite for Checkout Information Page"""
 
@@ -105,9 +88,10 @@ class TestCheckoutInformationPage(BaseCheckoutTest):
         checkout_info_page.click_continue_button()
 
         if expected_result == "success":
-            checkout_overview_page = self.setup_checkout_process(
-                setup_checkout, start_from_info=False
-            )
+            # The form itself must reach the overview, the navigator would
+            # route there on its own even if the submission did nothing
+            checkout_overview_page = setup_checkout["checkout_overview_page"]
+            checkout_overview_page.wait_for_checkout_overview_title()
             assert (
                 checkout_overview_page.get_checkout_overview_title()
                 == "Checkout: Overview"
@@ -133,15 +117,14 @@ class TestCheckoutInformationPage(BaseCheckoutTest):
                 ), f"Expected 'Postal Code is required', got '{error_message}'"
 
 
+@pytest.mark.setup_chain("checkout-step-one", "checkout-step-two")
 class TestCheckoutOverviewPage(BaseCheckoutTest):
     """Test suite for Checkout Overview Page"""
 
     def test_checkout_overview_title(self, setup_checkout):
         """Test the checkout overview page title it is visible"""
         print("test_checkout_overview_title function")
-        checkout_overview_page = self.setup_checkout_process(
-            setup_checkout, start_from_info=True
-        )
+        checkout_overview_page = self.setup_checkout_process(setup_checkout)
         assert (
             checkout_overview_page.get_checkout_overview_title() == "Checkout: Overview"
         )
@@ -153,9 +136,7 @@ class TestCheckoutOverviewPage(BaseCheckoutTest):
         """Test the checkout overview items validation"""
         print("test_checkout_overview_items_validation function")
         cart_page = setup_checkout["cart_page"]
-        checkout_overview_page = self.setup_checkout_process(
-            setup_checkout, start_from_info=True
-        )
+        checkout_overview_page = self.setup_checkout_process(setup_checkout)
         cart_items_names = cart_page.get_cart_product_name()
         checkout_items_names = checkout_overview_page.get_checkout_items_names()
         assert len(cart_items_names) == len(
@@ -175,9 +156,7 @@ class TestCheckoutOverviewPage(BaseCheckoutTest):
     def test_check_items_prices(self, setup_checkout):
         """Items prices check"""
         print("test_check_items_prices")
-        checkout_overview_page = self.setup_checkout_process(
-            setup_checkout, start_from_info=True
-        )
+        checkout_overview_page = self.setup_checkout_process(setup_checkout)
         checkout_items_prices = checkout_overview_page.get_checkout_items_prices()
         checkout_items_prices_sum = checkout_overview_page.sum_checkout_items_prices()
         checkout_items_sub_total = checkout_overview_page.get_sub_total_items()
@@ -200,6 +179,7 @@ class TestCheckoutOverviewPage(BaseCheckoutTest):
         )
 
 
+@pytest.mark.setup_chain("checkout-step-one", "checkout-step-two")
 class TestCheckoutCompletePage(BaseCheckoutTest):
     """Test suite for Checkout Complete Page"""
 
@@ -207,7 +187,7 @@ class TestCheckoutCompletePage(BaseCheckoutTest):
         """Test the checkout complete page title it is visible"""
 
         checkout_complete_page = self.setup_checkout_process(
-            setup_checkout, go_to_complete=True, start_from_info=True
+            setup_checkout, go_to_complete=True
         )
 
         assert (
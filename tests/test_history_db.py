@@ -0,0 +1,192 @@
+"""Test the ingestion and the queries of the test history database"""
+
+import gzip
+import json
+import uuid
+
+import pytest
+
+from utilities.history_db import HistoryDB
+
+# Start of the generated results, 2024-01-01 12:00 UTC in milliseconds
+START = 1704110400000
+DAY = 24 * 3600 * 1000
+
+
+def make_result(name="test_login", status="passed", start=START, seconds=1.0):
+    """Build an allure result as allure-pytest writes it"""
+    return {
+        "uuid": str(uuid.uuid4()),
+        "historyId": f"history-{name}",
+        "fullName": f"tests.test_module#{name}",
+        "name": name,
+        "status": status,
+        "start": start,
+        "stop": start + int(seconds * 1000),
+    }
+
+
+def write_result_file(results_dir, result):
+    """Write an allure result file"""
+    path = results_dir / f"{result['uuid']}-result.json"
+    path.write_text(json.dumps(result), encoding="utf-8")
+
+
+def write_records(log, results):
+    """Write the results to an open results store log"""
+    for result in results:
+        log.write(json.dumps({"kind": "result", "data": result}) + "\n")
+        log.write(json.dumps({"kind": "container", "data": {}}) + "\n")
+
+
+def append_member(path, results):
+    """Append a complete gzip member to a results store log"""
+    with gzip.open(path, "at", encoding="utf-8") as log:
+        write_records(log, results)
+
+
+def stored_names(history):
+    """Get the names of the stored results, in start order"""
+    return [
+        row[0]
+        for row in history.connection.execute("SELECT name FROM results ORDER BY start")
+    ]
+
+
+@pytest.fixture
+def history(tmp_path):
+    history = HistoryDB(str(tmp_path / "history.sqlite"))
+    yield history
+    history.close()
+
+
+@pytest.fixture
+def results_dir(tmp_path):
+    path = tmp_path / "allure-results"
+    path.mkdir()
+    return path
+
+
+def test_ingest_result_files_once(history, results_dir):
+    """Test result files are loaded once, and an ingestion without news adds no run"""
+    write_result_file(results_dir, make_result("test_a"))
+    write_result_file(results_dir, make_result("test_b", start=START + 1))
+    assert history.ingest(str(results_dir), "build-1") == 2
+
+    assert history.ingest(str(results_dir), "build-2") == 0
+    write_result_file(results_dir, make_result("test_c", start=START + 2))
+    assert history.ingest(str(results_dir), "build-3") == 1
+
+    assert stored_names(history) == ["test_a", "test_b", "test_c"]
+    runs = [row[0] for row in history.connection.execute("SELECT label FROM runs")]
+    assert runs == ["build-1", "build-3"]
+
+
+def test_ingest_log_resumes_after_last_member(history, results_dir):
+    """Test a log is read from the end of the members already ingested"""
+    path = results_dir / "results-gw0.jsonl.gz"
+    append_member(path, [make_result("test_a"), make_result("test_b", start=START + 1)])
+    assert history.ingest(str(results_dir)) == 2
+    offset = path.stat().st_size
+    assert history.connection.execute(
+        "SELECT size, records FROM ingested_files"
+    ).fetchone() == (offset, 0)
+
+    append_member(path, [make_result("test_c", start=START + 2)])
+    assert history.ingest(str(results_dir)) == 1
+    assert history.ingest(str(results_dir)) == 0
+    assert stored_names(history) == ["test_a", "test_b", "test_c"]
+
+
+def test_ingest_log_with_partial_member(history, results_dir):
+    """Test the records of a member still being written are loaded once"""
+    path = results_dir / "results-gw0.jsonl.gz"
+    append_member(path, [make_result("test_a")])
+    offset = path.stat().st_size
+
+    log = gzip.open(path, "at", encoding="utf-8")
+    try:
+        write_records(log, [make_result("test_b", start=START + 1)])
+        log.flush()
+        assert history.ingest(str(results_dir)) == 2
+        # The member is not complete, its records are counted from its start
+        assert history.connection.execute(
+            "SELECT size, records FROM ingested_files"
+        ).fetchone() == (offset, 2)
+
+        write_records(log, [make_result("test_c", start=START + 2)])
+        log.flush()
+        assert history.ingest(str(results_dir)) == 1
+    finally:
+        log.close()
+
+    # Closing the member adds no record
+    assert history.ingest(str(results_dir)) == 0
+    assert history.connection.execute(
+        "SELECT size, records FROM ingested_files"
+    ).fetchone() == (path.stat().st_size, 0)
+    assert stored_names(history) == ["test_a", "test_b", "test_c"]
+
+
+def test_ingest_replaced_log_from_start(history, results_dir):
+    """Test a log smaller than the stored offset is read again from the start"""
+    path = results_dir / "results-gw0.jsonl.gz"
+    append_member(path, [make_result("test_a"), make_result("test_b", start=START + 1)])
+    assert history.ingest(str(results_dir)) == 2
+
+    path.unlink()
+    append_member(path, [make_result("test_c", start=START + 2)])
+    assert history.ingest(str(results_dir)) == 1
+    assert stored_names(history) == ["test_a", "test_b", "test_c"]
+
+
+def test_flakiness(history, results_dir):
+    """Test the flip rate counts the outcome changes between consecutive runs"""
+    statuses = ["passed", "failed", "passed", "skipped", "broken", "broken"]
+    for index, status in enumerate(statuses):
+        write_result_file(
+            results_dir, make_result("test_flaky", status=status, start=START + index)
+        )
+    for index in range(3):
+        write_result_file(results_dir, make_result("test_stable", start=START + index))
+    history.ingest(str(results_dir))
+
+    scores = history.flakiness(min_runs=3)
+    assert [score["test"] for score in scores] == ["test_flaky", "test_stable"]
+    # passed, failed, passed, broken, broken: 3 flips over 4 transitions
+    assert scores[0]["runs"] == 5
+    assert scores[0]["failures"] == 3
+    assert scores[0]["flips"] == 3
+    assert scores[0]["flip_rate"] == pytest.approx(0.75)
+    assert scores[1]["flip_rate"] == 0
+
+    assert history.flakiness(min_runs=6) == []
+    # A single run has no flip rate, whatever the requested minimum
+    write_result_file(results_dir, make_result("test_once", start=START + 10))
+    history.ingest(str(results_dir))
+    assert "test_once" not in [score["test"] for score in history.flakiness(min_runs=0)]
+
+
+def test_duration_trends_and_slowest(history, results_dir):
+    """Test the duration percentiles per day and the slowest tests"""
+    for index, seconds in enumerate([1.0, 2.0, 3.0]):
+        write_result_file(
+            results_dir, make_result("test_a", start=START + index, seconds=seconds)
+        )
+    write_result_file(
+        results_dir, make_result("test_a", start=START + DAY, seconds=10.0)
+    )
+    write_result_file(results_dir, make_result("test_b", start=START, seconds=5.0))
+    history.ingest(str(results_dir))
+
+    trends = history.duration_trends(test="test_a")
+    assert [(trend["runs"], trend["p50"], trend["p95"]) for trend in trends] == [
+        (3, 2.0, 3.0),
+        (1, 10.0, 10.0),
+    ]
+    assert trends[0]["period"] < trends[1]["period"]
+
+    slowest = history.slowest(limit=1)
+    assert [(row["test"], row["runs"], row["p50"]) for row in slowest] == [
+        ("test_b", 1, 5.0)
+    ]
@@ -0,0 +1,95 @@
+"""Test the page state cache invalidation, with a driver double instead of a browser"""
+
+import json
+from urllib.parse import urljoin
+
+import pytest
+
+from utilities import cart_state
+from utilities.cart_state import CART_KEY, READ_CART_SCRIPT, CartSeeder
+from utilities.config import settings
+from utilities.page_cache import (
+    DOCUMENT_STATE_SCRIPT,
+    cached_getter,
+    disable_page_cache,
+    enable_page_cache,
+)
+
+
+class FakeDriver:
+    """Driver double answering the scripts of the page cache and the cart seeder"""
+
+    def __init__(self, url: str):
+        self.current_url = url
+        self.loads = 0
+        self.storage = {}
+
+    def get(self, url: str):
+        self.current_url = url
+        self.loads += 1
+
+    def execute_script(self, script: str, *args):
+        if script == DOCUMENT_STATE_SCRIPT:
+            # Every load starts a new document, with a new time origin
+            return f"{self.current_url} {self.loads}"
+        if script == READ_CART_SCRIPT:
+            contents = json.loads(self.storage.get(CART_KEY, "[]"))
+            return {"contents": contents, "badge": len(contents)}
+        if "setItem" in script:
+            self.storage[args[0]] = args[1]
+        return None
+
+
+class CountingPage:
+    """Page object double counting the calls of its cached getter"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.calls = 0
+
+    @cached_getter
+    def get_value(self):
+        self.calls += 1
+        return [self.calls]
+
+    def wait_until_ready(self):
+        pass
+
+
+@pytest.fixture
+def cart_url():
+    return urljoin(settings.login_url, "cart.html")
+
+
+def test_reloading_the_same_url_invalidates_cache(cart_url):
+    """Test a cached value is read again once the same URL is loaded again"""
+    driver = FakeDriver(cart_url)
+    enable_page_cache(driver)
+    page = CountingPage(driver)
+    try:
+        assert page.get_value() == [1]
+        assert page.get_value() == [1]
+        driver.get(cart_url)
+        assert page.get_value() == [2]
+    finally:
+        disable_page_cache(driver)
+
+
+def test_seeding_the_cart_invalidates_cache(monkeypatch, cart_url):
+    """Test seeding the cart forgets the values read before, URL tracking off"""
+    driver = FakeDriver(cart_url)
+    origin = urljoin(settings.inventory_url, "/").rstrip("/")
+    monkeypatch.setitem(cart_state._catalogs, origin, {"Backpack": 4, "Bike": 0})
+    monkeypatch.setitem(
+        cart_state.SEED_PAGES, "cart", ("cart.html", CountingPage, "wait_until_ready")
+    )
+    cache = enable_page_cache(driver, track_url=False)
+    page = CountingPage(driver)
+    try:
+        assert page.get_value() == [1]
+        CartSeeder(driver).seed(["Backpack", "Bike"], page="cart")
+        assert driver.current_url == cart_url
+        assert page.get_value() == [2]
+        assert cache.stats()["invalidations"] == 1
+    finally:
+        disable_page_cache(driver)
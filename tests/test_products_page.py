@@ -5,23 +5,7 @@ This module contains tests for the page products
 import pytest
 
 from page_objects.cart_page import CartPage
-from page_objects.login_page import LoginPage
 from page_objects.product_page import ProductPage
-from utilities.config import PASSWORD, USERNAME, get_driver
-
-
-@pytest.fixture
-def driver():
-    """Fixture to initialize and return the driver"""
-    driver = get_driver()
-    yield driver
-    driver.quit()
-
-
-@pytest.fixture
-def login_page(driver):
-    """Fixture to initialize the login page"""
-    return LoginPage(driver)
 
 
 @pytest.fixture
@@ -37,13 +21,8 @@ def cart_page(driver):
 
 
 @pytest.fixture
-def logged_in_session(login_page, product_page):
-    """Fixture to handle the login process"""
-    login_page.open_page()
-    login_page.enter_username(USERNAME)
-    login_page.enter_password(PASSWORD)
-    login_page.click_login_button()
-    # Wait for products page to load
+def logged_in_session(logged_in_driver, product_page):
+    """Fixture to open the products page with the cached login session"""
     product_page.wait_for_product_title()
     assert product_page.get_product_title() == "Products"
     print("✅ Products page title verified")
@@ -0,0 +1,61 @@
+"""Test the random product selections are reproduced from their seed"""
+
+from urllib.parse import urljoin
+
+import pytest
+
+from utilities import cart_state
+from utilities.cart_state import CartSeeder
+from utilities.config import settings
+from utilities.navigation import Navigator
+
+CATALOG = {f"Product {index}": index for index in range(6)}
+
+
+class CatalogDriver:
+    """Driver double already on the inventory page, whose catalog is cached"""
+
+    current_url = settings.inventory_url
+
+
+@pytest.fixture(autouse=True)
+def catalog(monkeypatch):
+    origin = urljoin(settings.inventory_url, "/").rstrip("/")
+    monkeypatch.setitem(cart_state._catalogs, origin, CATALOG)
+
+
+@pytest.fixture
+def seed_setting(monkeypatch):
+    """Set the product_sample_seed setting through its environment override"""
+
+    def set_seed(seed):
+        monkeypatch.setenv("SWAG_PRODUCT_SAMPLE_SEED", str(seed))
+        settings.reload()
+
+    yield set_seed
+    monkeypatch.delenv("SWAG_PRODUCT_SAMPLE_SEED", raising=False)
+    settings.reload()
+
+
+def test_random_products_from_seed():
+    """Test the same seed picks the same cart products"""
+    seeder = CartSeeder(CatalogDriver())
+    products = seeder.random_products(seed=42)
+    assert products == seeder.random_products(seed=42)
+    assert 1 <= len(products) <= len(CATALOG)
+    assert set(products) <= set(CATALOG)
+
+
+def test_wanted_products_from_seed_setting(seed_setting):
+    """Test the products of a navigator cart follow the product_sample_seed setting"""
+    seed_setting(42)
+    picks = []
+    for _ in range(2):
+        navigator = Navigator(CatalogDriver())
+        navigator._items = 3
+        picks.append(navigator.wanted_products())
+    assert picks[0] == picks[1]
+    assert len(picks[0]) == 3
+    assert CartSeeder(CatalogDriver()).random_products() == CartSeeder(
+        CatalogDriver()
+    ).random_products(seed=42)
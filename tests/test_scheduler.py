@@ -0,0 +1,126 @@
+"""Test the scheduling of the tests across parallel workers"""
+
+import pytest
+
+from utilities.parallel_runner import shard_tests
+from utilities.scheduler import (
+    DEFAULT_ESTIMATE,
+    estimate,
+    lpt_schedule,
+    result_node_id,
+)
+
+FILL_FORM = (
+    "tests/test_checkout_pages.py::TestCheckoutInformationPage"
+    "::test_fill_information_form"
+)
+
+
+def make_result(full_name, package="tests.test_checkout_pages", parameters=()):
+    """Build the fields of an allure result the scheduler reads"""
+    return {
+        "fullName": full_name,
+        "labels": [{"name": "package", "value": package}],
+        "parameters": [{"name": name, "value": value} for name, value in parameters],
+    }
+
+
+def test_result_node_id_of_method_with_parameters():
+    """Test the node id of a parametrized method is rebuilt from its parameters"""
+    result = make_result(
+        "tests.test_checkout_pages.TestCheckoutInformationPage"
+        "#test_fill_information_form",
+        parameters=[
+            ("first_name", "'John'"),
+            ("last_name", "''"),
+            ("zip_code", "12345"),
+            ("expected_result", "'error'"),
+        ],
+    )
+    assert result_node_id(result) == (FILL_FORM, f"{FILL_FORM}[John--12345-error]")
+
+
+def test_result_node_id_of_function():
+    """Test a module level test without parameters maps to one node id"""
+    result = make_result("tests.test_login_page#test_login", "tests.test_login_page")
+    node_id = "tests/test_login_page.py::test_login"
+    assert result_node_id(result) == (node_id, node_id)
+
+
+def test_result_node_id_without_parameter_ids():
+    """Test parameters without a pytest id only give the function node id"""
+    result = make_result(
+        "tests.test_login_page#test_login",
+        "tests.test_login_page",
+        parameters=[("user", "<User object at 0x7f>")],
+    )
+    assert result_node_id(result) == ("tests/test_login_page.py::test_login", None)
+
+
+def test_result_node_id_without_package():
+    """Test a result without package label is not mapped"""
+    result = make_result("tests.test_login_page#test_login", package=None)
+    assert result_node_id(result) == (None, None)
+
+
+@pytest.mark.parametrize(
+    "node_id, expected",
+    [
+        # Its own history first
+        (f"{FILL_FORM}[a]", 1.0),
+        # Then the other parametrizations of the test function
+        (f"{FILL_FORM}[new]", 3.0),
+        # Then the tests of its module, functions only
+        (
+            "tests/test_checkout_pages.py::TestCheckoutOverviewPage"
+            "::test_checkout_overview_title",
+            5.0,
+        ),
+        # Then the default
+        ("tests/test_login_page.py::test_login", DEFAULT_ESTIMATE),
+    ],
+)
+def test_estimate_fallback_order(node_id, expected):
+    """Test a test without history is estimated from its closest relatives"""
+    durations = {
+        f"{FILL_FORM}[a]": [1.0],
+        f"{FILL_FORM}[b]": [9.0, 9.0],
+        FILL_FORM: [1.0, 3.0, 9.0],
+        "tests/test_checkout_pages.py::test_other": [7.0],
+    }
+    assert estimate(node_id, durations) == expected
+
+
+def test_lpt_schedule_makespan():
+    """Test the longest tests are placed first, each on the least loaded worker"""
+    durations = {"a": [5.0], "b": [4.0], "c": [3.0], "d": [3.0], "e": [3.0]}
+    shards = lpt_schedule(["e", "d", "c", "b", "a"], 2, durations)
+
+    loads = [sum(durations[node_id][0] for node_id in shard) for shard in shards]
+    # LPT is within 4/3 of the optimal makespan, 9 here (a+b, c+d+e)
+    assert max(loads) == 10.0
+    # Equal estimates keep the collection order, ties go to the first worker
+    assert shards == [["a", "d"], ["b", "e", "c"]]
+
+
+def test_lpt_schedule_removes_empty_shards():
+    """Test there are never more shards than tests"""
+    shards = lpt_schedule(["a", "b"], 4, {"a": [1.0], "b": [2.0]})
+    assert sorted(shards) == [["a"], ["b"]]
+
+
+def test_lpt_schedule_keeps_setup_chains_together():
+    """Test the tests of a setup chain go to one worker, with their summed estimate"""
+    durations = {"a": [5.0], "b": [4.0], "c": [3.0], "d": [3.0], "e": [3.0]}
+    groups = {"c": ("None", "cart"), "d": ("None", "cart"), "e": ("None", "cart")}
+    shards = lpt_schedule(["a", "b", "c", "d", "e"], 2, durations, groups)
+
+    # The chain (9 seconds) is placed first, then a and b share the other worker
+    assert shards == [["c", "d", "e"], ["a", "b"]]
+
+
+def test_round_robin_keeps_setup_chains_together():
+    """Test dealing the tests round robin deals a setup chain as one test"""
+    groups = {"b": ("None", "cart"), "d": ("None", "cart")}
+    shards = shard_tests(["a", "b", "c", "d", "e"], 2, groups=groups)
+    assert shards == [["a", "c"], ["b", "d", "e"]]
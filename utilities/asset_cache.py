@@ -0,0 +1,181 @@
+"""
+This module contains an opt-in HTTP cache for the site's static assets that
+survives across browser sessions and workers.
+
+Incognito sessions keep their cache in memory, so every new browser downloads
+the site's JS, CSS and images again. With the asset_cache setting enabled,
+get_driver launches a regular session whose Chrome disk cache lives in a slot
+directory under a shared root. A Chrome disk cache cannot be used by two
+browsers at once, so each running browser claims a free slot with a lock file,
+and the next browser to claim it (in this run or a later one, in any worker)
+starts with the assets already on disk.
+
+Chrome evicts the least recently used entries of a slot above its
+--disk-cache-size. Across slots, the least recently used idle slots are
+deleted while the root is over its total size budget.
+"""
+
+import os
+import shutil
+
+from selenium.common.exceptions import WebDriverException
+
+from utilities.config import settings
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MB = 1024 * 1024
+
+# Counts the resources of the current page that were served from the cache
+RESOURCE_STATS_SCRIPT = """
+const entries = performance.getEntriesByType('navigation')
+    .concat(performance.getEntriesByType('resource'));
+let hits = 0;
+let requests = 0;
+for (const entry of entries) {
+    if (!entry.decodedBodySize) {
+        continue;
+    }
+    requests += 1;
+    if (entry.transferSize === 0) {
+        hits += 1;
+    }
+}
+return {hits: hits, requests: requests};
+"""
+
+
+def _pid_alive(pid: int) -> bool:
+    """Check whether a process is still running"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, OSError):
+        return True
+    return True
+
+
+def _directory_size(path: str) -> int:
+    """Get the size in bytes of the files under a directory"""
+    total = 0
+    for folder, _, files in os.walk(path):
+        for file_name in files:
+            try:
+                total += os.path.getsize(os.path.join(folder, file_name))
+            except OSError:
+                pass
+    return total
+
+
+class AssetCache:
+    """Shared root of the Chrome disk cache slots"""
+
+    def __init__(self, root: str = None, max_bytes: int = None, slot_bytes=None):
+        """
+        Initialize the asset cache
+
+        Args:
+            root: Directory holding the slots, the asset_cache_dir setting by
+                default (relative to the project root)
+            max_bytes: Size budget of all the slots together
+            slot_bytes: Size budget of a single slot, passed to Chrome
+        """
+        self.root = os.path.join(PROJECT_ROOT, root or settings.asset_cache_dir)
+        self.max_bytes = max_bytes or settings.asset_cache_max_mb * MB
+        self.slot_bytes = slot_bytes or settings.asset_cache_slot_mb * MB
+
+    def chrome_arguments(self, slot: str) -> list:
+        """Get the Chrome arguments storing the disk cache in a slot"""
+        return [f"--disk-cache-dir={slot}", f"--disk-cache-size={self.slot_bytes}"]
+
+    def claim_slot(self) -> str:
+        """
+        Claim a free slot for a new browser
+
+        Slots whose lock belongs to a process that no longer runs are taken over.
+
+        Returns:
+            str: Directory of the claimed slot
+        """
+        os.makedirs(self.root, exist_ok=True)
+        self.prune()
+        index = 0
+        while True:
+            slot = os.path.join(self.root, f"slot-{index}")
+            if self._lock(slot):
+                os.makedirs(slot, exist_ok=True)
+                return slot
+            index += 1
+
+    def release_slot(self, slot: str):
+        """Release a slot once its browser quit, marking it as recently used"""
+        try:
+            os.utime(slot)
+        except OSError:
+            pass
+        try:
+            os.remove(f"{slot}.lock")
+        except OSError:
+            pass
+
+    def prune(self):
+        """Delete the least recently used idle slots while over the size budget"""
+        slots = []
+        for entry in os.scandir(self.root):
+            if entry.is_dir() and not os.path.exists(f"{entry.path}.lock"):
+                slots.append((entry.stat().st_mtime, entry.path))
+        sizes = {path: _directory_size(path) for _, path in slots}
+        total = _directory_size(self.root)
+        for _, path in sorted(slots):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= sizes[path]
+
+    def _lock(self, slot: str) -> bool:
+        """Create the lock file of a slot, False if another browser holds it"""
+        lock_path = f"{slot}.lock"
+        try:
+            descriptor = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            try:
+                with open(lock_path, encoding="utf-8") as file:
+                    owner = int(file.read())
+            except (OSError, ValueError):
+                # Removed or still being written by its owner
+                return False
+            if _pid_alive(owner):
+                return False
+            # Left behind by a process that died, take it over
+            try:
+                os.remove(lock_path)
+            except FileNotFoundError:
+                pass
+            return self._lock(slot)
+        with os.fdopen(descriptor, "w", encoding="utf-8") as file:
+            file.write(str(os.getpid()))
+        return True
+
+
+def release_asset_cache(driver):
+    """Release the cache slot of a driver that quit, if it had one"""
+    slot = getattr(driver, "asset_cache_slot", None)
+    if slot is not None:
+        AssetCache().release_slot(slot)
+        driver.asset_cache_slot = None
+
+
+def asset_cache_stats(driver) -> dict:
+    """
+    Count the resources of the current page served from the cache
+
+    A resource with a body but no bytes transferred came from the cache.
+
+    Returns:
+        dict: Number of cache hits and of requests
+    """
+    try:
+        return driver.execute_script(RESOURCE_STATS_SCRIPT)
+    except WebDriverException:
+        return {"hits": 0, "requests": 0}
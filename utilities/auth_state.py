@@ -0,0 +1,147 @@
+"""
+This module contains a cache of an authenticated session.
+
+The session is captured once per worker through a real UI login, then injected
+into fresh drivers so that tests can open the inventory page directly.
+"""
+
+import json
+from urllib.parse import urlsplit
+
+from locators.common_locators import CommonLocators
+from page_objects.login_page import LoginPage
+from page_objects.product_page import ProductPage
+from utilities.config import settings
+from utilities.page_cache import invalidate_page_cache
+from utilities.wait_utilities import WaitUtilities
+
+READ_STORAGE_SCRIPT = """
+return {
+    local: Object.assign({}, window.localStorage),
+    session: Object.assign({}, window.sessionStorage)
+};
+"""
+
+# Runs before the page scripts, so the app starts with the captured storage
+WRITE_STORAGE_SCRIPT = """
+if (window.location.origin === %(origin)s) {
+    const state = %(state)s;
+    for (const [key, value] of Object.entries(state.local)) {
+        window.localStorage.setItem(key, value);
+    }
+    for (const [key, value] of Object.entries(state.session)) {
+        window.sessionStorage.setItem(key, value);
+    }
+}
+"""
+
+
+def _to_cdp_cookie(cookie: dict) -> dict:
+    """Convert a cookie returned by get_cookies to Network.setCookie params"""
+    params = {
+        "name": cookie["name"],
+        "value": cookie["value"],
+        "domain": cookie.get("domain"),
+        "path": cookie.get("path", "/"),
+        "secure": cookie.get("secure", False),
+        "httpOnly": cookie.get("httpOnly", False),
+    }
+    if "expiry" in cookie:
+        params["expires"] = cookie["expiry"]
+    if "sameSite" in cookie:
+        params["sameSite"] = cookie["sameSite"]
+    return params
+
+
+class AuthStateCache:
+    """Authenticated session captured once and replayed into new drivers"""
+
+    def __init__(self, username: str = None, password: str = None):
+        """
+        Initialize the auth state cache
+
+        Args:
+            username: User to log in with, the configured user by default
+            password: Password of the user, the configured one by default
+        """
+        self.username = username or settings.username
+        self.password = password or settings.password
+        self.state = None
+
+    def capture(self, driver):
+        """
+        Log in through the UI and capture the resulting session
+
+        Leaves the driver logged in on the inventory page.
+
+        Args:
+            driver: WebDriver instance
+        """
+        login_page = LoginPage(driver)
+        login_page.open_page()
+        login_page.enter_username(self.username)
+        login_page.enter_password(self.password)
+        login_page.click_login_button()
+        ProductPage(driver).wait_for_product_title()
+
+        storage = driver.execute_script(READ_STORAGE_SCRIPT)
+        self.state = {
+            "cookies": driver.get_cookies(),
+            "local": storage["local"],
+            "session": storage["session"],
+        }
+
+    def apply(self, driver):
+        """
+        Put the authenticated session into a driver and open the inventory page
+
+        The first call of a worker pays for the UI login, later calls only
+        inject the captured cookies and storage. If the injected session is
+        rejected, a new one is captured.
+
+        Args:
+            driver: WebDriver instance, usually fresh from the driver pool
+        """
+        if self.state is None:
+            self.capture(driver)
+            return
+
+        script_id = self._inject(driver)
+        driver.get(settings.inventory_url)
+        invalidate_page_cache(driver)
+        # The inventory page, or the login page if the session was rejected
+        WaitUtilities(driver).wait_for_element(
+            CommonLocators.PAGE_LOGO, name="session_page"
+        )
+        if script_id is not None:
+            driver.execute_cdp_cmd(
+                "Page.removeScriptToEvaluateOnNewDocument", {"identifier": script_id}
+            )
+
+        if urlsplit(driver.current_url).path != urlsplit(settings.inventory_url).path:
+            # The site sent us back to the login page, the session expired
+            self.capture(driver)
+
+    def _inject(self, driver):
+        """
+        Set the captured cookies on the driver and queue the captured storage
+
+        Returns:
+            str: Id of the script writing the storage on the next page load,
+                None if there is no storage to write
+        """
+        for cookie in self.state["cookies"]:
+            driver.execute_cdp_cmd("Network.setCookie", _to_cdp_cookie(cookie))
+
+        if not (self.state["local"] or self.state["session"]):
+            return None
+
+        origin = "{0.scheme}://{0.netloc}".format(urlsplit(settings.inventory_url))
+        storage = {"local": self.state["local"], "session": self.state["session"]}
+        script = WRITE_STORAGE_SCRIPT % {
+            "origin": json.dumps(origin),
+            "state": json.dumps(storage),
+        }
+        return driver.execute_cdp_cmd(
+            "Page.addScriptToEvaluateOnNewDocument", {"source": script}
+        )["identifier"]
@@ -0,0 +1,169 @@
+"""
+This module seeds the cart of the site directly, instead of adding the
+products through the UI.
+
+The app keeps the cart client side, as the JSON list of the product ids in
+the "cart-contents" localStorage entry, in the order the products were added.
+Writing that entry and opening the cart or a checkout step gives the same
+state as clicking through the products page, in a single navigation.
+
+Usage:
+    seeder = CartSeeder(driver)
+    products = seeder.random_products()
+    seeder.seed(products, page="checkout-step-one")
+"""
+
+import json
+import random
+from urllib.parse import urljoin, urlsplit
+
+from page_objects.cart_page import CartPage
+from page_objects.checkout_information_page import CheckoutInformationPage
+from page_objects.checkout_overview_page import CheckoutOverviewPage
+from utilities.config import settings
+from utilities.page_cache import invalidate_page_cache
+from utilities.random_web_element_func import sample_seed
+
+CART_KEY = "cart-contents"
+
+# Product ids and names of the inventory page, from the "item_<id>_title_link" links
+CATALOG_SCRIPT = """
+return Array.from(
+    document.querySelectorAll("a[id^='item_'][id$='_title_link']")
+).map(link => ({
+    id: parseInt(link.id.slice("item_".length, -"_title_link".length), 10),
+    name: link.textContent.trim()
+}));
+"""
+
+READ_CART_SCRIPT = """
+const badge = document.querySelector('.shopping_cart_badge');
+return {
+    contents: JSON.parse(window.localStorage.getItem(arguments[0]) || '[]'),
+    badge: badge ? parseInt(badge.textContent, 10) : 0
+};
+"""
+
+# Pages a seeded cart can be opened on, with the wait telling they are ready
+SEED_PAGES = {
+    "cart": ("cart.html", CartPage, "wait_for_cart_title"),
+    "checkout-step-one": (
+        "checkout-step-one.html",
+        CheckoutInformationPage,
+        "wait_for_checkout_information_title_confirmation",
+    ),
+    "checkout-step-two": (
+        "checkout-step-two.html",
+        CheckoutOverviewPage,
+        "wait_for_checkout_overview_title",
+    ),
+}
+
+# Catalog of each site origin, product ids do not change during a session
+_catalogs = {}
+
+
+class CartSeedError(AssertionError):
+    """The seeded cart does not match the expected products"""
+
+
+class CartSeeder:
+    """Write the client side cart of the site and open the pages using it"""
+
+    def __init__(self, driver):
+        """
+        Initialize the cart seeder
+
+        Args:
+            driver: WebDriver instance, logged in
+        """
+        self.driver = driver
+
+    def catalog(self) -> dict:
+        """
+        Get the product ids by product name
+
+        Read once per site from the inventory page, which is opened if needed.
+        """
+        origin = "{0.scheme}://{0.netloc}".format(urlsplit(settings.inventory_url))
+        if origin not in _catalogs:
+            if (
+                urlsplit(self.driver.current_url).path
+                != urlsplit(settings.inventory_url).path
+            ):
+                self.driver.get(settings.inventory_url)
+                invalidate_page_cache(self.driver)
+            products = self.driver.execute_script(CATALOG_SCRIPT)
+            _catalogs[origin] = {product["name"]: product["id"] for product in products}
+        return _catalogs[origin]
+
+    def random_products(self, seed: int = None) -> list:
+        """
+        Pick random products like ProductPage.get_products_random_list
+
+        Args:
+            seed: Seed of the selection, see sample_seed
+        """
+        generator = random.Random(sample_seed(seed, name="Cart products seed"))
+        names = list(self.catalog())
+        return generator.sample(names, generator.randint(1, len(names)))
+
+    def cart_ids(self, product_names: list) -> list:
+        """
+        Get the cart contents holding products, in the order they were added
+
+        Raises:
+            KeyError: If a product is not in the catalog
+        """
+        catalog = self.catalog()
+        return [catalog[name] for name in product_names]
+
+    def cart_products(self) -> list:
+        """Get the names of the products in the cart, in the order they were added"""
+        names = {product_id: name for name, product_id in self.catalog().items()}
+        return [names[product_id] for product_id in self.read_cart()["contents"]]
+
+    def read_cart(self) -> dict:
+        """Get the cart contents and the cart badge count of the current page"""
+        return self.driver.execute_script(READ_CART_SCRIPT, CART_KEY)
+
+    def seed(self, product_names: list, page: str = "cart"):
+        """
+        Fill the cart with products and open a page of the checkout
+
+        Args:
+            product_names: Names of the products, in the order they are added
+            page: Page to open, one of SEED_PAGES
+
+        Returns:
+            The page object of the opened page
+
+        Raises:
+            CartSeedError: If the app does not show the seeded cart
+        """
+        path, page_class, wait = SEED_PAGES[page]
+        ids = self.cart_ids(product_names)
+        # Storage belongs to the site origin, the catalog is cached per origin
+        # and may not have opened the site on this driver
+        if (
+            urlsplit(self.driver.current_url).netloc
+            != urlsplit(settings.login_url).netloc
+        ):
+            self.driver.get(settings.inventory_url)
+        self.driver.execute_script(
+            "window.localStorage.setItem(arguments[0], arguments[1]);",
+            CART_KEY,
+            json.dumps(ids),
+        )
+        self.driver.get(urljoin(settings.login_url, path))
+        invalidate_page_cache(self.driver)
+        page_object = page_class(self.driver)
+        getattr(page_object, wait)()
+
+        cart = self.read_cart()
+        if cart["contents"] != ids or cart["badge"] != len(ids):
+            raise CartSeedError(
+                f"Seeded cart {ids} for {product_names}, the app shows"
+                f" {cart['contents']} with a badge of {cart['badge']}"
+            )
+        return page_object
@@ -0,0 +1,122 @@
+"""
+This module counts the WebDriver commands sent by each test and checks them
+against declared budgets, so that round trip regressions are caught like any
+other performance regression.
+
+Budgets are declared on tests with a marker, and on page object methods with
+a decorator. Both take a maximum total and optional maximums per command type
+(named after selenium's Command values, e.g. findElement or clickElement):
+
+    @pytest.mark.command_budget(20, findElement=6)
+    def test_login(driver): ...
+
+    @command_budget(3)
+    def enter_username(self, username): ...
+"""
+
+import functools
+from collections import Counter
+
+
+class CommandBudgetWarning(UserWarning):
+    """Warning issued when a budget is exceeded in warn mode"""
+
+
+class CommandCounter:
+    """WebDriver commands sent by a driver since the last reset, by type"""
+
+    def __init__(self):
+        self.counts = Counter()
+        self.violations = []
+
+    @property
+    def total(self) -> int:
+        """Number of commands sent since the last reset"""
+        return sum(self.counts.values())
+
+    def reset(self):
+        """Start counting from zero, forgetting the recorded violations"""
+        self.counts = Counter()
+        self.violations = []
+
+
+def count_commands(driver) -> CommandCounter:
+    """
+    Count every WebDriver command sent by a driver
+
+    The driver's execute method is wrapped once, later calls return the
+    counter already installed.
+
+    Returns:
+        CommandCounter: The counter of the driver
+    """
+    counter = getattr(driver, "command_counter", None)
+    if counter is not None:
+        return counter
+    counter = CommandCounter()
+    execute = driver.execute
+
+    @functools.wraps(execute)
+    def counted_execute(driver_command, params=None):
+        counter.counts[driver_command] += 1
+        return execute(driver_command, params)
+
+    driver.execute = counted_execute
+    driver.command_counter = counter
+    return counter
+
+
+def check_budget(counts: Counter, total: int = None, **per_command) -> list:
+    """
+    Check command counts against a budget
+
+    Args:
+        counts: Commands sent, by type
+        total: Maximum number of commands of any type
+        per_command: Maximum number of commands of a given type
+
+    Returns:
+        list: A message per exceeded limit, empty when within budget
+    """
+    messages = []
+    sent = sum(counts.values())
+    if total is not None and sent > total:
+        details = ", ".join(f"{name}={count}" for name, count in counts.most_common())
+        messages.append(f"{sent} commands sent, budget is {total} ({details})")
+    for command, limit in per_command.items():
+        if counts[command] > limit:
+            messages.append(
+                f"{counts[command]} {command} commands sent, budget is {limit}"
+            )
+    return messages
+
+
+def command_budget(total: int = None, **per_command):
+    """
+    Decorator declaring the command budget of a page object method
+
+    Exceeded budgets are recorded on the driver's counter and reported with the
+    test, they do not interrupt the method.
+
+    Args:
+        total: Maximum number of commands of any type per call
+        per_command: Maximum number of commands of a given type per call
+    """
+
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            counter = getattr(self.driver, "command_counter", None)
+            if counter is None:
+                return method(self, *args, **kwargs)
+            before = counter.counts.copy()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                used = counter.counts - before
+                for message in check_budget(used, total, **per_command):
+                    counter.violations.append(f"{method.__qualname__}: {message}")
+
+        return wrapper
+
+    return decorator
@@ -1,32 +1,297 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-import yaml
+"""
+Configuration of the test suite.
+
+Values come from config.yml and are loaded lazily, on first access, so that
+importing this module stays cheap for pytest collection and worker startup.
+The parsed YAML is cached as JSON under __pycache__ and reused while
+config.yml is unchanged.
+
+A profile from the "profiles" section of config.yml can be selected with the
+SWAG_PROFILE environment variable (or the "profile" key), and any value can be
+overridden with a SWAG_<KEY> environment variable, e.g. SWAG_SITE=local.
+
+Usage:
+    from utilities.config import settings
+    settings.username
+
+The upper case module attributes (USERNAME, LOGIN_URL...) are kept for
+existing imports and are resolved through the same settings object.
+"""
+
+import json
 import os
+from urllib.parse import urljoin
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.yml")
+CACHE_PATH = os.path.join(os.path.dirname(CONFIG_PATH), "__pycache__", "config.json")
+
+ENV_PREFIX = "SWAG_"
+PROFILE_ENV = "SWAG_PROFILE"
+
+# Environment variable set by utilities.parallel_runner on each worker process
+WORKER_ID_ENV = "SWAG_WORKER_ID"
+# File receiving the setup chains of the tests collected by the parallel runner
+CHAIN_GROUPS_ENV = "SWAG_CHAIN_GROUPS"
+
+LOCAL_SITE_HOST = "127.0.0.1"
+
+# Values used when config.yml does not define them
+DEFAULTS = {
+    "site": "remote",
+    "local_site_port": 8765,
+    "driver_max_uses": 25,
+    "page_cache": False,
+    "product_sample_seed": None,
+    "wait_timeout_default": 10,
+    "wait_timeout_min": 1,
+    "wait_timeout_max": 30,
+    "wait_timeout_multiplier": 3,
+    "browser_profile": "full",
+    "driver_prewarm": 0,
+    "instrumentation": False,
+    "instrumentation_dir": "instrumentation",
+    "command_budget": "fail",
+    "results_store": "files",
+    "asset_cache": False,
+    "asset_cache_dir": ".asset_cache",
+    "asset_cache_max_mb": 200,
+    "asset_cache_slot_mb": 50,
+}
+
+
+def _parse_env_value(value: str, current=None):
+    """
+    Parse an environment override to the type of the value it replaces
+
+    Strings stay strings (SWAG_PASSWORD=123 is "123"), other values are
+    parsed as JSON and kept as the raw string when that fails or gives a
+    different type, e.g. SWAG_DRIVER_MAX_USES=10 is 10 and
+    SWAG_PAGE_CACHE=true is True.
+
+    Args:
+        value: Value of the environment variable
+        current: Value of the setting before the override
+    """
+    if isinstance(current, str):
+        return value
+    try:
+        parsed = json.loads(value)
+    except ValueError:
+        return value
+    if current is None or isinstance(current, (dict, list)):
+        return parsed
+    if isinstance(current, bool) != isinstance(parsed, bool):
+        return value
+    if isinstance(current, (int, float)) and not isinstance(parsed, (int, float)):
+        return value
+    return parsed
+
+
+class Settings:
+    """Settings loaded lazily from config.yml"""
+
+    def __init__(self, path: str = CONFIG_PATH, cache_path: str = CACHE_PATH):
+        """
+        Initialize the settings, nothing is read until the first access
+
+        Args:
+            path: YAML configuration file
+            cache_path: JSON file caching the parsed configuration
+        """
+        self._path = path
+        self._cache_path = cache_path
+        self._values = None
+
+    def __getattr__(self, name):
+        """Get a setting by its config.yml key"""
+        values = self._load()
+        try:
+            return values[name]
+        except KeyError:
+            raise AttributeError(f"No setting named {name!r}") from None
+
+    def get(self, name: str, default=None):
+        """Get a setting, or a default when it is not defined"""
+        return self._load().get(name, default)
+
+    def reload(self):
+        """Forget the loaded values, they are read again on next access"""
+        self._values = None
+
+    @property
+    def login_url(self) -> str:
+        """URL of the login page of the site under test"""
+        if self.site == "local":
+            return f"http://{LOCAL_SITE_HOST}:{self.local_site_port}/"
+        return self._load()["login_url"]
+
+    @property
+    def inventory_url(self) -> str:
+        """URL of the inventory page of the site under test"""
+        return urljoin(self.login_url, "inventory.html")
+
+    def _load(self) -> dict:
+        """Load config.yml, then apply the selected profile and the env overrides"""
+        if self._values is None:
+            values = dict(DEFAULTS)
+            parsed = self._parse()
+            profiles = parsed.pop("profiles", None) or {}
+            values.update(parsed)
+
+            profile = os.environ.get(PROFILE_ENV) or values.get("profile")
+            if profile:
+                if profile not in profiles:
+                    raise ValueError(
+                        f"Unknown profile {profile!r}, the profiles of"
+                        f" {self._path} are: {', '.join(sorted(profiles)) or 'none'}"
+                    )
+                values.update(profiles[profile])
+
+            for key in list(values):
+                override = os.environ.get(ENV_PREFIX + key.upper())
+                if override is not None:
+                    values[key] = _parse_env_value(override, values[key])
+            self._values = values
+        return self._values
+
+    def _parse(self) -> dict:
+        """Parse config.yml, reusing the cached parse while the file is unchanged"""
+        stat = os.stat(self._path)
+        stamp = [stat.st_mtime_ns, stat.st_size]
+        try:
+            with open(self._cache_path, encoding="utf-8") as file:
+                cached = json.load(file)
+            if cached["stamp"] == stamp:
+                return cached["data"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+        import yaml
+
+        with open(self._path, "r", encoding="utf-8") as file:
+            data = yaml.safe_load(file) or {}
+        try:
+            os.makedirs(os.path.dirname(self._cache_path), exist_ok=True)
+            temporary_path = f"{self._cache_path}.{os.getpid()}.tmp"
+            with open(temporary_path, "w", encoding="utf-8") as file:
+                json.dump({"stamp": stamp, "data": data}, file)
+            os.replace(temporary_path, self._cache_path)
+        except OSError:
+            pass
+        return data
 
-config_path = os.path.join(os.path.dirname(__file__), "config.yml")
-# Load config from YAML file
-with open(config_path, "r") as file:
-    config = yaml.safe_load(file)
 
-print(config_path)
+class Setting:
+    """Class attribute resolved from the settings on access"""
 
-# Config variables
-LOGIN_URL = config["login_url"]
-USERNAME = config["username"]
-PASSWORD = config["password"]
+    def __init__(self, name: str):
+        self.name = name
 
-# Config variables for checkout page information form
-FIRST_NAME = config["first_name"]
-LAST_NAME = config["last_name"]
-ZIP_CODE = config["zip_code"]
+    def __get__(self, instance, owner):
+        return getattr(settings, self.name)
 
 
-def get_driver():
-    """Get the driver"""
+settings = Settings()
+
+
+def __getattr__(name):
+    """Resolve the upper case config constants (USERNAME, LOGIN_URL...) lazily"""
+    if name.isupper():
+        try:
+            return getattr(settings, name.lower())
+        except AttributeError:
+            pass
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def get_worker_id():
+    """Get the id of the current worker process, "main" when running serially"""
+    return os.environ.get(WORKER_ID_ENV) or os.environ.get(
+        "PYTEST_XDIST_WORKER", "main"
+    )
+
+
+# URL patterns of the web font files, blocked when a profile disables fonts
+FONT_URL_PATTERNS = ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"]
+
+
+def get_browser_profile(name: str = None) -> dict:
+    """
+    Get the settings of a browser profile
+
+    Args:
+        name: Profile from the browser_profiles setting, the browser_profile
+            setting by default
+    """
+    name = name or settings.browser_profile
+    try:
+        return dict(settings.browser_profiles[name], name=name)
+    except KeyError:
+        raise ValueError(f"Unknown browser profile {name!r}") from None
+
+
+def _profile_arguments(browser_profile: dict) -> list:
+    """Get the Chrome arguments of a browser profile"""
+    arguments = []
+    if browser_profile["headless"]:
+        arguments.append("--headless=new")
+    if browser_profile["window_size"]:
+        width, height = browser_profile["window_size"]
+        arguments.append(f"--window-size={width},{height}")
+    if not browser_profile["images"]:
+        arguments.append("--blink-settings=imagesEnabled=false")
+    return arguments
+
+
+def _cache_arguments():
+    """
+    Get the Chrome arguments of the HTTP cache
+
+    Incognito keeps its HTTP cache in memory, so it is left out when the asset
+    cache shares it on disk.
+
+    Returns:
+        tuple: The arguments and the claimed asset cache slot, None if disabled
+    """
+    if not settings.asset_cache:
+        return ["--incognito"], None
+
+    from utilities.asset_cache import AssetCache
+
+    asset_cache = AssetCache()
+    slot = asset_cache.claim_slot()
+    return asset_cache.chrome_arguments(slot), slot
+
+
+def _blocked_urls(browser_profile: dict) -> list:
+    """Get the URL patterns a browser profile blocks"""
+    blocked_urls = list(browser_profile["blocked_urls"])
+    if not browser_profile["fonts"]:
+        blocked_urls += FONT_URL_PATTERNS
+    return blocked_urls
+
+
+def get_driver(profile: str = None):
+    """
+    Get the driver
+
+    Args:
+        profile: Browser profile to launch, the browser_profile setting by default
+    """
+    # Selenium is only imported once a driver is actually requested
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+
+    from utilities.command_budget import count_commands
+
+    browser_profile = get_browser_profile(profile)
     chrome_options = webdriver.ChromeOptions()
+    chrome_options.page_load_strategy = browser_profile["page_load_strategy"]
 
     # Create a clean profile
-    chrome_options.add_argument("--incognito")
+    cache_arguments, asset_slot = _cache_arguments()
+    for argument in cache_arguments:
+        chrome_options.add_argument(argument)
     chrome_options.add_argument("--disable-extensions")
     chrome_options.add_argument("--disable-plugins")
     chrome_options.add_argument("--disable-blink-features=AutomationControlled")
@@ -38,6 +303,9 @@ def get_driver():
     chrome_options.add_argument("--disable-popup-blocking")
     chrome_options.add_argument("--disable-infobars")
 
+    for argument in _profile_arguments(browser_profile):
+        chrome_options.add_argument(argument)
+
     # Disable automation flags
     chrome_options.add_experimental_option(
         "excludeSwitches", ["enable-automation", "enable-logging"]
@@ -54,16 +322,36 @@ def get_driver():
         "profile.managed_default_content_settings.javascript": 1,
         "profile.default_content_setting_values.automatic_downloads": 1,
     }
+    if not browser_profile["images"]:
+        prefs["profile.managed_default_content_settings.images"] = 2
     chrome_options.add_experimental_option("prefs", prefs)
 
     # Create and configure the driver
     service = Service(executable_path="./drivers/chromedriver.exe")
-    driver = webdriver.Chrome(service=service, options=chrome_options)
+    try:
+        driver = webdriver.Chrome(service=service, options=chrome_options)
+    except Exception:
+        if asset_slot is not None:
+            from utilities.asset_cache import AssetCache
+
+            AssetCache().release_slot(asset_slot)
+        raise
+    driver.asset_cache_slot = asset_slot
+    count_commands(driver)
 
     # Execute CDP commands to disable features
     driver.execute_cdp_cmd("Page.setDownloadBehavior", {"behavior": "deny"})
     driver.execute_cdp_cmd("Network.setBypassServiceWorker", {"bypass": True})
 
+    # Block the trackers and, if disabled, the web fonts of the profile
+    blocked_urls = _blocked_urls(browser_profile)
+    if blocked_urls:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blocked_urls})
+
     # Set window size and position
-    driver.maximize_window()
+    if browser_profile["window_size"]:
+        driver.set_window_size(*browser_profile["window_size"])
+    elif not browser_profile["headless"]:
+        driver.maximize_window()
     return driver
@@ -0,0 +1,165 @@
+"""
+This module contains a pool of reusable WebDriver instances, so that the
+suite launches one browser per worker instead of one per test.
+
+The pool can also pre-warm browsers: they are launched on background threads
+while pytest collects, and replacements for recycled browsers are launched
+while the next tests run, so tests rarely wait for a browser to start.
+"""
+
+import threading
+
+from selenium.common.exceptions import WebDriverException
+
+from utilities.asset_cache import release_asset_cache
+from utilities.config import get_driver, settings
+
+
+def reset_driver_state(driver) -> bool:
+    """
+    Reset the browser state left behind by a test
+
+    Clears cookies, localStorage and sessionStorage and navigates to about:blank.
+
+    Args:
+        driver: WebDriver instance
+
+    Returns:
+        bool: True if the driver was reset, False if it is no longer usable
+    """
+    try:
+        # Storage belongs to the current origin, so clear it before leaving it
+        driver.execute_script(
+            "try { window.localStorage.clear(); window.sessionStorage.clear(); }"
+            " catch (e) {}"
+        )
+        try:
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        except WebDriverException:
+            driver.delete_all_cookies()
+        driver.get("about:blank")
+        return True
+    except WebDriverException:
+        return False
+
+
+def is_driver_healthy(driver) -> bool:
+    """Check that the browser behind the driver still answers commands"""
+    try:
+        driver.execute_script("return document.readyState")
+        return True
+    except WebDriverException:
+        return False
+
+
+class DriverPool:
+    """Pool of WebDriver instances with checkout/checkin semantics"""
+
+    def __init__(self, factory=get_driver, max_uses: int = None):
+        """
+        Initialize the driver pool
+
+        Args:
+            factory: Callable that launches a new driver
+            max_uses: Number of checkouts after which a driver is recycled,
+                the driver_max_uses setting by default
+        """
+        self._factory = factory
+        self.max_uses = settings.driver_max_uses if max_uses is None else max_uses
+        self._idle = []
+        self._uses = {}
+        self._lock = threading.Lock()
+        self._ready = threading.Condition(self._lock)
+        self._pending = 0
+        self._refill = False
+        self.launches = 0
+
+    def prewarm(self, count: int):
+        """
+        Launch drivers on background threads, ready for the next checkouts
+
+        Once pre-warming is used, every recycled driver is also replaced in
+        the background.
+
+        Args:
+            count: Number of drivers to launch
+        """
+        with self._lock:
+            self._refill = True
+            self._pending += count
+        for _ in range(count):
+            threading.Thread(target=self._prewarm_one, daemon=True).start()
+
+    def _prewarm_one(self):
+        """Launch a driver and make it idle, waking up a waiting checkout"""
+        driver = None
+        try:
+            driver = self._factory()
+        except Exception:
+            # The checkout launching a driver itself will raise the error
+            pass
+        with self._ready:
+            self._pending -= 1
+            if driver is not None:
+                self._uses[driver] = 0
+                self.launches += 1
+                self._idle.append(driver)
+            self._ready.notify_all()
+
+    def checkout(self):
+        """Get a healthy driver from the pool, launching one if none is idle"""
+        while True:
+            with self._ready:
+                # A driver being pre-warmed is ready sooner than a new launch
+                while not self._idle and self._pending:
+                    self._ready.wait()
+                driver = self._idle.pop() if self._idle else None
+            if driver is None:
+                return self._launch()
+            if is_driver_healthy(driver):
+                return driver
+            self._discard(driver)
+
+    def checkin(self, driver):
+        """Return a driver to the pool, resetting or recycling it"""
+        with self._lock:
+            self._uses[driver] = self._uses.get(driver, 0) + 1
+            worn_out = self._uses[driver] >= self.max_uses
+
+        if worn_out or not reset_driver_state(driver):
+            self._discard(driver)
+            if self._refill:
+                self.prewarm(1)
+            return
+
+        with self._lock:
+            self._idle.append(driver)
+
+    def close(self):
+        """Quit every driver owned by the pool, once the pending launches ended"""
+        with self._ready:
+            self._refill = False
+            while self._pending:
+                self._ready.wait()
+            drivers = list(self._uses)
+            self._idle = []
+        for driver in drivers:
+            self._discard(driver)
+
+    def _launch(self):
+        """Launch a new driver through the factory"""
+        driver = self._factory()
+        with self._lock:
+            self._uses[driver] = 0
+            self.launches += 1
+        return driver
+
+    def _discard(self, driver):
+        """Quit a driver and forget about it"""
+        with self._lock:
+            self._uses.pop(driver, None)
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
+        release_asset_cache(driver)
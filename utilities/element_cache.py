@@ -0,0 +1,91 @@
+"""
+This module contains a per-page cache of located elements.
+
+The cache hands back the same element for a locator until it becomes stale,
+then locates it again transparently.
+"""
+
+from selenium.common.exceptions import StaleElementReferenceException
+
+
+class CachedElement:
+    """WebElement proxy that locates its element again when it goes stale"""
+
+    def __init__(self, cache, locator: tuple, element):
+        """
+        Initialize the cached element
+
+        Args:
+            cache: ElementCache that owns the element
+            locator: Locator the element was found with
+            element: WebElement found with the locator
+        """
+        self._cache = cache
+        self._locator = locator
+        self.element = element
+
+    def __getattr__(self, name):
+        """Forward attributes and method calls to the underlying WebElement"""
+        try:
+            attribute = getattr(self.element, name)
+        except StaleElementReferenceException:
+            self._refresh()
+            attribute = getattr(self.element, name)
+
+        if not callable(attribute):
+            return attribute
+
+        def call(*args, **kwargs):
+            try:
+                return getattr(self.element, name)(*args, **kwargs)
+            except StaleElementReferenceException:
+                self._refresh()
+                return getattr(self.element, name)(*args, **kwargs)
+
+        return call
+
+    def __repr__(self):
+        return f"<CachedElement {self._locator} {self.element!r}>"
+
+    def _refresh(self):
+        """Locate the element again after it went stale"""
+        self.element = self._cache.locate(self._locator)
+
+
+class ElementCache:
+    """Elements located by a page object, keyed by locator"""
+
+    def __init__(self, driver):
+        """
+        Initialize the element cache
+
+        Args:
+            driver: WebDriver instance
+        """
+        self.driver = driver
+        self._elements = {}
+        self.lookups = 0
+
+    def find(self, locator: tuple) -> CachedElement:
+        """
+        Get the element for a locator, locating it only on the first call
+
+        Raises NoSuchElementException like find_element when there is no match.
+
+        Args:
+            locator: Tuple of locator strategy and value (e.g., (By.ID, "my-id"))
+        """
+        element = self._elements.get(locator)
+        if element is None:
+            element = CachedElement(self, locator, self.locate(locator))
+            self._elements[locator] = element
+        return element
+
+    def locate(self, locator: tuple):
+        """Locate the element for a locator with a find_element call"""
+        self.lookups += 1
+        return self.driver.find_element(*locator)
+
+    def clear(self):
+        """Forget every cached element"""
+        self._elements.clear()
@@ -0,0 +1,393 @@
+"""
+This module keeps the history of the test results in an indexed SQLite
+database, so duration trends and flakiness can be followed across runs.
+
+Results are read from an allure results directory, both the standard JSON
+files and the logs of the streaming results store. Ingestion is incremental:
+the files already read are recorded, only new result files and the records
+appended to the logs since the last ingestion are parsed. A log is read from
+the end of the last gzip member ingested, the members before it are not
+decompressed again. Each ingestion is recorded as a run, labelled with --run
+(e.g. a CI build number).
+
+Usage:
+    python -m utilities.history_db ingest allure-results --run build-42
+    python -m utilities.history_db trends --test test_login --period day
+    python -m utilities.history_db flaky --min-runs 5
+    python -m utilities.history_db slowest --test test_fill_information_form
+"""
+
+import argparse
+import datetime
+import fnmatch
+import json
+import os
+import sqlite3
+import sys
+from collections import defaultdict
+
+from utilities.results_store import LOG_PATTERN, read_members
+from utilities.timing_store import percentile
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HISTORY_PATH = os.path.join(PROJECT_ROOT, ".test_history.sqlite")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    label TEXT NOT NULL,
+    ingested_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    uuid TEXT PRIMARY KEY,
+    history_id TEXT NOT NULL,
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    full_name TEXT,
+    name TEXT NOT NULL,
+    parameters TEXT NOT NULL,
+    status TEXT,
+    start INTEGER,
+    stop INTEGER,
+    duration INTEGER
+);
+CREATE INDEX IF NOT EXISTS results_by_history ON results (history_id, start);
+CREATE INDEX IF NOT EXISTS results_by_name ON results (name);
+CREATE INDEX IF NOT EXISTS results_by_run ON results (run_id);
+-- For a results store log, size is the offset where its last complete gzip
+-- member ends and records the number of records read after it
+CREATE TABLE IF NOT EXISTS ingested_files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    records INTEGER NOT NULL
+);
+"""
+
+# Statuses counted as a failure when computing flip rates
+FAILED_STATUSES = ("failed", "broken")
+
+
+def _parameters_label(result: dict) -> str:
+    """Get the parameters of a result as "name=value, ..." """
+    return ", ".join(
+        f"{parameter['name']}={parameter.get('value')}"
+        for parameter in result.get("parameters", [])
+    )
+
+
+class HistoryDB:
+    """SQLite store of the test results of every ingested run"""
+
+    def __init__(self, path: str = HISTORY_PATH):
+        """
+        Open the history database, creating it if needed
+
+        Args:
+            path: SQLite database file
+        """
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        """Close the database"""
+        self.connection.close()
+
+    def ingest(self, results_dir: str, label: str = None) -> int:
+        """
+        Load the results added to a directory since the last ingestion
+
+        Args:
+            results_dir: Allure results directory
+            label: Label of the run, the ingestion time by default
+
+        Returns:
+            int: Number of results loaded
+        """
+        known = dict(
+            (path, (size, records))
+            for path, size, records in self.connection.execute(
+                "SELECT path, size, records FROM ingested_files"
+            )
+        )
+        now = datetime.datetime.now().isoformat(timespec="seconds")
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO runs (label, ingested_at) VALUES (?, ?)",
+                (label or now, now),
+            )
+            run_id = cursor.lastrowid
+            loaded = 0
+            log_pattern = LOG_PATTERN.format(worker_id="*")
+            for entry in os.scandir(results_dir):
+                path = os.path.abspath(entry.path)
+                if entry.name.endswith("-result.json"):
+                    if path not in known:
+                        loaded += self._ingest_result_file(path, run_id)
+                elif fnmatch.fnmatch(entry.name, log_pattern):
+                    loaded += self._ingest_log(path, run_id, known.get(path))
+
+            if not loaded:
+                # Nothing new, do not record an empty run
+                self.connection.execute("DELETE FROM runs WHERE id = ?", (run_id,))
+        return loaded
+
+    def _ingest_result_file(self, path: str, run_id: int) -> int:
+        """Load a standard allure result file"""
+        try:
+            with open(path, encoding="utf-8") as file:
+                result = json.load(file)
+        except (OSError, ValueError):
+            # Still being written, it will be picked up next time
+            return 0
+        loaded = self._insert(result, run_id)
+        self.connection.execute(
+            "INSERT OR REPLACE INTO ingested_files VALUES (?, ?, ?)",
+            (path, os.path.getsize(path), 1),
+        )
+        return loaded
+
+    def _ingest_log(self, path: str, run_id: int, known) -> int:
+        """
+        Load the results appended to a results store log since last time
+
+        Each ingestion stores the byte offset where the last complete gzip
+        member of the log ends, and the number of records read after it in a
+        member still being written. The next ingestion seeks to that offset and
+        only decompresses what follows it.
+        """
+        size = os.path.getsize(path)
+        offset, skip = known if known is not None else (0, 0)
+        if size == offset:
+            return 0
+        if size < offset:
+            # The log was replaced, read it again from the start
+            offset, skip = 0, 0
+        loaded = 0
+        records = 0
+        for kind, value in read_members(path, offset):
+            if kind == "end":
+                offset, records, skip = value, 0, 0
+                continue
+            records += 1
+            if records > skip and value["kind"] == "result":
+                loaded += self._insert(value["data"], run_id)
+        self.connection.execute(
+            "INSERT OR REPLACE INTO ingested_files VALUES (?, ?, ?)",
+            (path, offset, records),
+        )
+        return loaded
+
+    def _insert(self, result: dict, run_id: int) -> int:
+        """Insert a result, 0 if it was already stored"""
+        start, stop = result.get("start"), result.get("stop")
+        cursor = self.connection.execute(
+            "INSERT OR IGNORE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                result["uuid"],
+                result.get("historyId") or result.get("fullName") or result["name"],
+                run_id,
+                result.get("fullName"),
+                result["name"],
+                _parameters_label(result),
+                result.get("status"),
+                start,
+                stop,
+                stop - start if start is not None and stop is not None else None,
+            ),
+        )
+        return cursor.rowcount
+
+    def _rows(self, test: str, columns: str, order: str):
+        """Select result columns, optionally for tests whose name contains test"""
+        query = f"SELECT {columns} FROM results"
+        arguments = ()
+        if test:
+            query += " WHERE name LIKE ?"
+            arguments = (f"%{test}%",)
+        return self.connection.execute(f"{query} ORDER BY {order}", arguments)
+
+    def duration_trends(self, test: str = None, period: str = "day") -> list:
+        """
+        Get the duration percentiles of each test per period
+
+        Args:
+            test: Only the tests whose name contains this text
+            period: "day" or "run"
+
+        Returns:
+            list: Dicts with the test, parameters, period, runs, p50 and p95
+                durations in seconds, oldest period first
+        """
+        durations = defaultdict(list)
+        labels = {}
+        rows = self._rows(
+            test,
+            "history_id, name, parameters, start, duration, "
+            "(SELECT label FROM runs WHERE runs.id = run_id)",
+            "start",
+        )
+        for history_id, name, parameters, start, duration, run in rows:
+            if duration is None:
+                continue
+            if period == "run":
+                key = run
+            else:
+                key = datetime.date.fromtimestamp(start / 1000).isoformat()
+            durations[(history_id, key)].append(duration / 1000)
+            labels[history_id] = (name, parameters)
+
+        trends = []
+        for (history_id, key), samples in durations.items():
+            name, parameters = labels[history_id]
+            trends.append(
+                {
+                    "test": name,
+                    "parameters": parameters,
+                    "period": key,
+                    "runs": len(samples),
+                    "p50": percentile(samples, 0.5),
+                    "p95": percentile(samples, 0.95),
+                }
+            )
+        return trends
+
+    def flakiness(self, test: str = None, min_runs: int = 5) -> list:
+        """
+        Get the pass/fail flip rate of each test, flakiest first
+
+        The flip rate is the share of consecutive runs whose outcome changed.
+        Skipped runs are ignored.
+
+        Args:
+            test: Only the tests whose name contains this text
+            min_runs: Tests with fewer runs are left out, at least 2 since a
+                flip is a change between two runs
+
+        Returns:
+            list: Dicts with the test, parameters, runs, failures, flips and
+                flip rate
+        """
+        outcomes = defaultdict(list)
+        labels = {}
+        rows = self._rows(test, "history_id, name, parameters, status", "start")
+        for history_id, name, parameters, status in rows:
+            if status == "skipped":
+                continue
+            outcomes[history_id].append(status in FAILED_STATUSES)
+            labels[history_id] = (name, parameters)
+
+        min_runs = max(min_runs, 2)
+        scores = []
+        for history_id, failed in outcomes.items():
+            if len(failed) < min_runs:
+                continue
+            flips = sum(before != after for before, after in zip(failed, failed[1:]))
+            name, parameters = labels[history_id]
+            scores.append(
+                {
+                    "test": name,
+                    "parameters": parameters,
+                    "runs": len(failed),
+                    "failures": sum(failed),
+                    "flips": flips,
+                    "flip_rate": flips / (len(failed) - 1),
+                }
+            )
+        return sorted(scores, key=lambda score: score["flip_rate"], reverse=True)
+
+    def slowest(self, test: str = None, limit: int = 10) -> list:
+        """
+        Get the slowest tests, each parametrization on its own
+
+        Args:
+            test: Only the tests whose name contains this text
+            limit: Number of parametrizations returned
+
+        Returns:
+            list: Dicts with the test, parameters, runs, p50 and p95 durations
+                in seconds, slowest median first
+        """
+        durations = defaultdict(list)
+        labels = {}
+        rows = self._rows(test, "history_id, name, parameters, duration", "start")
+        for history_id, name, parameters, duration in rows:
+            if duration is not None:
+                durations[history_id].append(duration / 1000)
+                labels[history_id] = (name, parameters)
+
+        ranked = []
+        for history_id, samples in durations.items():
+            name, parameters = labels[history_id]
+            ranked.append(
+                {
+                    "test": name,
+                    "parameters": parameters,
+                    "runs": len(samples),
+                    "p50": percentile(samples, 0.5),
+                    "p95": percentile(samples, 0.95),
+                }
+            )
+        ranked.sort(key=lambda row: row["p50"], reverse=True)
+        return ranked[:limit]
+
+
+def _print_rows(rows: list, columns: list):
+    """Print query results as an aligned table"""
+    print("  ".join(f"{column:>12}" for column in columns))
+    for row in rows:
+        cells = []
+        for column in columns:
+            value = row[column]
+            cells.append(f"{value:>12.3f}" if isinstance(value, float) else f"{value}")
+        print("  ".join(f"{cell:>12}" for cell in cells))
+
+
+def main(argv=None) -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--db", default=HISTORY_PATH, help="SQLite database file")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    ingest_parser = commands.add_parser("ingest", help="load new results")
+    ingest_parser.add_argument("results_dir")
+    ingest_parser.add_argument("--run", help="label of the run")
+
+    trends_parser = commands.add_parser("trends", help="duration percentiles")
+    trends_parser.add_argument("--test")
+    trends_parser.add_argument("--period", choices=["day", "run"], default="day")
+
+    flaky_parser = commands.add_parser("flaky", help="pass/fail flip rates")
+    flaky_parser.add_argument("--test")
+    flaky_parser.add_argument("--min-runs", type=int, default=5)
+
+    slowest_parser = commands.add_parser("slowest", help="slowest parametrizations")
+    slowest_parser.add_argument("--test")
+    slowest_parser.add_argument("--limit", type=int, default=10)
+
+    args = parser.parse_args(argv)
+    history = HistoryDB(args.db)
+    try:
+        if args.command == "ingest":
+            loaded = history.ingest(args.results_dir, args.run)
+            print(f"Loaded {loaded} new results")
+        elif args.command == "trends":
+            _print_rows(
+                history.duration_trends(args.test, args.period),
+                ["test", "parameters", "period", "runs", "p50", "p95"],
+            )
+        elif args.command == "flaky":
+            _print_rows(
+                history.flakiness(args.test, args.min_runs),
+                ["test", "parameters", "runs", "failures", "flips", "flip_rate"],
+            )
+        else:
+            _print_rows(
+                history.slowest(args.test, args.limit),
+                ["test", "parameters", "runs", "p50", "p95"],
+            )
+    finally:
+        history.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,243 @@
+"""
+This module contains the latency instrumentation of the page objects.
+
+When the instrumentation setting is enabled, every public page object method
+and every WebDriver command sent underneath it is timed. Each page object
+method becomes an allure step, and at the end of the session the timings are
+written as a JSON summary and as a Chrome trace-event file that can be opened
+in chrome://tracing or https://ui.perfetto.dev.
+
+Usage:
+    instrument_driver(driver)
+    ...
+    RECORDER.save("instrumentation", "main")
+"""
+
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+
+import allure
+
+from utilities.config import settings
+from utilities.timing_store import percentile
+
+# Locator strategies of selenium's By, used to spot locators among arguments
+LOCATOR_STRATEGIES = {
+    "id",
+    "xpath",
+    "link text",
+    "partial link text",
+    "name",
+    "tag name",
+    "class name",
+    "css selector",
+}
+
+
+def _find_locator(args) -> str:
+    """Get the first locator among the arguments of a call, as "by=value" """
+    for arg in args:
+        if isinstance(arg, tuple) and len(arg) == 2 and arg[0] in LOCATOR_STRATEGIES:
+            return f"{arg[0]}={arg[1]}"
+    return None
+
+
+class Span:
+    """One timed page object method or WebDriver command"""
+
+    def __init__(self, name: str, kind: str, locator: str = None):
+        self.name = name
+        self.kind = kind
+        self.locator = locator
+        self.thread = threading.get_ident()
+        self.start = time.perf_counter()
+        self.duration = None
+        self.round_trips = 0
+        # Locators used by the span and by the commands sent underneath it
+        self.locators = {locator} if locator else set()
+
+
+class Recorder:
+    """Spans recorded by the process, with a stack of open spans per thread"""
+
+    def __init__(self):
+        self.spans = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the instrumentation setting is on"""
+        return settings.instrumentation
+
+    def _stack(self) -> list:
+        """Get the open spans of the current thread, innermost last"""
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def open(self, name: str, kind: str, locator: str = None) -> Span:
+        """Start a span nested in the open spans of the thread"""
+        span = Span(name, kind, locator)
+        self._stack().append(span)
+        return span
+
+    def close(self, span: Span):
+        """End a span, counting WebDriver commands as round trips of its parents"""
+        span.duration = time.perf_counter() - span.start
+        stack = self._stack()
+        stack.remove(span)
+        if span.kind == "command":
+            span.round_trips = 1
+            for parent in stack:
+                parent.round_trips += 1
+                parent.locators |= span.locators
+        with self._lock:
+            self.spans.append(span)
+
+    def summary(self) -> dict:
+        """
+        Aggregate the spans per name
+
+        Returns:
+            dict: Per test, page object method (step) and WebDriver command:
+                calls, total, mean, p95 and max wall time in seconds, round
+                trips and the locators used
+        """
+        grouped = {}
+        with self._lock:
+            spans = list(self.spans)
+        for span in spans:
+            grouped.setdefault((span.kind, span.name), []).append(span)
+
+        summary = {"tests": {}, "steps": {}, "commands": {}}
+        for (kind, name), group in sorted(grouped.items()):
+            durations = [span.duration for span in group]
+            summary[f"{kind}s"][name] = {
+                "calls": len(group),
+                "total": round(sum(durations), 6),
+                "mean": round(sum(durations) / len(group), 6),
+                "p95": round(percentile(durations, 0.95), 6),
+                "max": round(max(durations), 6),
+                "round_trips": sum(span.round_trips for span in group),
+                "locators": sorted(set().union(*(span.locators for span in group))),
+            }
+        return summary
+
+    def trace_events(self, pid: int = None) -> list:
+        """Get the spans as Chrome trace "complete" events"""
+        pid = pid or os.getpid()
+        with self._lock:
+            spans = list(self.spans)
+        events = []
+        for span in spans:
+            events.append(
+                {
+                    "name": span.name,
+                    "cat": span.kind,
+                    "ph": "X",
+                    "ts": round((span.start - self._origin) * 1e6),
+                    "dur": round(span.duration * 1e6),
+                    "pid": pid,
+                    "tid": span.thread,
+                    "args": {
+                        "locators": sorted(span.locators),
+                        "round_trips": span.round_trips,
+                    },
+                }
+            )
+        return events
+
+    def save(self, directory: str, worker_id: str):
+        """
+        Write the JSON summary and the trace file of the process
+
+        Args:
+            directory: Output directory
+            worker_id: Id of the worker, used in the file names
+        """
+        if not self.spans:
+            return
+        os.makedirs(directory, exist_ok=True)
+        summary_path = os.path.join(directory, f"summary-{worker_id}.json")
+        with open(summary_path, "w", encoding="utf-8") as file:
+            json.dump(self.summary(), file, indent=2)
+        trace_path = os.path.join(directory, f"trace-{worker_id}.json")
+        with open(trace_path, "w", encoding="utf-8") as file:
+            json.dump({"traceEvents": self.trace_events()}, file)
+
+    def clear(self):
+        """Forget the recorded spans"""
+        with self._lock:
+            self.spans = []
+
+
+# Shared by every page object and driver of the process
+RECORDER = Recorder()
+
+
+def instrumented(method):
+    """Decorator timing a page object method and reporting it as an allure step"""
+    name = method.__qualname__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not RECORDER.enabled:
+            return method(self, *args, **kwargs)
+        locator = _find_locator(args)
+        title = f"{name} [{locator}]" if locator else name
+        span = RECORDER.open(name, "step", locator)
+        try:
+            with allure.step(title):
+                return method(self, *args, **kwargs)
+        finally:
+            RECORDER.close(span)
+
+    wrapper.instrumented = True
+    return wrapper
+
+
+def instrument_class(cls):
+    """Wrap the public methods defined by a page object class with instrumented"""
+    for attribute, value in list(vars(cls).items()):
+        if (
+            attribute.startswith("_")
+            or not inspect.isfunction(value)
+            or getattr(value, "instrumented", False)
+        ):
+            continue
+        setattr(cls, attribute, instrumented(value))
+    return cls
+
+
+def instrument_driver(driver):
+    """
+    Time every WebDriver command sent by a driver
+
+    The driver's execute method is wrapped once, later calls do nothing.
+    """
+    if getattr(driver.execute, "instrumented", False):
+        return driver
+    execute = driver.execute
+
+    @functools.wraps(execute)
+    def timed_execute(driver_command, params=None):
+        if not RECORDER.enabled:
+            return execute(driver_command, params)
+        locator = None
+        if params and "using" in params:
+            locator = f"{params['using']}={params.get('value')}"
+        span = RECORDER.open(driver_command, "command", locator)
+        try:
+            return execute(driver_command, params)
+        finally:
+            RECORDER.close(span)
+
+    timed_execute.instrumented = True
+    driver.execute = timed_execute
+    return driver
@@ -0,0 +1,7 @@
+"""
+Local stand-in for the Swag Labs demo site, so the suite can run offline
+"""
+
+from utilities.local_swag_labs.server import ensure_server, start_server
+
+__all__ = ["ensure_server", "start_server"]
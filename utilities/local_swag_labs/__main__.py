@@ -0,0 +1,28 @@
+"""
+Serve the local Swag Labs stand-in until interrupted
+
+Usage:
+    python -m utilities.local_swag_labs [port]
+"""
+
+import sys
+
+from utilities.local_swag_labs.server import SwagLabsHandler, ThreadingHTTPServer
+
+
+def main(argv=None):
+    """Command line entry point"""
+    argv = sys.argv[1:] if argv is None else argv
+    port = int(argv[0]) if argv else 8765
+    server = ThreadingHTTPServer(("127.0.0.1", port), SwagLabsHandler)
+    print(f"Swag Labs stand-in running on http://127.0.0.1:{port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+This module serves the local stand-in of the Swag Labs demo site.
+
+Every page of the app (login, inventory, cart, checkout steps and complete)
+is served by the same index.html, and static/app.js renders the page matching
+the URL, like the single page app of the real site.
+"""
+
+import os
+import socket
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+
+APP_ROUTES = {
+    "/",
+    "/index.html",
+    "/inventory.html",
+    "/cart.html",
+    "/checkout-step-one.html",
+    "/checkout-step-two.html",
+    "/checkout-complete.html",
+}
+
+
+class SwagLabsHandler(SimpleHTTPRequestHandler):
+    """Serve the app routes and the static assets of the stand-in site"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, directory=STATIC_DIR, **kwargs)
+
+    def do_GET(self):
+        """Map the app routes to index.html and /static/ to the assets"""
+        path = urlsplit(self.path).path
+        if path in APP_ROUTES:
+            self.path = "/index.html"
+            self._cache_control = "no-cache"
+        elif path.startswith("/static/"):
+            self.path = path[len("/static") :]
+            self._cache_control = "public, max-age=86400"
+        else:
+            self.send_error(404)
+            return
+        super().do_GET()
+
+    def end_headers(self):
+        """Add the cache policy of the served file"""
+        cache_control = getattr(self, "_cache_control", None)
+        if cache_control:
+            self.send_header("Cache-Control", cache_control)
+        super().end_headers()
+
+    def log_message(self, format, *args):
+        """Keep the test output free of access logs"""
+
+
+def is_serving(host: str, port: int) -> bool:
+    """Check whether something already listens on the address"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+        probe.settimeout(0.2)
+        return probe.connect_ex((host, port)) == 0
+
+
+def start_server(host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+    """
+    Start the stand-in site on a daemon thread
+
+    Args:
+        host: Interface to listen on
+        port: Port to listen on, 0 picks a free one
+
+    Returns:
+        ThreadingHTTPServer: The running server, see server_address for the port
+    """
+    server = ThreadingHTTPServer((host, port), SwagLabsHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def ensure_server(host: str, port: int):
+    """
+    Start the stand-in site unless another process already serves it
+
+    Parallel workers share the server started by the first process.
+
+    Returns:
+        ThreadingHTTPServer: The server started, None if it was already running
+    """
+    if is_serving(host, port):
+        return None
+    try:
+        return start_server(host, port)
+    except OSError:
+        # Another worker bound the port in the meantime
+        return None
@@ -0,0 +1,592 @@
+/*
+ * Local stand-in for the Swag Labs demo site.
+ *
+ * Renders the login, inventory, cart, checkout and complete pages with the
+ * ids, data-test attributes and classes targeted by the locators package.
+ * Like the real site, the session lives in the "session-username" cookie and
+ * the cart in the "cart-contents" localStorage entry.
+ */
+"use strict";
+
+const PASSWORD = "secret_sauce";
+const USERS = [
+    "standard_user",
+    "locked_out_user",
+    "problem_user",
+    "performance_glitch_user",
+    "error_user",
+    "visual_user",
+];
+const SESSION_COOKIE = "session-username";
+const CART_KEY = "cart-contents";
+const TAX_RATE = 0.08;
+
+// Sorted by name, like the default sort of the real inventory
+const PRODUCTS = [
+    {
+        id: 4,
+        name: "Sauce Labs Backpack",
+        price: 29.99,
+        desc: "carry.allTheThings() with the sleek, streamlined Sly Pack that melds uncompromising style with unequaled laptop and tablet protection.",
+    },
+    {
+        id: 0,
+        name: "Sauce Labs Bike Light",
+        price: 9.99,
+        desc: "A red light isn't the desired state in testing but it sure helps when riding your bike at night. Water-resistant with 3 lighting modes, 1 AAA battery included.",
+    },
+    {
+        id: 1,
+        name: "Sauce Labs Bolt T-Shirt",
+        price: 15.99,
+        desc: "Get your testing superhero on with the Sauce Labs bolt T-shirt. From American Apparel, 100% ringspun combed cotton, heather gray with red bolt.",
+    },
+    {
+        id: 5,
+        name: "Sauce Labs Fleece Jacket",
+        price: 49.99,
+        desc: "It's not every day that you come across a midweight quarter-zip fleece jacket capable of handling everything from a relaxing day outdoors to a busy day at the office.",
+    },
+    {
+        id: 2,
+        name: "Sauce Labs Onesie",
+        price: 7.99,
+        desc: "Rib snap infant onesie for the junior automation engineer in development. Reinforced 3-snap bottom closure, two-needle hemmed sleeved and bottom won't unravel.",
+    },
+    {
+        id: 3,
+        name: "Test.allTheThings() T-Shirt (Red)",
+        price: 15.99,
+        desc: "This classic Sauce Labs t-shirt is perfect to wear when cozying up to your keyboard to automate a few tests. Super-soft and comfy ringspun combed cotton.",
+    },
+];
+
+/* ---------- helpers ---------- */
+
+function h(tag, attributes, ...children) {
+    const element = document.createElement(tag);
+    for (const [name, value] of Object.entries(attributes || {})) {
+        if (name.startsWith("on")) {
+            element.addEventListener(name.slice(2), value);
+        } else {
+            element.setAttribute(name, value);
+        }
+    }
+    for (const child of children) {
+        if (child !== null && child !== undefined) {
+            element.append(child);
+        }
+    }
+    return element;
+}
+
+function slug(name) {
+    return name.toLowerCase().replace(/ /g, "-");
+}
+
+function formatPrice(value) {
+    return "$" + value.toFixed(2);
+}
+
+function productById(id) {
+    return PRODUCTS.find((product) => product.id === id);
+}
+
+function getCart() {
+    try {
+        return JSON.parse(window.localStorage.getItem(CART_KEY)) || [];
+    } catch (error) {
+        return [];
+    }
+}
+
+function setCart(ids) {
+    if (ids.length) {
+        window.localStorage.setItem(CART_KEY, JSON.stringify(ids));
+    } else {
+        window.localStorage.removeItem(CART_KEY);
+    }
+    updateBadge();
+}
+
+function addToCart(id) {
+    const cart = getCart();
+    if (!cart.includes(id)) {
+        setCart(cart.concat(id));
+    }
+}
+
+function removeFromCart(id) {
+    setCart(getCart().filter((item) => item !== id));
+}
+
+function loggedIn() {
+    return document.cookie
+        .split("; ")
+        .some((cookie) => cookie.startsWith(SESSION_COOKIE + "="));
+}
+
+function navigate(path) {
+    window.history.pushState({}, "", path);
+    render();
+}
+
+function link(path, attributes, ...children) {
+    return h(
+        "a",
+        Object.assign({href: path, onclick: (event) => {
+            event.preventDefault();
+            navigate(path);
+        }}, attributes),
+        ...children
+    );
+}
+
+/* ---------- shared components ---------- */
+
+function badge() {
+    const count = getCart().length;
+    return count
+        ? h("span", {class: "shopping_cart_badge", "data-test": "shopping-cart-badge"}, String(count))
+        : "";
+}
+
+function updateBadge() {
+    const cartLink = document.querySelector(".shopping_cart_link");
+    if (cartLink) {
+        cartLink.replaceChildren(badge());
+    }
+}
+
+function header(title) {
+    return h(
+        "div",
+        {id: "header_container", class: "header_container", "data-test": "header-container"},
+        h(
+            "div",
+            {class: "primary_header", "data-test": "primary-header"},
+            h("div", {class: "header_label"}, h("div", {class: "app_logo"}, "Swag Labs")),
+            h(
+                "div",
+                {id: "shopping_cart_container", class: "shopping_cart_container"},
+                link("/cart.html", {class: "shopping_cart_link", "data-test": "shopping-cart-link"}, badge())
+            )
+        ),
+        h(
+            "div",
+            {class: "header_secondary_container", "data-test": "secondary-header"},
+            h("span", {class: "title", "data-test": "title"}, title)
+        )
+    );
+}
+
+function errorBox() {
+    const container = h("div", {class: "error-message-container"});
+    container.show = (message) => {
+        container.className = "error-message-container error";
+        container.replaceChildren(
+            h(
+                "h3",
+                {"data-test": "error"},
+                message,
+                h("button", {
+                    class: "error-button",
+                    "data-test": "error-button",
+                    type: "button",
+                    onclick: () => {
+                        container.className = "error-message-container";
+                        container.replaceChildren();
+                    },
+                })
+            )
+        );
+    };
+    return container;
+}
+
+function inventoryButton(product) {
+    const button = h("button", {type: "button"});
+    const sync = () => {
+        const inCart = getCart().includes(product.id);
+        const id = (inCart ? "remove-" : "add-to-cart-") + slug(product.name);
+        button.className =
+            (inCart ? "btn btn_secondary" : "btn btn_primary") + " btn_small btn_inventory";
+        button.id = id;
+        button.name = id;
+        button.setAttribute("data-test", id);
+        button.textContent = inCart ? "Remove" : "Add to cart";
+    };
+    button.addEventListener("click", () => {
+        if (getCart().includes(product.id)) {
+            removeFromCart(product.id);
+        } else {
+            addToCart(product.id);
+        }
+        sync();
+    });
+    sync();
+    return button;
+}
+
+function cartItem(product, removable) {
+    const item = h("div", {class: "cart_item", "data-test": "inventory-item"});
+    const removeButton = removable
+        ? h("button", {
+              class: "btn btn_secondary btn_small cart_button",
+              "data-test": "remove-" + slug(product.name),
+              id: "remove-" + slug(product.name),
+              name: "remove-" + slug(product.name),
+              type: "button",
+              onclick: () => {
+                  removeFromCart(product.id);
+                  item.remove();
+              },
+          }, "Remove")
+        : null;
+    item.append(
+        h("div", {class: "cart_quantity", "data-test": "item-quantity"}, "1"),
+        h(
+            "div",
+            {class: "cart_item_label"},
+            h(
+                "a",
+                {
+                    href: "#",
+                    id: `item_${product.id}_title_link`,
+                    "data-test": `item-${product.id}-title-link`,
+                },
+                h("div", {class: "inventory_item_name", "data-test": "inventory-item-name"}, product.name)
+            ),
+            h("div", {class: "inventory_item_desc", "data-test": "inventory-item-desc"}, product.desc),
+            h(
+                "div",
+                {class: "item_pricebar"},
+                h("div", {class: "inventory_item_price", "data-test": "inventory-item-price"}, formatPrice(product.price)),
+                removeButton
+            )
+        )
+    );
+    return item;
+}
+
+function cartProducts() {
+    return getCart().map(productById).filter(Boolean);
+}
+
+/* ---------- pages ---------- */
+
+function loginPage(initialError) {
+    const username = h("input", {
+        class: "input_error form_input",
+        placeholder: "Username",
+        type: "text",
+        "data-test": "username",
+        id: "user-name",
+        name: "user-name",
+        autocorrect: "off",
+        autocapitalize: "none",
+    });
+    const password = h("input", {
+        class: "input_error form_input",
+        placeholder: "Password",
+        type: "password",
+        "data-test": "password",
+        id: "password",
+        name: "password",
+        autocorrect: "off",
+        autocapitalize: "none",
+    });
+    const errors = errorBox();
+    if (initialError) {
+        errors.show(initialError);
+    }
+
+    const submit = (event) => {
+        event.preventDefault();
+        const user = username.value;
+        if (!user) {
+            return errors.show("Epic sadface: Username is required");
+        }
+        if (!password.value) {
+            return errors.show("Epic sadface: Password is required");
+        }
+        if (!USERS.includes(user) || password.value !== PASSWORD) {
+            return errors.show(
+                "Epic sadface: Username and password do not match any user in this service"
+            );
+        }
+        if (user === "locked_out_user") {
+            return errors.show("Epic sadface: Sorry, this user has been locked out.");
+        }
+        document.cookie = `${SESSION_COOKIE}=${user}; path=/; max-age=600`;
+        navigate("/inventory.html");
+    };
+
+    return h(
+        "div",
+        {class: "login_container"},
+        h("div", {class: "login_logo"}, "Swag Labs"),
+        h(
+            "div",
+            {class: "login_wrapper"},
+            h(
+                "form",
+                {onsubmit: submit},
+                username,
+                password,
+                errors,
+                h("input", {
+                    type: "submit",
+                    class: "submit-button btn_action",
+                    "data-test": "login-button",
+                    id: "login-button",
+                    name: "login-button",
+                    value: "Login",
+                })
+            )
+        )
+    );
+}
+
+function inventoryPage() {
+    const items = PRODUCTS.map((product) =>
+        h(
+            "div",
+            {class: "inventory_item", "data-test": "inventory-item"},
+            h(
+                "div",
+                {class: "inventory_item_description", "data-test": "inventory-item-description"},
+                h(
+                    "div",
+                    {class: "inventory_item_label"},
+                    h(
+                        "a",
+                        {
+                            href: "#",
+                            id: `item_${product.id}_title_link`,
+                            "data-test": `item-${product.id}-title-link`,
+                        },
+                        h("div", {class: "inventory_item_name ", "data-test": "inventory-item-name"}, product.name)
+                    ),
+                    h("div", {class: "inventory_item_desc", "data-test": "inventory-item-desc"}, product.desc)
+                ),
+                h(
+                    "div",
+                    {class: "pricebar"},
+                    h("div", {class: "inventory_item_price", "data-test": "inventory-item-price"}, formatPrice(product.price)),
+                    inventoryButton(product)
+                )
+            )
+        )
+    );
+    return h(
+        "div",
+        {id: "inventory_container"},
+        header("Products"),
+        h("div", {class: "inventory_list", "data-test": "inventory-list"}, ...items)
+    );
+}
+
+function cartPage() {
+    return h(
+        "div",
+        {id: "cart_contents_container"},
+        header("Your Cart"),
+        h(
+            "div",
+            {class: "cart_list", "data-test": "cart-list"},
+            h("div", {class: "cart_quantity_label", "data-test": "cart-quantity-label"}, "QTY"),
+            h("div", {class: "cart_desc_label", "data-test": "cart-desc-label"}, "Description"),
+            ...cartProducts().map((product) => cartItem(product, true))
+        ),
+        h(
+            "div",
+            {class: "cart_footer"},
+            h("button", {
+                class: "btn btn_secondary back btn_medium",
+                "data-test": "continue-shopping",
+                id: "continue-shopping",
+                name: "continue-shopping",
+                type: "button",
+                onclick: () => navigate("/inventory.html"),
+            }, "Continue Shopping"),
+            h("button", {
+                class: "btn btn_action btn_medium checkout_button ",
+                "data-test": "checkout",
+                id: "checkout",
+                name: "checkout",
+                type: "button",
+                onclick: () => navigate("/checkout-step-one.html"),
+            }, "Checkout")
+        )
+    );
+}
+
+function checkoutInformationPage() {
+    const input = (placeholder, id, dataTest) =>
+        h("input", {
+            class: "input_error form_input",
+            placeholder: placeholder,
+            type: "text",
+            "data-test": dataTest,
+            id: id,
+            name: id,
+            autocorrect: "off",
+            autocapitalize: "none",
+        });
+    const firstName = input("First Name", "first-name", "firstName");
+    const lastName = input("Last Name", "last-name", "lastName");
+    const postalCode = input("Zip/Postal Code", "postal-code", "postalCode");
+    const errors = errorBox();
+
+    const submit = (event) => {
+        event.preventDefault();
+        if (!firstName.value) {
+            return errors.show("Error: First Name is required");
+        }
+        if (!lastName.value) {
+            return errors.show("Error: Last Name is required");
+        }
+        if (!postalCode.value) {
+            return errors.show("Error: Postal Code is required");
+        }
+        navigate("/checkout-step-two.html");
+    };
+
+    return h(
+        "div",
+        {id: "checkout_info_container"},
+        header("Checkout: Your Information"),
+        h(
+            "div",
+            {class: "checkout_info_wrapper"},
+            h(
+                "form",
+                {onsubmit: submit},
+                h("div", {class: "checkout_info", "data-test": "checkout-info-container"}, firstName, lastName, postalCode, errors),
+                h(
+                    "div",
+                    {class: "checkout_buttons"},
+                    h("button", {
+                        class: "btn btn_secondary back btn_medium cart_cancel_link",
+                        "data-test": "cancel",
+                        id: "cancel",
+                        name: "cancel",
+                        type: "button",
+                        onclick: () => navigate("/cart.html"),
+                    }, "Cancel"),
+                    h("input", {
+                        type: "submit",
+                        class: "submit-button btn btn_primary cart_button btn_action",
+                        "data-test": "continue",
+                        id: "continue",
+                        name: "continue",
+                        value: "Continue",
+                    })
+                )
+            )
+        )
+    );
+}
+
+function checkoutOverviewPage() {
+    const products = cartProducts();
+    const subtotal = Math.round(products.reduce((sum, product) => sum + product.price * 100, 0)) / 100;
+    const tax = Number((subtotal * TAX_RATE).toFixed(2));
+    const total = subtotal + tax;
+
+    return h(
+        "div",
+        {id: "checkout_summary_container"},
+        header("Checkout: Overview"),
+        h(
+            "div",
+            {class: "cart_list", "data-test": "cart-list"},
+            h("div", {class: "cart_quantity_label"}, "QTY"),
+            h("div", {class: "cart_desc_label"}, "Description"),
+            ...products.map((product) => cartItem(product, false))
+        ),
+        h(
+            "div",
+            {class: "summary_info", "data-test": "summary-info"},
+            h("div", {class: "summary_subtotal_label", "data-test": "subtotal-label"}, "Item total: " + formatPrice(subtotal)),
+            h("div", {class: "summary_tax_label", "data-test": "tax-label"}, "Tax: " + formatPrice(tax)),
+            h("div", {class: "summary_total_label", "data-test": "total-label"}, "Total: " + formatPrice(total)),
+            h(
+                "div",
+                {class: "cart_footer"},
+                h("button", {
+                    class: "btn btn_secondary back btn_medium cart_cancel_link",
+                    "data-test": "cancel",
+                    id: "cancel",
+                    name: "cancel",
+                    type: "button",
+                    onclick: () => navigate("/inventory.html"),
+                }, "Cancel"),
+                h("button", {
+                    class: "btn btn_action btn_medium cart_button",
+                    "data-test": "finish",
+                    id: "finish",
+                    name: "finish",
+                    type: "button",
+                    onclick: () => {
+                        setCart([]);
+                        navigate("/checkout-complete.html");
+                    },
+                }, "Finish")
+            )
+        )
+    );
+}
+
+function checkoutCompletePage() {
+    return h(
+        "div",
+        {id: "checkout_complete_container", class: "checkout_complete_container"},
+        header("Checkout: Complete!"),
+        h("h2", {class: "complete-header", "data-test": "complete-header"}, "Thank you for your order!"),
+        h(
+            "div",
+            {class: "complete-text", "data-test": "complete-text"},
+            "Your order has been dispatched, and will arrive just as fast as the pony can get there!"
+        ),
+        h("button", {
+            class: "btn btn_primary btn_small",
+            "data-test": "back-to-products",
+            id: "back-to-products",
+            name: "back-to-products",
+            type: "button",
+            onclick: () => navigate("/inventory.html"),
+        }, "Back Home")
+    );
+}
+
+/* ---------- routing ---------- */
+
+const ROUTES = {
+    "/": loginPage,
+    "/index.html": loginPage,
+    "/inventory.html": inventoryPage,
+    "/cart.html": cartPage,
+    "/checkout-step-one.html": checkoutInformationPage,
+    "/checkout-step-two.html": checkoutOverviewPage,
+    "/checkout-complete.html": checkoutCompletePage,
+};
+
+function render() {
+    const root = document.getElementById("root");
+    const path = window.location.pathname;
+    const page = ROUTES[path] || loginPage;
+
+    if (page !== loginPage && !loggedIn()) {
+        window.history.replaceState({}, "", "/");
+        root.replaceChildren(
+            loginPage(`Epic sadface: You can only access '${path}' when you are logged in.`)
+        );
+        return;
+    }
+    root.replaceChildren(page());
+}
+
+window.addEventListener("popstate", render);
+render();
@@ -0,0 +1,357 @@
+"""
+This module routes a driver to any page of the site by the cheapest path.
+
+The pages are states of a graph, detected from the URL of the driver, and
+the ways to move between them (clicking a link, opening a URL, seeding the
+cart, logging in) are transitions with a known cost. Asked for a page, and
+optionally for the products in the cart, the navigator finds the cheapest
+route from where the driver already is, so a test reuses the browser state
+left by its setup instead of replaying the whole login to checkout chain.
+
+Costs are in WebDriver commands, a page load counting as PAGE_LOAD commands:
+the site is a single page app, a click moves between pages without loading
+the app again while driver.get does.
+
+Usage:
+    navigator = Navigator(driver, auth_state)
+    navigator.ensure("checkout-step-two", items=3)
+"""
+
+import heapq
+import random
+from collections import defaultdict, namedtuple
+from urllib.parse import urljoin, urlsplit
+
+import allure
+
+from locators.cart_products_locators import CartProductsLocators
+from locators.checkout_locators import CheckoutLocators
+from locators.login_locators import LoginLocators
+from locators.product_locators import ProductLocators
+from page_objects.base_page import BasePage
+from page_objects.cart_page import CartPage
+from page_objects.checkout_complete_page import CheckoutCompletePage
+from page_objects.checkout_information_page import CheckoutInformationPage
+from page_objects.checkout_overview_page import CheckoutOverviewPage
+from page_objects.login_page import LoginPage
+from page_objects.product_page import ProductPage
+from utilities.cart_state import SEED_PAGES, CartSeeder
+from utilities.config import FIRST_NAME, LAST_NAME, ZIP_CODE, settings
+from utilities.random_web_element_func import sample_seed
+from utilities.wait_utilities import WaitUtilities
+
+# Cost of a page load, in WebDriver commands
+PAGE_LOAD = 5
+
+# Any page outside the site, e.g. the about:blank of a fresh driver
+BLANK = "blank"
+
+State = namedtuple("State", "name path ready_locator")
+
+# What a transition does to the cart: keep it, fill it with the wanted
+# products, or leave it empty (a finished order, a freshly injected session)
+KEEP, SEED, EMPTY = "keep", "seed", "empty"
+
+Transition = namedtuple("Transition", "source target cost action cart")
+
+STATES = {}
+TRANSITIONS = defaultdict(list)
+
+
+class NavigationError(AssertionError):
+    """The driver did not end up on the requested page with the requested cart"""
+
+
+def register_state(name: str, path: str, ready_locator: tuple):
+    """
+    Add a page to the graph
+
+    Args:
+        name: Name of the state
+        path: URL path of the page, relative to the login URL
+        ready_locator: Locator of an element present once the page is ready
+    """
+    STATES[name] = State(name, path, ready_locator)
+
+
+def add_transition(sources, target: str, cost: int, action, cart: str = KEEP):
+    """
+    Add a way to move to a page
+
+    Args:
+        sources: Names of the states the transition starts from
+        target: Name of the state it leads to
+        cost: Cost in WebDriver commands
+        action: Function taking the navigator and the target state
+        cart: KEEP, SEED or EMPTY
+    """
+    for source in sources:
+        TRANSITIONS[source].append(Transition(source, target, cost, action, cart))
+
+
+register_state("login", "", LoginLocators.LOGIN_BUTTON)
+register_state("products", "inventory.html", ProductLocators.APP_LOGO)
+register_state("cart", "cart.html", CartProductsLocators.CART_PRODUCTS_TITLE)
+register_state(
+    "checkout-step-one",
+    "checkout-step-one.html",
+    CheckoutLocators.CHECKOUT_PAGE_INFORMATION_TITLE,
+)
+register_state(
+    "checkout-step-two",
+    "checkout-step-two.html",
+    CheckoutLocators.CHECKOUT_PAGE_OVERVIEW_TITLE,
+)
+register_state(
+    "checkout-complete",
+    "checkout-complete.html",
+    CheckoutLocators.CHECKOUT_PAGE_COMPLETE_TITLE,
+)
+
+# Pages only reachable once logged in
+LOGGED_IN = [name for name in STATES if name != "login"]
+
+
+def _open(navigator, state: State):
+    """Load the page of a state"""
+    BasePage(navigator.driver).open(
+        urljoin(settings.login_url, state.path), state.ready_locator, name=state.name
+    )
+
+
+def _seed(navigator, state: State):
+    """Fill the cart with the wanted products and load the page of a state"""
+    navigator.seeder.seed(navigator.wanted_products(), page=state.name)
+
+
+def _log_in(navigator, state: State):
+    """Open the products page with the cached session, or through the login form"""
+    if navigator.auth_state is not None:
+        navigator.auth_state.apply(navigator.driver)
+        return
+    login_page = LoginPage(navigator.driver)
+    if navigator.current_state() != "login":
+        login_page.open_page()
+    login_page.enter_username(settings.username)
+    login_page.enter_password(settings.password)
+    login_page.click_login_button()
+    navigator.wait_for(state)
+
+
+def _clicking(page_class, method: str):
+    """Get an action calling a page object method and waiting for the next page"""
+
+    def action(navigator, state: State):
+        getattr(page_class(navigator.driver), method)()
+        navigator.wait_for(state)
+
+    return action
+
+
+def _submit_information(navigator, state: State):
+    """Fill the checkout information form with the configured customer"""
+    information_page = CheckoutInformationPage(navigator.driver)
+    information_page.fill_information_form(FIRST_NAME, LAST_NAME, ZIP_CODE)
+    information_page.click_continue_button()
+    navigator.wait_for(state)
+
+
+# The cached session replaces the storage of the site, the cart included
+add_transition([BLANK, "login"], "products", PAGE_LOAD + 3, _log_in, cart=EMPTY)
+add_transition([BLANK] + LOGGED_IN, "login", PAGE_LOAD + 1, _open)
+for _target in LOGGED_IN:
+    add_transition(LOGGED_IN, _target, PAGE_LOAD + 1, _open)
+for _target in SEED_PAGES:
+    add_transition(LOGGED_IN, _target, PAGE_LOAD + 3, _seed, cart=SEED)
+# The cart link is in the header of every page once logged in
+add_transition(LOGGED_IN, "cart", 3, _clicking(ProductPage, "navigate_to_cart_page"))
+add_transition(
+    ["cart"], "checkout-step-one", 3, _clicking(CartPage, "click_checkout_button")
+)
+add_transition(["checkout-step-one"], "checkout-step-two", 9, _submit_information)
+add_transition(
+    ["checkout-step-two"],
+    "checkout-complete",
+    3,
+    _clicking(CheckoutOverviewPage, "click_finish_button"),
+    cart=EMPTY,
+)
+add_transition(
+    ["checkout-complete"],
+    "products",
+    3,
+    _clicking(CheckoutCompletePage, "click_back_home_button"),
+)
+
+
+class Navigator:
+    """Move a driver to a page of the site by the cheapest route"""
+
+    def __init__(self, driver, auth_state=None):
+        """
+        Initialize the navigator
+
+        Args:
+            driver: WebDriver instance
+            auth_state: AuthStateCache logging in without the login form, the
+                login form is used when None
+        """
+        self.driver = driver
+        self.auth_state = auth_state
+        self.seeder = CartSeeder(driver)
+        self._products = None
+        self._items = None
+
+    def current_state(self) -> str:
+        """Get the state of the page the driver is on, BLANK outside the site"""
+        url = urlsplit(self.driver.current_url)
+        site = urlsplit(settings.login_url)
+        if url.netloc != site.netloc:
+            return BLANK
+        path = url.path[len(site.path) :] if url.path.startswith(site.path) else ""
+        for state in STATES.values():
+            if path == state.path:
+                return state.name
+        return "login" if path == "index.html" else BLANK
+
+    def wait_for(self, state: State):
+        """Wait until the page of a state is ready"""
+        WaitUtilities(self.driver).wait_for_element(
+            state.ready_locator, name=state.name
+        )
+
+    def wanted_products(self) -> list:
+        """Get the names of the products the cart must hold"""
+        if self._products is None:
+            generator = random.Random(sample_seed(name="Cart products seed"))
+            self._products = generator.sample(list(self.seeder.catalog()), self._items)
+        return self._products
+
+    def _cart_matches(self, contents: list) -> bool:
+        """Tell whether cart contents, as product ids, are the wanted ones"""
+        if self._products is not None:
+            return sorted(contents) == sorted(self.seeder.cart_ids(self._products))
+        return self._items is None or len(contents) == self._items
+
+    def route(self, target: str, items: int = None, products: list = None) -> list:
+        """
+        Find the cheapest route to a page
+
+        Args:
+            target: Name of the state to reach
+            items: Number of products the cart must hold, any when None
+            products: Names of the products the cart must hold, instead of items
+
+        Returns:
+            list: Transitions to follow, empty when the driver is already there
+
+        Raises:
+            NavigationError: If no route reaches the page with that cart
+        """
+        self._products = list(products) if products is not None else None
+        self._items = len(products) if products is not None else items
+        wants_cart = self._items is not None
+
+        source = self.current_state()
+        if source == BLANK:
+            cart_ok = not wants_cart
+        else:
+            cart_ok = self._cart_matches(self.seeder.read_cart()["contents"])
+
+        # Dijkstra over (state, whether the cart is the wanted one)
+        start = (source, cart_ok)
+        costs = {start: 0}
+        previous = {}
+        queue = [(0, source, cart_ok)]
+        while queue:
+            cost, state, cart_ok = heapq.heappop(queue)
+            if state == target and cart_ok:
+                return self._path(previous, (state, cart_ok))
+            if cost > costs[(state, cart_ok)]:
+                continue
+            for transition in TRANSITIONS[state]:
+                if transition.cart == SEED and not wants_cart:
+                    continue
+                reached = (transition.target, self._cart_after(transition, cart_ok))
+                reached_cost = cost + transition.cost
+                if reached_cost < costs.get(reached, float("inf")):
+                    costs[reached] = reached_cost
+                    previous[reached] = ((state, cart_ok), transition)
+                    heapq.heappush(queue, (reached_cost, *reached))
+        raise NavigationError(f"No route from {source} to {target} with that cart")
+
+    def _cart_after(self, transition: Transition, cart_ok: bool) -> bool:
+        """Tell whether the cart is the wanted one after a transition"""
+        if transition.cart == SEED:
+            return True
+        if transition.cart == EMPTY:
+            return self._items is None or self._items == 0
+        return cart_ok
+
+    @staticmethod
+    def _path(previous: dict, node: tuple) -> list:
+        """Rebuild the transitions leading to a node"""
+        path = []
+        while node in previous:
+            node, transition = previous[node]
+            path.append(transition)
+        return path[::-1]
+
+    def ensure(self, target: str, items: int = None, products: list = None) -> list:
+        """
+        Bring the driver to a page, with the given products in the cart
+
+        Args:
+            target: Name of the state to reach
+            items: Number of products the cart must hold, random ones are
+                seeded if needed. Any number when None
+            products: Names of the products the cart must hold, instead of items
+
+        Returns:
+            list: Names of the states the driver went through
+
+        Raises:
+            NavigationError: If the driver did not end up on the page with the
+                requested cart
+        """
+        path = self.route(target, items, products)
+        if not path:
+            # Already there, the page may still be rendering after a click
+            self.wait_for(STATES[target])
+        for transition in path:
+            with allure.step(
+                f"Navigate from {transition.source} to {transition.target}"
+            ):
+                transition.action(self, STATES[transition.target])
+
+        reached = self.current_state()
+        if reached != target:
+            raise NavigationError(f"Navigated to {target}, the driver is on {reached}")
+        if self._items is not None:
+            contents = self.seeder.read_cart()["contents"]
+            if not self._cart_matches(contents):
+                raise NavigationError(
+                    f"Navigated to {target} with cart {contents}, wanted"
+                    f" {self._products or self._items}"
+                )
+        return [transition.target for transition in path]
+
+    def advance_checkout(self, products: list = None, complete: bool = False):
+        """
+        Bring the checkout to the overview page, or to the complete page
+
+        Shared by the checkout tests and the checkout benchmark flow.
+
+        Args:
+            products: Names of the products the overview must list, the cart
+                is kept as it is when None
+            complete: Finish the order and stop on the complete page
+
+        Returns:
+            The page object of the page reached
+        """
+        if complete:
+            self.ensure("checkout-complete")
+            return CheckoutCompletePage(self.driver)
+        self.ensure("checkout-step-two", products=products)
+        return CheckoutOverviewPage(self.driver)
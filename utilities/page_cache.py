@@ -0,0 +1,151 @@
+"""
+This module contains an opt-in memoization layer for read-only page object
+getters.
+
+Values are cached per driver and per page state. The cache is invalidated when
+a page object method that clicks, types or navigates is called, when a helper
+of utilities loads a page, and when the document changes: the URL check also
+reads performance.timeOrigin, which is new for every loaded document, so
+loading the same URL again is detected too.
+
+Usage:
+    cache = enable_page_cache(driver)
+    ...
+    print(cache.stats())
+"""
+
+import copy
+import functools
+import weakref
+
+# Page state caches of the drivers that opted in
+_caches = weakref.WeakKeyDictionary()
+
+# URL and load time of the current document, one round trip like current_url
+DOCUMENT_STATE_SCRIPT = "return window.location.href + ' ' + performance.timeOrigin;"
+
+
+class PageStateCache:
+    """Cache of getter results for the current state of one driver"""
+
+    def __init__(self, driver, track_url: bool = True):
+        """
+        Initialize the page state cache
+
+        Args:
+            driver: WebDriver instance
+            track_url: Check the URL and document before each lookup and
+                invalidate the cache when they changed. Costs one round trip
+                per lookup, without it only page object methods and
+                invalidate_page_cache invalidate the cache
+        """
+        self._driver = weakref.ref(driver)
+        self.track_url = track_url
+        self._values = {}
+        self._document = None
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, key, compute):
+        """
+        Get a cached value, computing it on a miss
+
+        Args:
+            key: Hashable key of the getter call
+            compute: Callable returning the value on a miss
+        """
+        if self.track_url:
+            document = self._driver().execute_script(DOCUMENT_STATE_SCRIPT)
+            if document != self._document:
+                self.invalidate()
+                self._document = document
+
+        if key in self._values:
+            self.hits += 1
+        else:
+            self.misses += 1
+            self._values[key] = compute()
+        # Getters return plain data, callers may mutate nested lists and dicts
+        return copy.deepcopy(self._values[key])
+
+    def invalidate(self):
+        """Forget every cached value"""
+        if self._values:
+            self.invalidations += 1
+        self._values.clear()
+
+    def stats(self) -> dict:
+        """Get the hit, miss and invalidation counters"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+        }
+
+
+def enable_page_cache(driver, track_url: bool = True) -> PageStateCache:
+    """Enable the page state cache for a driver and return it"""
+    cache = _caches.get(driver)
+    if cache is None:
+        cache = _caches[driver] = PageStateCache(driver, track_url)
+    return cache
+
+
+def disable_page_cache(driver):
+    """
+    Disable the page state cache for a driver
+
+    Returns:
+        PageStateCache: The cache that was enabled, None if there was none
+    """
+    return _caches.pop(driver, None)
+
+
+def get_page_cache(driver):
+    """Get the page state cache of a driver, None if it did not opt in"""
+    return _caches.get(driver)
+
+
+def invalidate_page_cache(driver):
+    """Forget the cached values of a driver, after it loaded a page by itself"""
+    cache = _caches.get(driver)
+    if cache is not None:
+        cache.invalidate()
+
+
+def cached_getter(method):
+    """Cache the result of a read-only page object method"""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        cache = _caches.get(self.driver)
+        if cache is None:
+            return method(self, *args, **kwargs)
+        key = (type(self).__name__, method.__name__, args, tuple(kwargs.items()))
+        return cache.get(key, lambda: method(self, *args, **kwargs))
+
+    return wrapper
+
+
+def invalidates_cache(method):
+    """
+    Invalidate the page state cache after a method that changes the page
+
+    The element cache of the page object is cleared as well, since the same
+    locator may match another element once the page changed.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            cache = _caches.get(self.driver)
+            if cache is not None:
+                cache.invalidate()
+            elements = getattr(self, "elements", None)
+            if elements is not None:
+                elements.clear()
+
+    return wrapper
@@ -0,0 +1,313 @@
+"""
+This module runs the test suite sharded across several worker processes.
+
+Each worker is a separate pytest process with its own driver pool, so every
+worker owns its own browser. The allure results written by the workers are
+merged into a single allure-results directory once all of them finish.
+
+Usage:
+    python -m utilities.parallel_runner -n 4 [pytest args...]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import uuid
+
+from utilities.config import CHAIN_GROUPS_ENV, LOCAL_SITE_HOST, WORKER_ID_ENV, settings
+from utilities.scheduler import load_durations, lpt_schedule, schedule_units
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_RESULTS_DIR = os.path.join(PROJECT_ROOT, "allure-results")
+
+# pytest exit code when the arguments select no test
+NO_TESTS_COLLECTED = 5
+
+
+def collect_tests(pytest_args: list) -> tuple:
+    """
+    Collect the node ids of the tests selected by the given pytest arguments
+
+    Args:
+        pytest_args: Extra arguments passed to pytest (paths, -k, -m...)
+
+    Returns:
+        tuple: Node ids in collection order, and the setup chain of the tests
+            declaring one, by node id (see utilities.setup_chain)
+
+    Raises:
+        RuntimeError: If pytest fails to collect the tests
+    """
+    descriptor, groups_file = tempfile.mkstemp(suffix=".json", prefix="chains-")
+    os.close(descriptor)
+    try:
+        completed = subprocess.run(
+            [sys.executable, "-m", "pytest", "--collect-only", "-q", *pytest_args],
+            cwd=PROJECT_ROOT,
+            env=dict(os.environ, **{CHAIN_GROUPS_ENV: groups_file}),
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        if completed.returncode not in (0, NO_TESTS_COLLECTED):
+            # A collection error would otherwise run a partial shard set that
+            # looks green
+            raise RuntimeError(
+                f"Collecting the tests failed with exit code {completed.returncode}:"
+                f"\n{completed.stdout}{completed.stderr}"
+            )
+        with open(groups_file, encoding="utf-8") as file:
+            content = file.read()
+    finally:
+        os.remove(groups_file)
+    node_ids = [line.strip() for line in completed.stdout.splitlines() if "::" in line]
+    groups = {
+        node_id: tuple(chain) for node_id, chain in json.loads(content or "{}").items()
+    }
+    return node_ids, groups
+
+
+def worker_options(pytest_args: list) -> list:
+    """
+    Get the pytest arguments every worker runs with
+
+    The paths and node ids selecting the tests are left out, the workers get
+    their shard of node ids instead. Every option (-x, -s, --tb, -o, -W, -p,
+    -k, -m...) and its value is kept.
+
+    Args:
+        pytest_args: Extra arguments passed to pytest
+    """
+    return [
+        arg
+        for arg in pytest_args
+        if arg.startswith("-")
+        or not os.path.exists(os.path.join(PROJECT_ROOT, arg.split("::", 1)[0]))
+    ]
+
+
+def shard_tests(
+    node_ids: list, workers: int, durations: dict = None, groups: dict = None
+) -> list:
+    """
+    Split the tests into one shard per worker
+
+    With historical durations the tests are balanced longest processing time
+    first (see utilities.scheduler), otherwise they are dealt round robin. The
+    tests of a setup chain always go to the same worker.
+
+    Args:
+        node_ids: Node ids of the tests to run
+        workers: Number of worker processes
+        durations: Historical durations by node id, see load_durations
+        groups: Setup chain by node id, see collect_tests
+
+    Returns:
+        list: One list of node ids per worker, empty shards removed
+    """
+    if durations is not None:
+        return lpt_schedule(node_ids, workers, durations, groups)
+    shards = [[] for _ in range(workers)]
+    for index, unit in enumerate(schedule_units(node_ids, groups)):
+        shards[index % workers].extend(unit)
+    return [shard for shard in shards if shard]
+
+
+def start_worker(
+    worker_id: str, node_ids: list, results_dir: str, log_file, options: list = ()
+):
+    """
+    Start a pytest process running the given node ids
+
+    Args:
+        worker_id: Id of the worker, set in its environment
+        node_ids: Node ids of the tests of its shard
+        results_dir: Allure results directory of the worker
+        log_file: File receiving the output of the worker
+        options: pytest options of the run, see worker_options
+    """
+    args_file = f"{results_dir}.args"
+    with open(args_file, "w", encoding="utf-8") as file:
+        file.write("\n".join(node_ids))
+
+    env = dict(os.environ, **{WORKER_ID_ENV: worker_id})
+    return subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "pytest",
+            "-p",
+            "no:cacheprovider",
+            f"--alluredir={results_dir}",
+            *options,
+            f"@{args_file}",
+        ],
+        cwd=PROJECT_ROOT,
+        env=env,
+        stdout=log_file,
+        stderr=subprocess.STDOUT,
+    )
+
+
+def _existing_uuids(results_dir: str) -> set:
+    """Read the uuids of the results and containers already in a directory"""
+    uuids = set()
+    for name in os.listdir(results_dir):
+        if name.endswith(("-result.json", "-container.json")):
+            with open(os.path.join(results_dir, name), encoding="utf-8") as file:
+                uuids.add(json.load(file).get("uuid"))
+    return uuids
+
+
+def merge_results(source_dirs: list, target_dir: str):
+    """
+    Merge allure results from several directories into one
+
+    Files whose name already exists in the target get a fresh uuid prefix, and
+    results or containers whose uuid is already taken get a fresh uuid. The
+    references to renamed files and uuids are rewritten in the merged JSON.
+    Results store logs (see utilities.results_store) are appended instead.
+
+    Args:
+        source_dirs: Allure results directories written by the workers
+        target_dir: Directory receiving the merged results
+    """
+    os.makedirs(target_dir, exist_ok=True)
+    taken_names = set(os.listdir(target_dir))
+    taken_uuids = _existing_uuids(target_dir)
+
+    for source_dir in source_dirs:
+        names = os.listdir(source_dir)
+        replacements = {}
+
+        for name in names:
+            if name in taken_names:
+                # Allure file names are "<uuid>-<kind>.<ext>", keep the kind
+                suffix = name.split("-", 5)[-1]
+                replacements[name] = f"{uuid.uuid4()}-{suffix}"
+            if name.endswith(("-result.json", "-container.json")):
+                with open(os.path.join(source_dir, name), encoding="utf-8") as file:
+                    item_uuid = json.load(file).get("uuid")
+                if item_uuid in taken_uuids:
+                    replacements[item_uuid] = str(uuid.uuid4())
+                taken_uuids.add(replacements.get(item_uuid, item_uuid))
+
+        for name in names:
+            source = os.path.join(source_dir, name)
+            if name.endswith(".jsonl.gz"):
+                # Results store logs are gzip streams, a copy of the same
+                # worker from an earlier run is appended to as a new member
+                with open(source, "rb") as log, open(
+                    os.path.join(target_dir, name), "ab"
+                ) as merged:
+                    shutil.copyfileobj(log, merged)
+                taken_names.add(name)
+                continue
+            target_name = replacements.get(name, name)
+            target = os.path.join(target_dir, target_name)
+            if name.endswith(".json") and replacements:
+                with open(source, encoding="utf-8") as file:
+                    content = file.read()
+                for old, new in replacements.items():
+                    content = content.replace(old, new)
+                with open(target, "w", encoding="utf-8") as file:
+                    file.write(content)
+            else:
+                shutil.copy2(source, target)
+            taken_names.add(target_name)
+
+
+def run_parallel(
+    workers: int, pytest_args: list, results_dir: str, schedule: str = "duration"
+) -> int:
+    """
+    Run the suite sharded across worker processes
+
+    Args:
+        workers: Number of worker processes
+        pytest_args: Extra arguments passed to pytest
+        results_dir: Directory receiving the merged allure results
+        schedule: "duration" to balance the shards with the durations of the
+            results already in results_dir, "round-robin" to deal the tests
+
+    Returns:
+        int: Exit code, 0 if every worker passed
+
+    Raises:
+        RuntimeError: If pytest fails to collect the tests
+    """
+    node_ids, groups = collect_tests(pytest_args)
+    if not node_ids:
+        print("No tests collected")
+        return NO_TESTS_COLLECTED
+
+    if settings.site == "local":
+        # Serve the stand-in from the runner so it outlives every worker
+        from utilities.local_swag_labs import ensure_server
+
+        ensure_server(LOCAL_SITE_HOST, settings.local_site_port)
+
+    durations = load_durations(results_dir) if schedule == "duration" else None
+    shards = shard_tests(node_ids, workers, durations, groups)
+    print(f"Running {len(node_ids)} tests on {len(shards)} workers")
+
+    options = worker_options(pytest_args)
+    work_dir = tempfile.mkdtemp(prefix="parallel-run-")
+    try:
+        processes = []
+        for index, shard in enumerate(shards):
+            worker_id = f"gw{index}"
+            worker_dir = os.path.join(work_dir, worker_id)
+            os.makedirs(worker_dir)
+            log_file = open(os.path.join(work_dir, f"{worker_id}.log"), "w")
+            process = start_worker(worker_id, shard, worker_dir, log_file, options)
+            processes.append((worker_id, worker_dir, process, log_file))
+
+        exit_code = 0
+        for worker_id, _, process, log_file in processes:
+            return_code = process.wait()
+            log_file.close()
+            with open(log_file.name, encoding="utf-8", errors="replace") as file:
+                print(f"===== worker {worker_id} (exit code {return_code}) =====")
+                print(file.read())
+            exit_code = exit_code or return_code
+
+        merge_results([worker_dir for _, worker_dir, _, _ in processes], results_dir)
+        return exit_code
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def main(argv=None) -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "-n",
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="number of worker processes",
+    )
+    parser.add_argument(
+        "--alluredir",
+        default=DEFAULT_RESULTS_DIR,
+        help="directory receiving the merged allure results",
+    )
+    parser.add_argument(
+        "--schedule",
+        choices=["duration", "round-robin"],
+        default="duration",
+        help="balance the workers with the durations of earlier results",
+    )
+    args, pytest_args = parser.parse_known_args(argv)
+    return run_parallel(
+        max(args.workers, 1), pytest_args, args.alluredir, args.schedule
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
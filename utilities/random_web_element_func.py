@@ -1,29 +1,136 @@
 """
-This module contains a function to select a random web element or elements
-from a list of elements
+This module contains a sampler selecting random web elements inside the page.
+
+random_element_sample picks the elements in one script call, with a seeded
+mulberry32 generator, and returns their indices and the fields read from them
+instead of WebElement proxies. The selection is a partial Fisher-Yates shuffle
+over the indices, so its cost grows with the number of elements picked, not
+with the number of elements on the page. Passing the same seed picks the same
+elements again, to reproduce a failing selection.
+
+sample_seed gives the seed of every random selection of the suite (the
+products picked on the page, the products of a seeded cart), so that the
+product_sample_seed setting picks all of them again.
 """
 
 import random
-from selenium.webdriver.common.by import By
 
+import allure
+
+from utilities.config import settings
+
+# Pass as count to random_element_sample to get every element, in page order
+ALL = -1
+
+# Arguments: locator strategy and value, fields as {key: [by, value, attribute]},
+# count (null for a random one, ALL for every element) and seed
+SAMPLE_SCRIPT = """
+const [by, value, fields, count, seed] = arguments;
+
+function query(root, strategy, selector) {
+    if (strategy === "xpath") {
+        return document.evaluate(
+            selector, root, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+        ).singleNodeValue;
+    }
+    return root.querySelector(selector);
+}
+
+function queryAll(strategy, selector) {
+    if (strategy === "xpath") {
+        const result = document.evaluate(
+            selector, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null
+        );
+        return {length: result.snapshotLength, item: (i) => result.snapshotItem(i)};
+    }
+    return document.querySelectorAll(selector);
+}
+
+// mulberry32, a small seeded generator returning floats in [0, 1)
+let state = seed >>> 0;
+function next() {
+    state = (state + 0x6D2B79F5) >>> 0;
+    let t = state;
+    t = Math.imul(t ^ (t >>> 15), t | 1);
+    t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+}
+
+const elements = queryAll(by, value);
+const total = elements.length;
+let indices = [];
+if (count === -1) {
+    indices = Array.from({length: total}, (_, i) => i);
+} else if (total > 0) {
+    const wanted = count === null
+        ? 1 + Math.floor(next() * total)
+        : Math.min(count, total);
+    // Partial Fisher-Yates, only the swapped positions are stored
+    const swapped = new Map();
+    for (let i = 0; i < wanted; i++) {
+        const j = i + Math.floor(next() * (total - i));
+        const atI = swapped.has(i) ? swapped.get(i) : i;
+        const atJ = swapped.has(j) ? swapped.get(j) : j;
+        swapped.set(j, atI);
+        indices.push(atJ);
+    }
+}
 
-def random_web_element(driver, locator):
+return indices.map((index) => {
+    const element = elements.item(index);
+    const sample = {index: index};
+    for (const [key, [strategy, selector, attribute]] of Object.entries(fields)) {
+        const field = query(element, strategy, selector);
+        sample[key] = !field ? null
+            : attribute ? field.getAttribute(attribute) : field.textContent.trim();
+    }
+    return sample;
+});
+"""
+
+
+def sample_seed(seed: int = None, name: str = "Product sample seed") -> int:
     """
-    Select a random web element from a list of web elements
+    Get the seed of a random selection and attach it to the Allure report
 
     Args:
-        driver: WebDriver instance
-        locator: Tuple of locator strategy and value (e.g., (By.ID, "my-id"))
+        seed: Seed to use, the product_sample_seed setting or a random one
+            when None
+        name: Name of the Allure attachment
 
+    Returns:
+        int: The seed
     """
-    elements = driver.find_elements(*locator)
-    total_elements = len(elements)
+    if seed is None:
+        seed = settings.product_sample_seed
+    if seed is None:
+        seed = random.getrandbits(32)
+    allure.attach(str(seed), name=name, attachment_type=allure.attachment_type.TEXT)
+    return seed
 
-    # If there are no elements, return an empty list
-    if total_elements == 0:
-        return []
 
-    # Generate a random number between 1 and total_elements
-    random_count = random.randint(1, total_elements)
+def random_element_sample(
+    driver, locator, fields: dict = None, count: int = None, seed: int = None
+) -> list:
+    """
+    Select random elements inside the page, in a single script call
 
-    return random.sample(elements, random_count)
+    Args:
+        driver: WebDriver instance
+        locator: Tuple of locator strategy and value of the elements
+        fields: Values to read from each selected element, as
+            {key: (strategy, value, attribute)}: the attribute of the first
+            match of the locator inside the element, or its text when the
+            attribute is None
+        count: Number of elements to select, a random number between 1 and
+            all of them when None, every element in page order when ALL
+        seed: Seed of the random generator, a random one when None
+
+    Returns:
+        list: One dict per selected element, in selection order, with its
+            "index" among the elements and the requested fields
+    """
+    if seed is None:
+        seed = random.getrandbits(32)
+    fields = {key: list(field) for key, field in (fields or {}).items()}
+    return driver.execute_script(SAMPLE_SCRIPT, *locator, fields, count, seed)
@@ -0,0 +1,299 @@
+"""
+This module contains a compact, streaming store for the allure results.
+
+allure-pytest writes one JSON file per test result, per fixture container and
+per attachment, so a parallel run creates thousands of small files. With the
+results_store setting set to "stream", the results are instead appended as
+JSON lines to one gzip log per worker in the allure results directory, and
+identical attachments (e.g. the same stdout captured by many tests) are stored
+once, by content hash.
+
+The log is expanded into the standard allure layout only when the report is
+opened:
+    python -m utilities.results_store expand allure-results
+    allure serve allure-results
+"""
+
+import argparse
+import base64
+import glob
+import gzip
+import hashlib
+import json
+import os
+import sys
+import threading
+import uuid
+import zlib
+
+from allure_commons import hookimpl
+from attr import asdict
+
+LOG_PATTERN = "results-{worker_id}.jsonl.gz"
+
+# zlib window bits of a gzip stream, with its header and trailer
+GZIP_WBITS = 31
+READ_CHUNK_SIZE = 1 << 16
+
+
+def install(config, worker_id: str):
+    """
+    Replace allure's file logger of a pytest session with a streaming logger
+
+    Does nothing when the session does not write allure results.
+
+    Args:
+        config: pytest config, after allure-pytest configured it
+        worker_id: Id of the worker, used in the log name
+    """
+    import allure_commons
+    from allure_commons.logger import AllureFileLogger
+
+    report_dir = config.option.allure_report_dir
+    if not report_dir:
+        return None
+    file_loggers = [
+        plugin
+        for plugin in allure_commons.plugin_manager.get_plugins()
+        if isinstance(plugin, AllureFileLogger)
+    ]
+    for file_logger in file_loggers:
+        allure_commons.plugin_manager.unregister(file_logger)
+
+    logger = StreamingResultsLogger(os.path.abspath(report_dir), worker_id)
+    allure_commons.plugin_manager.register(logger)
+
+    def clean_up():
+        allure_commons.plugin_manager.unregister(logger)
+        logger.close()
+        # allure-pytest unregisters its file logger in its own cleanup, which
+        # runs after this one and fails if the logger is not registered
+        for file_logger in file_loggers:
+            allure_commons.plugin_manager.register(file_logger)
+
+    config.add_cleanup(clean_up)
+    return logger
+
+
+def _as_dict(item) -> dict:
+    """Serialize an allure model item like allure's own file logger"""
+    return asdict(item, filter=lambda _, value: value or value is False)
+
+
+class StreamingResultsLogger:
+    """Allure logger appending the results of a worker to a gzip JSON lines log"""
+
+    def __init__(self, report_dir: str, worker_id: str):
+        """
+        Initialize the logger
+
+        Args:
+            report_dir: Allure results directory
+            worker_id: Id of the worker, used in the log name
+        """
+        os.makedirs(report_dir, exist_ok=True)
+        self.path = os.path.join(report_dir, LOG_PATTERN.format(worker_id=worker_id))
+        # Appending adds a gzip member, readers see one continuous stream
+        self._file = gzip.open(self.path, "at", encoding="utf-8")
+        self._stored_blobs = set()
+        self._lock = threading.Lock()
+
+    def _write(self, record: dict, flush: bool = False):
+        """Append a record to the log"""
+        with self._lock:
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            if flush:
+                self._file.flush()
+
+    def _attach(self, body: bytes, file_name: str):
+        """Record an attachment, storing its content only the first time it is seen"""
+        digest = hashlib.sha256(body).hexdigest()
+        with self._lock:
+            is_new = digest not in self._stored_blobs
+            self._stored_blobs.add(digest)
+        if is_new:
+            self._write(
+                {
+                    "kind": "blob",
+                    "sha256": digest,
+                    "data": base64.b64encode(body).decode("ascii"),
+                }
+            )
+        self._write({"kind": "attachment", "name": file_name, "sha256": digest})
+
+    @hookimpl
+    def report_result(self, result):
+        # A finished test is a natural point to make the log durable
+        self._write({"kind": "result", "data": _as_dict(result)}, flush=True)
+
+    @hookimpl
+    def report_container(self, container):
+        self._write({"kind": "container", "data": _as_dict(container)})
+
+    @hookimpl
+    def report_attached_file(self, source, file_name):
+        with open(source, "rb") as file:
+            self._attach(file.read(), file_name)
+
+    @hookimpl
+    def report_attached_data(self, body, file_name):
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        self._attach(body, file_name)
+
+    @hookimpl
+    def report_globals(self, globals_item):
+        self._write({"kind": "globals", "data": _as_dict(globals_item)})
+
+    def close(self):
+        """Close the log"""
+        with self._lock:
+            self._file.close()
+
+
+def read_records(path: str):
+    """Yield the records of a log, stopping at a record cut short by a crash"""
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        try:
+            for line in file:
+                yield json.loads(line)
+        except (EOFError, ValueError):
+            return
+
+
+def read_members(path: str, offset: int = 0):
+    """
+    Yield the records of a log from a byte offset, gzip member by member
+
+    Every logger appending to a log, and every merge of the parallel runner,
+    adds a new gzip member, so a reader that remembers where the last complete
+    member ended can resume there instead of decompressing the whole log.
+
+    Args:
+        path: Results store log
+        offset: Byte offset of the start of a member, 0 for the whole log
+
+    Yields:
+        tuple: ("record", record) for each record, and ("end", offset) once a
+            member is complete, offset being where the next member starts.
+            Stops at a member still being written or cut short by a crash
+    """
+    with open(path, "rb") as file:
+        file.seek(offset)
+        decompressor = zlib.decompressobj(wbits=GZIP_WBITS)
+        pending = b""
+        while True:
+            data = file.read(READ_CHUNK_SIZE)
+            if not data:
+                return
+            while data:
+                try:
+                    pending += decompressor.decompress(data)
+                except zlib.error:
+                    return
+                *lines, pending = pending.split(b"\n")
+                for line in lines:
+                    try:
+                        yield "record", json.loads(line)
+                    except ValueError:
+                        return
+                if not decompressor.eof:
+                    break
+                data = decompressor.unused_data
+                yield "end", file.tell() - len(data)
+                decompressor = zlib.decompressobj(wbits=GZIP_WBITS)
+
+
+def _rewrite_sources(item, sources: dict):
+    """Point the attachment sources of an item, steps included, to the stored files"""
+    if isinstance(item, dict):
+        source = item.get("source")
+        if isinstance(source, str) and source in sources:
+            item["source"] = sources[source]
+        for value in item.values():
+            _rewrite_sources(value, sources)
+    elif isinstance(item, list):
+        for value in item:
+            _rewrite_sources(value, sources)
+
+
+def _write_json(path: str, data: dict):
+    """Write a JSON file"""
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(data, file, ensure_ascii=False)
+
+
+def expand(report_dir: str, output_dir: str = None, remove_logs: bool = False):
+    """
+    Expand the logs of a results directory into the standard allure layout
+
+    Each distinct attachment is written once, named after its hash, and the
+    results reference it by that name.
+
+    Args:
+        report_dir: Allure results directory holding the logs
+        output_dir: Directory receiving the allure files, report_dir by default
+        remove_logs: Delete the logs once expanded
+
+    Returns:
+        int: Number of test results written
+    """
+    output_dir = output_dir or report_dir
+    os.makedirs(output_dir, exist_ok=True)
+    logs = sorted(
+        glob.glob(os.path.join(report_dir, LOG_PATTERN.format(worker_id="*")))
+    )
+
+    blobs = {}
+    sources = {}
+    items = []
+    for log in logs:
+        for record in read_records(log):
+            if record["kind"] == "blob":
+                blobs[record["sha256"]] = record["data"]
+            elif record["kind"] == "attachment":
+                extension = os.path.splitext(record["name"])[1]
+                sources[record["name"]] = f"{record['sha256']}-attachment{extension}"
+            else:
+                items.append(record)
+
+    for target in set(sources.values()):
+        digest = target.split("-", 1)[0]
+        with open(os.path.join(output_dir, target), "wb") as file:
+            file.write(base64.b64decode(blobs[digest]))
+
+    results = 0
+    for record in items:
+        data = record["data"]
+        _rewrite_sources(data, sources)
+        prefix = data.get("uuid") or str(uuid.uuid4())
+        _write_json(os.path.join(output_dir, f"{prefix}-{record['kind']}.json"), data)
+        results += record["kind"] == "result"
+
+    if remove_logs:
+        for log in logs:
+            os.remove(log)
+    return results
+
+
+def main(argv=None) -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    expand_parser = commands.add_parser(
+        "expand", help="write the standard allure files from the logs"
+    )
+    expand_parser.add_argument("report_dir")
+    expand_parser.add_argument("--output", help="defaults to the report directory")
+    expand_parser.add_argument(
+        "--remove-logs", action="store_true", help="delete the logs once expanded"
+    )
+    args = parser.parse_args(argv)
+
+    results = expand(args.report_dir, args.output, args.remove_logs)
+    print(f"Expanded {results} test results into {args.output or args.report_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
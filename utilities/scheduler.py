@@ -0,0 +1,190 @@
+"""
+This module schedules tests across parallel workers from their historical
+durations, to minimize the wall clock time of the whole run.
+
+Durations are read from the start/stop timestamps of the allure results of
+earlier runs (result files and results store logs) and mapped back to pytest
+node ids. Tests are assigned longest processing time first: each test, from
+the longest to the shortest, goes to the worker with the least work so far.
+Tests without history are estimated from the other parametrizations of the
+same test, then from the tests of the same module. Tests sharing a setup
+chain (see utilities.setup_chain) are scheduled together as one unit, so the
+chain is built once, by a single worker.
+"""
+
+import ast
+import fnmatch
+import heapq
+import json
+import os
+import statistics
+from collections import defaultdict
+
+from utilities.results_store import LOG_PATTERN, read_records
+
+# Estimate in seconds of a test when nothing is known about its module
+DEFAULT_ESTIMATE = 5.0
+
+
+def _label(result: dict, name: str) -> str:
+    """Get the value of an allure label of a result"""
+    for label in result.get("labels", []):
+        if label["name"] == name:
+            return label["value"]
+    return None
+
+
+def _parameter_id(value: str) -> str:
+    """Get the pytest id of an allure parameter value, None if it has none"""
+    try:
+        literal = ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        return None
+    if isinstance(literal, (str, int, float, bool)) or literal is None:
+        return str(literal)
+    return None
+
+
+def result_node_id(result: dict) -> tuple:
+    """
+    Map an allure result back to the pytest node id of its test
+
+    Returns:
+        tuple: The node id of the test function and, when the parameter ids
+            can be rebuilt, the full node id of the parametrization (or None)
+    """
+    package = _label(result, "package")
+    full_name = result.get("fullName")
+    if not package or not full_name or "#" not in full_name:
+        return None, None
+    owner, function = full_name.split("#", 1)
+    parts = [package.replace(".", "/") + ".py"]
+    if owner != package and owner.startswith(package + "."):
+        parts += owner[len(package) + 1 :].split(".")
+    parts.append(function)
+    function_id = "::".join(parts)
+
+    parameters = result.get("parameters", [])
+    if not parameters:
+        return function_id, function_id
+    ids = [_parameter_id(parameter.get("value", "")) for parameter in parameters]
+    if None in ids:
+        return function_id, None
+    return function_id, f"{function_id}[{'-'.join(ids)}]"
+
+
+def _read_results(results_dir: str):
+    """Yield the allure results of a directory, files and logs"""
+    log_pattern = LOG_PATTERN.format(worker_id="*")
+    for entry in os.scandir(results_dir):
+        if entry.name.endswith("-result.json"):
+            try:
+                with open(entry.path, encoding="utf-8") as file:
+                    yield json.load(file)
+            except (OSError, ValueError):
+                continue
+        elif fnmatch.fnmatch(entry.name, log_pattern):
+            for record in read_records(entry.path):
+                if record["kind"] == "result":
+                    yield record["data"]
+
+
+def load_durations(results_dir: str) -> dict:
+    """
+    Read the durations of the tests from earlier allure results
+
+    Args:
+        results_dir: Allure results directory
+
+    Returns:
+        dict: Durations in seconds by node id. Parametrized tests have an entry
+            per parametrization and one for the test function as a whole
+    """
+    durations = defaultdict(list)
+    if not os.path.isdir(results_dir):
+        return {}
+    for result in _read_results(results_dir):
+        start, stop = result.get("start"), result.get("stop")
+        if start is None or stop is None or result.get("status") == "skipped":
+            continue
+        function_id, node_id = result_node_id(result)
+        if function_id is None:
+            continue
+        seconds = (stop - start) / 1000
+        durations[function_id].append(seconds)
+        if node_id is not None and node_id != function_id:
+            durations[node_id].append(seconds)
+    return durations
+
+
+def estimate(node_id: str, durations: dict) -> float:
+    """
+    Estimate the duration of a test
+
+    Uses the median of its own history, else of its test function, else of
+    the tests of its module, else DEFAULT_ESTIMATE.
+    """
+    function_id = node_id.split("[", 1)[0]
+    for key in (node_id, function_id):
+        if durations.get(key):
+            return statistics.median(durations[key])
+    module = node_id.split("::", 1)[0]
+    module_samples = [
+        sample
+        for key, samples in durations.items()
+        if key.split("::", 1)[0] == module and "[" not in key
+        for sample in samples
+    ]
+    if module_samples:
+        return statistics.median(module_samples)
+    return DEFAULT_ESTIMATE
+
+
+def schedule_units(node_ids: list, groups: dict = None) -> list:
+    """
+    Group the tests that must run on the same worker
+
+    Args:
+        node_ids: Node ids of the tests to run
+        groups: Setup chain by node id, tests without an entry are on their own
+
+    Returns:
+        list: Lists of node ids, in collection order
+    """
+    groups = groups or {}
+    units = {}
+    for node_id in node_ids:
+        key = groups.get(node_id)
+        units.setdefault(node_id if key is None else key, []).append(node_id)
+    return list(units.values())
+
+
+def lpt_schedule(
+    node_ids: list, workers: int, durations: dict, groups: dict = None
+) -> list:
+    """
+    Assign tests to workers longest processing time first
+
+    Args:
+        node_ids: Node ids of the tests to run
+        workers: Number of worker processes
+        durations: Historical durations by node id, see load_durations
+        groups: Setup chain by node id, the tests of a chain are assigned
+            together with the sum of their estimates
+
+    Returns:
+        list: One list of node ids per worker, longest first, empty ones removed
+    """
+    units = [
+        (sum(estimate(node_id, durations) for node_id in unit), unit)
+        for unit in schedule_units(node_ids, groups)
+    ]
+    units.sort(key=lambda unit: unit[0], reverse=True)
+    # (assigned seconds, worker index), the least loaded worker on top
+    loads = [(0.0, index) for index in range(workers)]
+    shards = [[] for _ in range(workers)]
+    for seconds, unit in units:
+        load, index = heapq.heappop(loads)
+        shards[index].extend(unit)
+        heapq.heappush(loads, (load + seconds, index))
+    return [shard for shard in shards if shard]
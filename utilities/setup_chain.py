@@ -0,0 +1,162 @@
+"""
+This module shares the setup of tests that go through the same pages first.
+
+A test declares the pages its setup goes through with the setup_chain
+marker, e.g. @pytest.mark.setup_chain("checkout-step-one", "checkout-step-two").
+The tests are ordered as a depth first walk of the trie of their chains, so
+the tests sharing a prefix run one after the other. Each worker builds every
+prefix once: after each step the cookies, storage and URL of the browser are
+captured as a checkpoint, and later tests restore the deepest checkpoint of
+their chain and only run the steps left. Setup time then grows with the
+number of distinct states instead of the number of tests.
+"""
+
+import json
+import random
+
+from page_objects.base_page import BasePage
+from utilities.navigation import STATES
+from utilities.random_web_element_func import sample_seed
+
+MARKER = "setup_chain"
+
+READ_STATE_SCRIPT = """
+return {
+    local: Object.assign({}, window.localStorage),
+    session: Object.assign({}, window.sessionStorage)
+};
+"""
+
+WRITE_STATE_SCRIPT = """
+const state = arguments[0];
+window.localStorage.clear();
+window.sessionStorage.clear();
+for (const [key, value] of Object.entries(state.local)) {
+    window.localStorage.setItem(key, value);
+}
+for (const [key, value] of Object.entries(state.session)) {
+    window.sessionStorage.setItem(key, value);
+}
+"""
+
+
+def chain_key(item) -> tuple:
+    """
+    Get the setup chain of a test
+
+    Returns:
+        tuple: The number of products in the cart followed by the states of
+            the chain, empty when the test has no setup_chain marker
+    """
+    marker = item.get_closest_marker(MARKER)
+    if marker is None:
+        return ()
+    return (marker.kwargs.get("items"),) + tuple(marker.args)
+
+
+def order_by_chain(items: list):
+    """
+    Order tests so those sharing a setup prefix run one after the other
+
+    Sorting by chain is the depth first walk of the trie of the chains. The
+    sort is stable: tests without a chain keep their order and run first, and
+    tests with the same chain keep theirs.
+
+    Args:
+        items: Collected pytest items, reordered in place
+    """
+    items.sort(key=lambda item: tuple(str(step) for step in chain_key(item)))
+
+
+def write_chain_groups(items: list, path: str):
+    """
+    Write the setup chains of tests, to schedule each chain on one worker
+
+    Args:
+        items: Collected pytest items
+        path: JSON file receiving the chain of each node id with one, its
+            steps as strings
+    """
+    groups = {
+        item.nodeid: [str(step) for step in chain_key(item)]
+        for item in items
+        if chain_key(item)
+    }
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(groups, file)
+
+
+class Checkpoint:
+    """Cookies, storage and page of a browser, to bring another test back to it"""
+
+    def __init__(self, driver, state: str):
+        """
+        Capture the browser state
+
+        Args:
+            driver: WebDriver instance, on a page of the site
+            state: Navigation state of that page
+        """
+        self.state = state
+        self.url = driver.current_url
+        self.cookies = driver.get_cookies()
+        self.storage = driver.execute_script(READ_STATE_SCRIPT)
+
+    def restore(self, driver):
+        """
+        Bring a driver back to the captured state
+
+        Args:
+            driver: WebDriver instance, on a page of the site
+        """
+        driver.delete_all_cookies()
+        for cookie in self.cookies:
+            driver.add_cookie(cookie)
+        driver.execute_script(WRITE_STATE_SCRIPT, self.storage)
+        BasePage(driver).open(
+            self.url, STATES[self.state].ready_locator, name=self.state
+        )
+
+
+class SetupChains:
+    """Checkpoints of the setup chains built by a worker"""
+
+    def __init__(self):
+        """Initialize the empty checkpoint store"""
+        self.checkpoints = {}
+        self.built = 0
+        self.restored = 0
+
+    def reach(self, navigator, key: tuple):
+        """
+        Bring the driver of a navigator to the end of a setup chain
+
+        Restores the checkpoint of the longest prefix already built, then
+        navigates through the steps left, capturing a checkpoint after each.
+
+        Args:
+            navigator: Navigator of the test driver, on a page of the site
+            key: Setup chain, see chain_key
+        """
+        items, steps = key[0], key[1:]
+        done = 0
+        for length in range(len(steps), 0, -1):
+            checkpoint = self.checkpoints.get(key[: length + 1])
+            if checkpoint is not None:
+                checkpoint.restore(navigator.driver)
+                self.restored += 1
+                done = length
+                break
+
+        if items is None and not done:
+            # One random cart per chain, shared by all of its tests through the
+            # checkpoints, later steps keep it
+            generator = random.Random(sample_seed(name="Setup chain cart size seed"))
+            items = generator.randint(1, len(navigator.seeder.catalog()))
+
+        for length in range(done + 1, len(steps) + 1):
+            navigator.ensure(steps[length - 1], items=items)
+            self.checkpoints[key[: length + 1]] = Checkpoint(
+                navigator.driver, steps[length - 1]
+            )
+            self.built += 1
@@ -0,0 +1,185 @@
+"""
+This module records how long each named wait takes and derives the wait
+timeouts from those observations.
+
+The durations are kept in a JSON file between runs. Once a wait has enough
+samples its timeout becomes a high percentile of the observed durations times
+a safety multiplier, so failures surface quickly on a fast environment and
+slow environments get more tolerance automatically. The durations of a wait
+are kept apart per site and browser profile, see timing_key.
+"""
+
+import json
+import math
+import os
+import threading
+from urllib.parse import urlsplit
+
+from utilities.config import settings
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TIMINGS_PATH = os.path.join(PROJECT_ROOT, ".wait_timings.json")
+
+
+def percentile(samples: list, quantile: float) -> float:
+    """
+    Get a percentile of the samples with the nearest rank method
+
+    Args:
+        samples: Observed values
+        quantile: Quantile between 0 and 1 (e.g. 0.999 for p99.9)
+    """
+    ordered = sorted(samples)
+    rank = max(math.ceil(quantile * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def timing_key(name: str) -> str:
+    """
+    Get the key the durations of a wait are stored under
+
+    A wait takes longer against a remote site than against the local one, and
+    in a full browser than in a headless one, so the key holds the origin of
+    the site and the browser profile, e.g.
+    "https://www.saucedemo.com|fast|products".
+
+    Args:
+        name: Name of the wait
+    """
+    origin = "{0.scheme}://{0.netloc}".format(urlsplit(settings.login_url))
+    return f"{origin}|{settings.browser_profile}|{name}"
+
+
+class TimingStore:
+    """Durations of named waits, persisted between runs"""
+
+    def __init__(self, path: str = TIMINGS_PATH, max_samples: int = 500):
+        """
+        Initialize the timing store
+
+        Args:
+            path: JSON file holding the durations
+            max_samples: Number of most recent durations kept per wait
+        """
+        self.path = path
+        self.max_samples = max_samples
+        self._samples = None
+        self._new_samples = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float):
+        """Record the duration of a wait"""
+        with self._lock:
+            samples = self._load().setdefault(name, [])
+            samples.append(seconds)
+            del samples[: -self.max_samples]
+            self._new_samples.setdefault(name, []).append(seconds)
+
+    def samples(self, name: str) -> list:
+        """Get the recorded durations of a wait, oldest first"""
+        with self._lock:
+            return list(self._load().get(name, []))
+
+    def save(self):
+        """
+        Write the durations recorded by this process to the JSON file
+
+        The file is read again first so that the samples saved in the meantime
+        by other workers are kept.
+        """
+        with self._lock:
+            if not self._new_samples:
+                return
+            stored = self._read()
+            for name, samples in self._new_samples.items():
+                merged = stored.setdefault(name, []) + samples
+                stored[name] = merged[-self.max_samples :]
+            temporary_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(temporary_path, "w", encoding="utf-8") as file:
+                json.dump(stored, file)
+            os.replace(temporary_path, self.path)
+            self._new_samples = {}
+
+    def _load(self) -> dict:
+        """Load the stored durations on first use"""
+        if self._samples is None:
+            self._samples = self._read()
+        return self._samples
+
+    def _read(self) -> dict:
+        """Read the JSON file, empty if it does not exist or is corrupted"""
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+
+class TimeoutPolicy:
+    """Per-wait timeouts and poll intervals derived from observed durations"""
+
+    def __init__(
+        self,
+        store: TimingStore,
+        quantile: float = 0.999,
+        multiplier: float = None,
+        min_samples: int = 20,
+        floor: float = None,
+        ceiling: float = None,
+    ):
+        """
+        Initialize the timeout policy
+
+        Args:
+            store: Timing store with the observed durations
+            quantile: Percentile of the durations the timeout is based on
+            multiplier: Safety factor applied to the percentile, the
+                wait_timeout_multiplier setting by default
+            min_samples: Samples needed before the default timeout is replaced
+            floor: Shortest timeout ever returned in seconds, the
+                wait_timeout_min setting by default
+            ceiling: Longest timeout ever returned in seconds, the
+                wait_timeout_max setting by default
+        """
+        self.store = store
+        self.quantile = quantile
+        self.multiplier = multiplier
+        self.min_samples = min_samples
+        self.floor = floor
+        self.ceiling = ceiling
+
+    def timeout(self, name: str, default: float = None) -> float:
+        """
+        Get the timeout of a named wait
+
+        Args:
+            name: Name of the wait
+            default: Timeout used until enough durations are recorded, the
+                wait_timeout_default setting by default
+        """
+        samples = self.store.samples(name)
+        if len(samples) < self.min_samples:
+            return settings.wait_timeout_default if default is None else default
+        multiplier = self._setting(self.multiplier, "wait_timeout_multiplier")
+        floor = self._setting(self.floor, "wait_timeout_min")
+        ceiling = self._setting(self.ceiling, "wait_timeout_max")
+        observed = percentile(samples, self.quantile) * multiplier
+        return min(max(observed, floor), ceiling)
+
+    @staticmethod
+    def _setting(value, name: str):
+        """Get the value given to the policy, or the setting when it is None"""
+        return getattr(settings, name) if value is None else value
+
+    @staticmethod
+    def poll_intervals(first: float = 0.05, factor: float = 2, longest: float = 0.5):
+        """Yield poll intervals that start fast and back off exponentially"""
+        interval = first
+        while True:
+            yield interval
+            interval = min(interval * factor, longest)
+
+
+# Shared by every WaitUtilities instance of the process
+TIMINGS = TimingStore()
+POLICY = TimeoutPolicy(TIMINGS)
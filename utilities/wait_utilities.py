@@ -1,15 +1,272 @@
+"""
+This module contains the wait utilities used by the page objects.
+
+Waits are event driven: a single async script installs a MutationObserver in
+the page and resolves as soon as the condition holds, instead of polling over
+HTTP every 0.5 s. When the page navigates away while the script is waiting,
+the wait falls back to polling for the remaining time.
+
+Waits are named. Unless an explicit timeout is given, the timeout of a wait
+comes from the durations recorded for its name against the same site and
+browser profile (see utilities.timing_store).
+"""
+
+import time
+
+from selenium.common.exceptions import (
+    JavascriptException,
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException,
+)
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
+
+from utilities.timing_store import POLICY, TIMINGS, timing_key
+
+# Chrome's default script timeout, longer waits raise it first
+DEFAULT_SCRIPT_TIMEOUT = 30
+
+# Conditions supported by the event driven engine, named after expected_conditions.
+# presence_of_all_locators has no counterpart there: it waits until every locator
+# of a list matches an element, like EC.all_of of presence_of_element_located
+CONDITIONS = (
+    "presence_of_element_located",
+    "visibility_of_element_located",
+    "element_to_be_clickable",
+    "invisibility_of_element_located",
+    "url_contains",
+    "presence_of_all_locators",
+)
+
+# Arguments: condition, locator strategy, locator value (a list of values for
+# presence_of_all_locators), timeout in ms, callback
+EVENT_WAIT_SCRIPT = """
+const [condition, by, value, timeoutMs, done] = arguments;
+
+function find(target = value) {
+    switch (by) {
+        case "xpath":
+            return document.evaluate(
+                target, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+            ).singleNodeValue;
+        case "id":
+            return document.getElementById(target);
+        case "class name":
+            return document.querySelector("." + CSS.escape(target));
+        case "name":
+            return document.querySelector('[name="' + CSS.escape(target) + '"]');
+        case "link text":
+        case "partial link text":
+            return Array.from(document.querySelectorAll("a")).find((link) =>
+                by === "link text"
+                    ? link.innerText.trim() === target
+                    : link.innerText.includes(target)
+            ) || null;
+        default:
+            return document.querySelector(target);
+    }
+}
+
+function visible(element) {
+    if (!element || !element.isConnected) return false;
+    const style = window.getComputedStyle(element);
+    return style.visibility !== "hidden" && style.display !== "none" &&
+        element.getClientRects().length > 0;
+}
+
+function check() {
+    if (condition === "url_contains") {
+        return window.location.href.includes(value) ? true : null;
+    }
+    if (condition === "presence_of_all_locators") {
+        const elements = value.map((target) => find(target));
+        return elements.every((element) => element) ? elements : null;
+    }
+    const element = find();
+    switch (condition) {
+        case "presence_of_element_located":
+            return element;
+        case "visibility_of_element_located":
+            return visible(element) ? element : null;
+        case "element_to_be_clickable":
+            return visible(element) && !element.disabled ? element : null;
+        case "invisibility_of_element_located":
+            return visible(element) ? null : true;
+    }
+    return null;
+}
+
+let settled = false;
+let observer = null;
+let timer = null;
+let fallback = null;
+function finish(result) {
+    if (settled) return;
+    settled = true;
+    if (observer) observer.disconnect();
+    clearTimeout(timer);
+    clearInterval(fallback);
+    window.removeEventListener("popstate", onChange);
+    window.removeEventListener("hashchange", onChange);
+    done(result);
+}
+function onChange() {
+    const result = check();
+    if (result) finish({ok: true, value: result});
+}
+
+const initial = check();
+if (initial) {
+    finish({ok: true, value: initial});
+} else {
+    observer = new MutationObserver(onChange);
+    observer.observe(document, {
+        subtree: true, childList: true, attributes: true, characterData: true
+    });
+    window.addEventListener("popstate", onChange);
+    window.addEventListener("hashchange", onChange);
+    // Style changes from stylesheets do not mutate the DOM, re-check slowly
+    fallback = setInterval(onChange, 100);
+    timer = setTimeout(() => finish({ok: false}), timeoutMs);
+}
+"""
+
+
+def _page_changed(error: WebDriverException) -> bool:
+    """Tell whether a wait script failed because the page navigated away"""
+    if isinstance(error, StaleElementReferenceException):
+        return True
+    return "unload" in (error.msg or "").lower()
 
 
 class WaitUtilities:
     """Wait utilities"""
 
-    def __init__(self, driver):
+    def __init__(self, driver, policy=POLICY, timings=TIMINGS):
         self.driver = driver
+        self.policy = policy
+        self.timings = timings
+
+    def wait_until(self, condition: str, target, timeout: float = None, name=None):
+        """
+        Wait until an expected condition holds
 
-    def wait_for_element(self, locator: tuple, timeout: int = 10):
+        Args:
+            condition: Name of the expected condition, one of CONDITIONS
+            target: Locator tuple, the URL fragment for url_contains, or a list
+                of locator tuples for presence_of_all_locators
+            timeout: Maximum time to wait in seconds, derived from the recorded
+                durations of the wait when None
+            name: Name the duration of the wait is recorded under, with the site
+                and browser profile, defaults to the condition and target
+
+        Returns:
+            The element for element conditions, the list of elements for
+            presence_of_all_locators, True otherwise
+
+        Raises:
+            TimeoutException: If the condition does not hold in time
+        """
+        if condition not in CONDITIONS:
+            raise ValueError(f"Unsupported wait condition: {condition}")
+
+        by, value = self._strategy(condition, target)
+        key = timing_key(name or f"{condition} {value}")
+        if timeout is None:
+            timeout = self.policy.timeout(key)
+        start = time.monotonic()
+        raise_script_timeout = timeout >= DEFAULT_SCRIPT_TIMEOUT
+        if raise_script_timeout:
+            self.driver.set_script_timeout(timeout + 5)
+
+        try:
+            result = self.driver.execute_async_script(
+                EVENT_WAIT_SCRIPT, condition, by, value, int(timeout * 1000)
+            )
+        except (JavascriptException, StaleElementReferenceException) as error:
+            if not _page_changed(error):
+                raise
+            # The document was unloaded while waiting, poll on the new page
+            result = self._poll(condition, target, start + timeout)
+        finally:
+            if raise_script_timeout:
+                self.driver.set_script_timeout(DEFAULT_SCRIPT_TIMEOUT)
+
+        if not result["ok"]:
+            # Recorded at the full timeout, a slow environment whose waits
+            # keep timing out still raises the timeout derived from the samples
+            self.timings.record(key, timeout)
+            raise TimeoutException(
+                f"Condition {condition} not met for {target} after {timeout:.2f}s"
+            )
+        self.timings.record(key, time.monotonic() - start)
+        return result["value"]
+
+    @staticmethod
+    def _strategy(condition: str, target) -> tuple:
+        """Get the locator strategy and value(s) the wait script looks for"""
+        if condition == "url_contains":
+            return "url", target
+        if condition == "presence_of_all_locators":
+            strategies = {by for by, _ in target}
+            if len(strategies) != 1:
+                raise ValueError("Locators waited for together must share a strategy")
+            return strategies.pop(), [value for _, value in target]
+        return target
+
+    def _poll(self, condition: str, target, deadline: float) -> dict:
+        """Poll an expected condition with backing off intervals until a deadline"""
+        if condition == "presence_of_all_locators":
+            expected = EC.all_of(
+                *(EC.presence_of_element_located(locator) for locator in target)
+            )
+        else:
+            expected = getattr(EC, condition)(target)
+        for interval in self.policy.poll_intervals():
+            try:
+                value = expected(self.driver)
+            except WebDriverException:
+                value = False
+            if value:
+                return {"ok": True, "value": value}
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return {"ok": False}
+            time.sleep(min(interval, remaining))
+
+    def wait_for_element(self, locator: tuple, timeout: float = None, name=None):
         """Wait for an element to be present on the page"""
-        return WebDriverWait(self.driver, timeout).until(
-            EC.presence_of_element_located(locator)
+        return self.wait_until("presence_of_element_located", locator, timeout, name)
+
+    def wait_for_elements(self, locators: list, timeout: float = None, name=None):
+        """
+        Wait for several elements to be present on the page, in a single wait
+
+        Args:
+            locators: Locator tuples, all with the same strategy
+
+        Returns:
+            list: The elements, in the order of the locators, empty without
+                locators
+        """
+        if not locators:
+            return []
+        return self.wait_until("presence_of_all_locators", locators, timeout, name)
+
+    def wait_for_visible(self, locator: tuple, timeout: float = None, name=None):
+        """Wait for an element to be visible"""
+        return self.wait_until("visibility_of_element_located", locator, timeout, name)
+
+    def wait_for_clickable(self, locator: tuple, timeout: float = None, name=None):
+        """Wait for an element to be visible and enabled"""
+        return self.wait_until("element_to_be_clickable", locator, timeout, name)
+
+    def wait_for_invisible(self, locator: tuple, timeout: float = None, name=None):
+        """Wait for an element to be hidden or removed from the page"""
+        return self.wait_until(
+            "invisibility_of_element_located", locator, timeout, name
         )
+
+    def wait_for_url_contains(self, fragment: str, timeout: float = None, name=None):
+        """Wait for the current URL to contain a fragment"""
+        return self.wait_until("url_contains", fragment, timeout, name)